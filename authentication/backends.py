@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+
+USER_CACHE_KEY = 'authentication:user:{}'
+
+
+def get_cached_user(user_id):
+    """
+    Returns the User `user_id`, cached for `AUTHENTICATION_USER_CACHE_TIMEOUT` seconds.
+    The cached User is deleted whenever it is saved or deleted, see :mod:`authentication.signals`.
+    """
+    key = USER_CACHE_KEY.format(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = get_user_model().objects.filter(pk=user_id).first()
+        if user is not None:
+            cache.set(key, user, timeout=getattr(settings, 'AUTHENTICATION_USER_CACHE_TIMEOUT', 60))
+    return user
+
+
+class ClaimsUser(TokenUser):
+    """
+    User built from the claims of the access token: id, username, is_active and is_staff.
+    The User object is only loaded, through a short-lived cache, when `instance` is accessed.
+    """
+
+    @cached_property
+    def is_active(self):
+        return self.token.get('is_active', True)
+
+    @cached_property
+    def instance(self):
+        return get_cached_user(self.id)
+
+
+def ensure_user_exists(user):
+    """
+    Raises AuthenticationFailed when the request User was deleted after its access token was obtained.
+    The stateless authentication does not load the User: the views writing its id in a foreign key
+    check it first, through the cached `ClaimsUser.instance`.
+    """
+    if getattr(user, 'instance', user) is None:
+        raise AuthenticationFailed('User not found', code='user_not_found')
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Authenticates with a JSON web token without querying the User: the request User is built
+    from the token claims, by the `TOKEN_USER_CLASS` (:class:`ClaimsUser`). Hence a User deactivated
+    after the token was obtained is still authenticated until the access token expires, and so is
+    a deleted User, except by the views which write its id, see `ensure_user_exists`.
+    """
+
+    def get_user(self, validated_token):
+        user = super(StatelessJWTAuthentication, self).get_user(validated_token)
+        if not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        return user
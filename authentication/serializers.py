@@ -2,6 +2,7 @@ from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -35,3 +36,18 @@ class RegisterSerializer(serializers.ModelSerializer):
         user.set_password(validated_data['password'])
         user.save()
         return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Adds the User fields needed to authorize requests to the token claims,
+    see :class:`authentication.backends.StatelessJWTAuthentication`.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super(ClaimsTokenObtainPairSerializer, cls).get_token(user)
+        token['username'] = user.get_username()
+        token['is_active'] = user.is_active
+        token['is_staff'] = user.is_staff
+        return token
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import (
+    post_delete,
+    post_save
+)
+from django.dispatch import receiver
+
+from authentication.backends import USER_CACHE_KEY
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL, dispatch_uid='authentication_uncache_user_save')
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL, dispatch_uid='authentication_uncache_user_delete')
+def uncache_user(sender, instance, **kwargs):
+    cache.delete(USER_CACHE_KEY.format(instance.pk))
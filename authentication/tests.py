@@ -1,7 +1,22 @@
+from datetime import (
+    date,
+    timedelta
+)
+
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authentication.backends import (
+    ClaimsUser,
+    StatelessJWTAuthentication
+)
+from events.models import (
+    Event,
+    EventAttendee
+)
 
 User = get_user_model()
 
@@ -61,3 +76,88 @@ class AuthenticationTests(APITestCase):
         """
         response = self.client.post(self.url_register, self.data_new_user, format='json', HTTP_AUTHORIZATION="Bearer invalid")
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class StatelessAuthenticationTests(APITestCase):
+    fixtures = [
+        'fixtures/authentication.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(StatelessAuthenticationTests, cls).setUpTestData()
+        cls.credentials_admin = {
+            'username': 'admin',
+            'password': '123456'
+        }
+        cls.url_token_obtain = reverse('authentication:token_obtain_pair')
+        cls.url_event_list = reverse('events:list')
+
+    def test_token_claims(self):
+        """
+        Ensure we authenticate the User from the token claims, without querying it.
+        """
+        response_obtain = self.client.post(self.url_token_obtain, self.credentials_admin, format='json')
+        token = AccessToken(response_obtain.data['access'])
+        with self.assertNumQueries(0):
+            user = StatelessJWTAuthentication().get_user(token)
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(user.id, User.objects.get(username='admin').pk)
+        self.assertEqual(user.username, 'admin')
+        self.assertTrue(user.is_active)
+        self.assertTrue(user.is_staff)
+
+        response = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {response_obtain.data['access']}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_inactive_claim(self):
+        """
+        Ensure we cannot authenticate with a token of an inactive User.
+        """
+        token = AccessToken.for_user(User.objects.get(username='admin'))
+        token['is_active'] = False
+        response = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_instance(self):
+        """
+        Ensure we load the User object once, until it is saved.
+        """
+        admin = User.objects.get(username='admin')
+        with self.assertNumQueries(1):
+            self.assertEqual(ClaimsUser(AccessToken.for_user(admin)).instance, admin)
+        with self.assertNumQueries(0):
+            self.assertEqual(ClaimsUser(AccessToken.for_user(admin)).instance.email, admin.email)
+
+        admin.email = 'admin@tiko.energy'
+        admin.save()
+        self.assertEqual(ClaimsUser(AccessToken.for_user(admin)).instance.email, 'admin@tiko.energy')
+
+    def test_deleted_user(self):
+        """
+        Ensure we cannot create or register to an Event with a token of a User deleted since, while we can still read.
+        """
+        start_date = date.today() + timedelta(days=30)
+        event = Event.objects.create(name='Future event', start_date=start_date, end_date=start_date)
+        admin = User.objects.get(username='admin')
+        authorization = f"Bearer {AccessToken.for_user(admin)}"
+        admin.delete()
+
+        response = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=authorization)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        event_data = {'name': 'Orphan event', 'description': 'Never created', 'start_date': start_date, 'end_date': start_date}
+        response = self.client.post(reverse('events:create'), event_data, format='json', HTTP_AUTHORIZATION=authorization)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.data['code'], 'user_not_found')
+        response = self.client.post(reverse('events:bulk'), [event_data], format='json', HTTP_AUTHORIZATION=authorization)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertListEqual(list(Event.objects.values_list('name', flat=True)), ['Future event'])
+
+        for url in (reverse('events:register-attendee'), reverse('events:async-register-attendee')):
+            response = self.client.post(url, {'event': event.pk}, format='json', HTTP_AUTHORIZATION=authorization)
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(reverse('events:waitlist', args=[event.pk]), format='json', HTTP_AUTHORIZATION=authorization)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(EventAttendee.objects.exists())
+        event.refresh_from_db()
+        self.assertEqual(event.attendee_count, 0)
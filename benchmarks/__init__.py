@@ -0,0 +1,51 @@
+"""
+Benchmarks of the API hot paths. They run against a throw-away SQLite database
+(see tikoExercise/settings_benchmark.py), e.g.:
+
+    python -m benchmarks.filters --sizes 10000 100000 1000000
+"""
+import os
+import statistics
+import time
+from pathlib import Path
+
+import django
+
+
+def setup(fresh=True):
+    """
+    Configures Django with the benchmark settings and (re)creates the benchmark database.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tikoExercise.settings_benchmark')
+    django.setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connections
+
+    database = Path(settings.DATABASES['default']['NAME'])
+    if fresh and database.exists():
+        # A connection would keep using the removed file
+        connections.close_all()
+        database.unlink()
+    call_command('migrate', verbosity=0)
+    return database
+
+
+def measure(function, repeat=20):
+    """
+    Calls `function` `repeat` times and returns the durations in milliseconds.
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def timeit(function, repeat=20):
+    """
+    Calls `function` `repeat` times and returns the median duration in milliseconds.
+    """
+    return statistics.median(measure(function, repeat))
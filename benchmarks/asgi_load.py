@@ -0,0 +1,142 @@
+"""
+Load test comparing the throughput of the sync views under WSGI with the async
+views under ASGI, at growing numbers of concurrent clients.
+
+    pip install gunicorn uvicorn
+    python -m benchmarks.asgi_load --concurrency 1 10 50 --duration 10
+
+The servers are started against the benchmark database with the given number
+of workers (gunicorn with threads for WSGI, uvicorn for ASGI). Every client
+keeps a connection open and sends requests back to back for `duration` seconds;
+requests per second and latency percentiles are reported per scenario.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import (
+    date,
+    timedelta
+)
+
+from benchmarks import setup
+
+
+SCENARIOS = (
+    # (name, server, path)
+    ('WSGI  sync  list', 'wsgi', '/events/'),
+    ('ASGI  sync  list', 'asgi', '/events/'),
+    ('ASGI  async list', 'asgi', '/events/async/'),
+    ('WSGI  sync  detail', 'wsgi', '/events/{pk}/'),
+    ('ASGI  sync  detail', 'asgi', '/events/{pk}/'),
+    ('ASGI  async detail', 'asgi', '/events/async/{pk}/'),
+)
+
+
+def populate(count):
+    from django.contrib.auth.models import User
+
+    from authentication.serializers import ClaimsTokenObtainPairSerializer
+    from events.models import Event
+
+    user = User.objects.create_user(username='benchmark', password='benchmark')
+    start_date = date.today() + timedelta(days=30)
+    events = Event.objects.bulk_create([
+        Event(name=f'Event {i}', description='Synthetic event', start_date=start_date + timedelta(days=i % 365), end_date=start_date + timedelta(days=i % 365), created_by=user)
+        for i in range(count)
+    ])
+    return str(ClaimsTokenObtainPairSerializer.get_token(user).access_token), events[0].pk
+
+
+def start_server(kind, port, workers, threads):
+    if kind == 'wsgi':
+        command = ['gunicorn', 'tikoExercise.wsgi:application', '--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--threads', str(threads)]
+    else:
+        command = ['uvicorn', 'tikoExercise.asgi:application', '--port', str(port), '--workers', str(workers), '--no-access-log']
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'tikoExercise.settings_benchmark'}
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    sys.exit(f'The {kind} server did not start: {" ".join(command)}')
+
+
+async def client(port, path, token, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    request = (
+        f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAuthorization: Bearer {token}\r\n'
+        f'Accept: application/json\r\nConnection: keep-alive\r\n\r\n'
+    ).encode()
+    try:
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            if b' 200 ' not in status_line:
+                errors.append(status_line)
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        writer.close()
+
+
+async def load(port, path, token, concurrency, duration):
+    latencies, errors = [], []
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*(client(port, path, token, deadline, latencies, errors) for _ in range(concurrency)))
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 10, 50])
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--events', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--threads', type=int, default=4, help='Threads per WSGI worker.')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    setup()
+    token, pk = populate(args.events)
+
+    print(f'{"Scenario":<22}{"clients":>8}{"req/s":>10}{"p50 ms":>10}{"p99 ms":>10}{"errors":>8}')
+    servers = {}
+    try:
+        for kind in ('wsgi', 'asgi'):
+            servers[kind] = start_server(kind, args.port + len(servers), args.workers, args.threads)
+        ports = {kind: args.port + index for index, kind in enumerate(servers)}
+        for name, kind, path in SCENARIOS:
+            for concurrency in args.concurrency:
+                latencies, errors = asyncio.run(load(ports[kind], path.format(pk=pk), token, concurrency, args.duration))
+                percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+                print(
+                    f'{name:<22}{concurrency:>8}{len(latencies) / args.duration:>10.1f}'
+                    f'{percentiles[49]:>10.2f}{percentiles[98]:>10.2f}{len(errors):>8}',
+                    flush=True
+                )
+    finally:
+        for process in servers.values():
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
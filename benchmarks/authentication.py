@@ -0,0 +1,87 @@
+"""
+Counts the queries and times the requests of the events endpoints, authenticated
+by loading the User (simplejwt's JWTAuthentication) or from the token claims
+(StatelessJWTAuthentication).
+
+    python -m benchmarks.authentication --events 1000
+
+The requests go through the whole Django stack with the test client, the event
+list cache being disabled so that every request reaches the database.
+"""
+import argparse
+from datetime import (
+    date,
+    timedelta
+)
+from unittest import mock
+
+from benchmarks import (
+    setup,
+    timeit
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test import override_settings
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+    from rest_framework.views import APIView
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+
+    from authentication.backends import StatelessJWTAuthentication
+    from authentication.serializers import ClaimsTokenObtainPairSerializer
+    from events.models import (
+        Event,
+        EventAttendee
+    )
+
+    user = User.objects.create_user(username='benchmark', password='benchmark')
+    start_date = date.today() + timedelta(days=30)
+    events = Event.objects.bulk_create([
+        Event(name=f'Event {i}', description='Synthetic event', start_date=start_date, end_date=start_date, created_by=user)
+        for i in range(args.events)
+    ])
+    event = events[0]
+    attendees = User.objects.bulk_create([User(username=f'attendee{i}') for i in range(20)])
+    EventAttendee.objects.bulk_create([EventAttendee(event=event, user=attendee) for attendee in attendees])
+    Event.objects.reconcile_attendee_count()
+
+    token = ClaimsTokenObtainPairSerializer.get_token(user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+    requests = {
+        'GET /events/': lambda: client.get('/events/'),
+        'GET /events/?summary': lambda: client.get('/events/', {'summary': ''}),
+        'GET /events/?mine': lambda: client.get('/events/', {'mine': ''}),
+        'GET /events/<id>/': lambda: client.get(f'/events/{event.pk}/'),
+        'GET /events/<id>/?summary': lambda: client.get(f'/events/{event.pk}/', {'summary': ''}),
+        'GET /events/<id>/attendees/': lambda: client.get(f'/events/{event.pk}/attendees/'),
+        'PATCH /events/update/<id>/': lambda: client.patch(f'/events/update/{event.pk}/', {'capacity': 100}, format='json'),
+    }
+
+    results = {}
+    for name, authentication in (('User query', JWTAuthentication), ('Token claims', StatelessJWTAuthentication)):
+        with override_settings(EVENTS_LIST_CACHE=None), mock.patch.object(APIView, 'authentication_classes', [authentication]):
+            for request, function in requests.items():
+                with CaptureQueriesContext(connection) as context:
+                    response = function()
+                assert response.status_code == 200, (request, response.status_code)
+                results.setdefault(request, {})[name] = (len(context.captured_queries), timeit(function, repeat=args.repeat))
+
+    print(f'{"Request":<30}{"queries (User query)":>22}{"queries (claims)":>18}{"ms (User query)":>17}{"ms (claims)":>13}')
+    for request, result in results.items():
+        (queries_user, ms_user), (queries_claims, ms_claims) = result['User query'], result['Token claims']
+        print(f'{request:<30}{queries_user:>22}{queries_claims:>18}{ms_user:>17.2f}{ms_claims:>13.2f}')
+
+
+if __name__ == '__main__':
+    main()
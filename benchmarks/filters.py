@@ -0,0 +1,127 @@
+"""
+Times the event list filters on a growing table, to show that they stay sub-linear.
+
+    python -m benchmarks.filters --sizes 10000 100000 1000000
+
+For every table size, the first page of each filter is fetched through
+EventFilterBackend and EventCursorPagination, exactly like EventListView does.
+The median duration is reported per size, along with a full table scan as a
+linear reference and the SQLite query plans at the largest size.
+"""
+import argparse
+import random
+from datetime import (
+    date,
+    timedelta
+)
+
+from benchmarks import (
+    setup,
+    timeit
+)
+
+
+def populate(count, users, rng, batch_size=10000):
+    from events.models import Event
+
+    today = date.today()
+    created = 0
+    while created < count:
+        batch = []
+        for _ in range(min(batch_size, count - created)):
+            start_date = today + timedelta(days=rng.randint(-3650, 3650))
+            capacity = rng.choice((0, 0, 10, 50, 100, 500))
+            batch.append(Event(
+                name=f'Event {created + len(batch)}',
+                description='Synthetic event',
+                start_date=start_date,
+                end_date=start_date + timedelta(days=rng.randint(0, 6)),
+                capacity=capacity,
+                attendee_count=rng.randint(0, capacity) if capacity else rng.randint(0, 100),
+                created_by=rng.choice(users),
+            ))
+        Event.objects.bulk_create(batch)
+        created += len(batch)
+
+
+def get_filters(users):
+    today = date.today()
+    window_start, window_end = today - timedelta(days=400), today - timedelta(days=370)
+    return {
+        'no filter': {},
+        'start range': {'start_after': window_start, 'start_before': window_end},
+        'end range': {'end_after': window_start, 'end_before': window_end},
+        'active between': {'active_from': window_start, 'active_to': window_start + timedelta(days=7)},
+        'status=past': {'status': 'past'},
+        'status=ongoing': {'status': 'ongoing'},
+        'status=future': {'status': 'future'},
+        'has_capacity': {'has_capacity': 'true'},
+        'created_by': {'created_by': users[0].pk},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from events.filters import EventFilterBackend
+    from events.models import Event
+    from events.pagination import EventCursorPagination
+
+    rng = random.Random(args.seed)
+    users = User.objects.bulk_create([User(username=f'benchmark{i}') for i in range(100)])
+    filters = get_filters(users)
+    factory = APIRequestFactory()
+    timings = {name: [] for name in filters}
+    timings['reference: full scan'] = []
+    plans = {}
+
+    def first_page(params):
+        request = Request(factory.get('/events/', params))
+        queryset = EventFilterBackend().filter_queryset(request, Event.objects.all(), view=None)
+        return EventCursorPagination().paginate_queryset(queryset, request)
+
+    size = 0
+    for target in sorted(args.sizes):
+        populate(target - size, users, rng)
+        size = target
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        for name, params in filters.items():
+            timings[name].append(timeit(lambda: first_page(params), repeat=args.repeat))
+        timings['reference: full scan'].append(
+            timeit(lambda: Event.objects.filter(description='No such description').exists(), repeat=args.repeat)
+        )
+        print(f'Benchmarked {size} events', flush=True)
+
+    for name, params in filters.items():
+        request = Request(factory.get('/events/', params))
+        queryset = EventFilterBackend().filter_queryset(request, Event.objects.all(), view=None)
+        plans[name] = queryset.order_by(*EventCursorPagination.ordering)[:EventCursorPagination.page_size + 1].explain()
+
+    sizes = sorted(args.sizes)
+    print()
+    print(f'{"First page (ms, median)":<26}' + ''.join(f'{size:>12}' for size in sizes) + f'{"growth":>10}')
+    for name, values in timings.items():
+        growth = values[-1] / values[0] if values[0] else float('inf')
+        print(f'{name:<26}' + ''.join(f'{value:>12.2f}' for value in values) + f'{growth:>9.1f}x')
+    print(f'{"table size":<26}' + ''.join(f'{size:>12}' for size in sizes) + f'{sizes[-1] / sizes[0]:>9.1f}x')
+
+    print()
+    print(f'Query plans at {sizes[-1]} events:')
+    for name, plan in plans.items():
+        print(f'- {name}: {" / ".join(line.strip() for line in plan.splitlines())}')
+
+
+if __name__ == '__main__':
+    main()
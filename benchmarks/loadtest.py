@@ -0,0 +1,229 @@
+"""
+Load test of a running server, simulating concurrent users who log in, browse
+the future events, register to one of them and unregister, and refresh their
+tokens from time to time.
+
+    python manage.py generate_events --users 1000 --events 10000 --attendees 100000
+    python manage.py runserver --noreload
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --users 50 --duration 60
+
+Every simulated user logs in with one of the generated accounts (`--prefix`
+followed by a number, with `--password`), then loops until the end of the test:
+
+* pages through `--pages` pages of the future events with remaining capacity,
+* registers to one of the events it is not registered to, and unregisters from it,
+* refreshes its tokens every `--refresh-every` loops.
+
+Users start over `--ramp-up` seconds and wait up to `--think` seconds between
+requests. Throughput, latency percentiles, error rates and status codes are
+reported per endpoint, and can be written as JSON with `--output`. The harness
+only needs the standard library: it speaks HTTP/1.1 over asyncio streams, with
+a keep-alive connection per user.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from collections import (
+    Counter,
+    defaultdict
+)
+from urllib.parse import urlsplit
+
+
+class Connection:
+    """
+    Minimal keep-alive HTTP/1.1 client for JSON requests, reconnecting when the server closes the connection.
+    """
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+    async def request(self, method, path, data=None, token=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(data).encode() if data is not None else b''
+        headers = [
+            f'{method} {path} HTTP/1.1',
+            f'Host: {self.host}:{self.port}',
+            'Accept: application/json',
+            f'Content-Length: {len(body)}',
+        ]
+        if body:
+            headers.append('Content-Type: application/json')
+        if token:
+            headers.append(f'Authorization: Bearer {token}')
+        self.writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body)
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('Connection closed by the server')
+        status = int(status_line.split()[1])
+        length, close, is_json = None, False, False
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name = name.strip().lower()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'connection' and value.strip().lower() == 'close':
+                close = True
+            elif name == 'content-type':
+                is_json = value.strip().startswith('application/json')
+        content = await self.reader.readexactly(length) if length is not None else await self.reader.read()
+        if close or length is None:
+            await self.close()
+        # Error pages, e.g. of server errors, are not JSON
+        return status, json.loads(content) if content and is_json else content
+
+
+class Stats:
+    """
+    Latencies and status codes per endpoint.
+    """
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    async def request(self, connection, name, method, path, data=None, token=None):
+        start = time.perf_counter()
+        try:
+            status, content = await connection.request(method, path, data, token)
+        except (OSError, ValueError, asyncio.IncompleteReadError) as exc:
+            self.statuses[name][type(exc).__name__] += 1
+            await connection.close()
+            return None, None
+        self.latencies[name].append((time.perf_counter() - start) * 1000)
+        self.statuses[name][status] += 1
+        return status, content
+
+    def report(self, duration):
+        results = {}
+        for name in self.statuses:
+            latencies = sorted(self.latencies[name])
+            count = sum(self.statuses[name].values())
+            errors = sum(value for status, value in self.statuses[name].items() if not isinstance(status, int) or status >= 400)
+            percentiles = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+            results[name] = {
+                'requests': count,
+                'rps': round(count / duration, 2),
+                'p50_ms': round(percentiles[49], 2) if latencies else None,
+                'p90_ms': round(percentiles[89], 2) if latencies else None,
+                'p99_ms': round(percentiles[98], 2) if latencies else None,
+                'max_ms': round(latencies[-1], 2) if latencies else None,
+                'error_rate': round(errors / count, 4),
+                'statuses': {str(status): value for status, value in sorted(self.statuses[name].items(), key=str)},
+            }
+        return results
+
+
+def get_path(url):
+    parts = urlsplit(url)
+    return f'{parts.path}?{parts.query}' if parts.query else parts.path
+
+
+async def user(index, args, stats, deadline):
+    rng = random.Random(args.seed + index)
+    await asyncio.sleep(args.ramp_up * index / args.users)
+    host, port = urlsplit(args.url).hostname, urlsplit(args.url).port or 80
+    connection = Connection(host, port)
+
+    async def think():
+        if args.think:
+            await asyncio.sleep(rng.uniform(0, args.think))
+
+    credentials = {'username': f'{args.prefix}{index % args.accounts}', 'password': args.password}
+    status, tokens = await stats.request(connection, 'POST /authentication/login/', 'POST', '/authentication/login/', credentials)
+    if status != 200:
+        await connection.close()
+        return
+    loops = 0
+    try:
+        while time.monotonic() < deadline:
+            candidates = []
+            path = '/events/?summary&status=future&has_capacity=true'
+            for _ in range(args.pages):
+                await think()
+                status, page = await stats.request(connection, 'GET /events/', 'GET', path, token=tokens['access'])
+                if status != 200:
+                    break
+                candidates.extend(event['id'] for event in page['results'] if not event['is_registered'])
+                if not page['next']:
+                    break
+                path = get_path(page['next'])
+
+            if candidates:
+                event = rng.choice(candidates)
+                await think()
+                status, _ = await stats.request(connection, 'POST /events/register-attendee/', 'POST', '/events/register-attendee/', {'event': event}, tokens['access'])
+                if status == 201:
+                    await think()
+                    await stats.request(connection, 'POST /events/unregister-attendees/', 'POST', '/events/unregister-attendees/', {'events': [event]}, tokens['access'])
+
+            loops += 1
+            if loops % args.refresh_every == 0:
+                status, refreshed = await stats.request(connection, 'POST /authentication/refresh/', 'POST', '/authentication/refresh/', {'refresh': tokens['refresh']})
+                if status == 200:
+                    # The refresh token is rotated, see the SIMPLE_JWT settings
+                    tokens = {**tokens, **refreshed}
+    finally:
+        await connection.close()
+
+
+async def run(args):
+    stats = Stats()
+    start = time.monotonic()
+    deadline = start + args.duration
+    await asyncio.gather(*(user(index, args, stats, deadline) for index in range(args.users)))
+    return stats, time.monotonic() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='URL of the server.')
+    parser.add_argument('--users', type=int, default=10, help='Number of concurrent simulated users.')
+    parser.add_argument('--duration', type=float, default=30, help='Duration of the test, in seconds.')
+    parser.add_argument('--ramp-up', type=float, default=5, help='Seconds over which the users start.')
+    parser.add_argument('--think', type=float, default=0, help='Maximum random pause between two requests of a user, in seconds.')
+    parser.add_argument('--pages', type=int, default=2, help='Pages of events browsed per loop.')
+    parser.add_argument('--refresh-every', type=int, default=10, help='Loops between two token refreshes.')
+    parser.add_argument('--accounts', type=int, default=1000, help='Number of accounts to log in with, see generate_events --users.')
+    parser.add_argument('--prefix', default='generated', help='Username prefix of the accounts, see generate_events --prefix.')
+    parser.add_argument('--password', default='generated', help='Password of the accounts, see generate_events --password.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Writes the results to this JSON file.')
+    args = parser.parse_args()
+
+    stats, duration = asyncio.run(run(args))
+    results = stats.report(duration)
+    if not results:
+        sys.exit(f'No request could be sent to {args.url}.')
+
+    print(f'{"Endpoint":<38}{"requests":>9}{"req/s":>9}{"p50 ms":>9}{"p90 ms":>9}{"p99 ms":>9}{"max ms":>9}{"errors":>8}  statuses')
+    for name, result in results.items():
+        latencies = ''.join(f'{result[key]:>9.1f}' if result[key] is not None else f'{"-":>9}' for key in ('p50_ms', 'p90_ms', 'p99_ms', 'max_ms'))
+        statuses = ' '.join(f'{status}:{count}' for status, count in result['statuses'].items())
+        print(f'{name:<38}{result["requests"]:>9}{result["rps"]:>9.1f}{latencies}{result["error_rate"]:>8.1%}  {statuses}')
+    total = sum(result['requests'] for result in results.values())
+    print(f'{"Total":<38}{total:>9}{total / duration:>9.1f}')
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({'parameters': vars(args), 'duration': round(duration, 2), 'results': results}, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Times the rendering and parsing of the event list payload, with the DRF JSON
+renderer/parser (stdlib json) and the orjson based ones.
+
+    python -m benchmarks.renderers --events 50 200 1000 --attendees 20
+
+The payload is the serialized data of EventListView: `events` events with
+`attendees` attendees each, in the full (non-summary) representation.
+"""
+import argparse
+from datetime import (
+    date,
+    timedelta
+)
+from io import BytesIO
+
+from benchmarks import (
+    setup,
+    timeit
+)
+
+
+def populate(count, attendees):
+    from django.contrib.auth.models import User
+
+    from events.models import (
+        Event,
+        EventAttendee
+    )
+
+    users = User.objects.bulk_create([User(username=f'attendee{i}') for i in range(attendees)])
+    start_date = date.today() + timedelta(days=30)
+    events = Event.objects.bulk_create([
+        Event(name=f'Event {i}', description='Synthetic event ' * 10, start_date=start_date, end_date=start_date, created_by=users[0])
+        for i in range(count)
+    ])
+    EventAttendee.objects.bulk_create([EventAttendee(event=event, user=user) for event in events for user in users])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', nargs='+', type=int, default=[50, 200, 1000])
+    parser.add_argument('--attendees', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup()
+    populate(max(args.events), args.attendees)
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from events.models import Event
+    from events.queries import plan_queryset
+    from events.serializers import EventSerializer
+    from tikoExercise.parsers import FastJSONParser
+    from tikoExercise.renderers import (
+        FastJSONRenderer,
+        orjson
+    )
+
+    if orjson is None:
+        print('orjson is not installed, FastJSONRenderer falls back to the stdlib json.')
+
+    print(f'{"Events":>8}{"KiB":>10}{"render stdlib":>16}{"render orjson":>16}{"parse stdlib":>15}{"parse orjson":>15}   (ms, median)')
+    for count in sorted(args.events):
+        queryset = plan_queryset(Event.objects.order_by('-start_date', '-id'), EventSerializer())[:count]
+        data = {'next': None, 'previous': None, 'results': EventSerializer(queryset, many=True).data}
+        rendered = JSONRenderer().render(data)
+        assert FastJSONRenderer().render(data) == rendered
+        timings = (
+            timeit(lambda: JSONRenderer().render(data), repeat=args.repeat),
+            timeit(lambda: FastJSONRenderer().render(data), repeat=args.repeat),
+            timeit(lambda: JSONParser().parse(BytesIO(rendered)), repeat=args.repeat),
+            timeit(lambda: FastJSONParser().parse(BytesIO(rendered)), repeat=args.repeat),
+        )
+        print(f'{count:>8}{len(rendered) / 1024:>10.1f}' + ''.join(f'{timing:>16.2f}' for timing in timings[:2]) + ''.join(f'{timing:>15.2f}' for timing in timings[2:]))
+
+
+if __name__ == '__main__':
+    main()
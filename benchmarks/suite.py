@@ -0,0 +1,185 @@
+"""
+Reproducible benchmark of the events hot paths (list, detail, register and
+unregister) at several dataset sizes, generated by the generate_events command.
+
+    python -m benchmarks.suite --sizes 1000 10000 100000 --output results.json
+    python -m benchmarks.suite --sizes 1000 10000 100000 --baseline results.json
+
+For every size, a fresh database is populated with `size` events, `size / 10`
+users (100 at least) and `5 * size` attendees spread over the events with a
+Zipf distribution, from the same seed. The requests go through the whole Django
+stack with the test client; the median and 95th percentile durations and the
+number of queries are reported per request.
+
+The results can be saved as JSON with `--output`, and compared with a saved
+baseline with `--baseline`: the command exits with status 1 when a median is
+slower than the baseline by more than `--threshold`, or when a request makes
+more queries.
+"""
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import sys
+from datetime import date
+
+from benchmarks import (
+    measure,
+    setup
+)
+
+
+def get_environment():
+    import django
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'orjson': orjson.__version__ if orjson else None,
+        'machine': platform.machine(),
+        'system': platform.system(),
+    }
+
+
+def run(size, repeat, seed):
+    setup()
+
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+
+    from authentication.serializers import ClaimsTokenObtainPairSerializer
+    from events.models import (
+        Event,
+        EventAttendee
+    )
+
+    call_command('generate_events', users=max(100, size // 10), events=size, attendees=5 * size, seed=seed, verbosity=0, stdout=sys.stderr)
+
+    user = User.objects.create_user(username='benchmark', password='benchmark')
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {ClaimsTokenObtainPairSerializer.get_token(user).access_token}')
+
+    future_events = Event.objects.filter(start_date__gt=date.today())
+    popular = future_events.order_by('-attendee_count', 'pk').first()
+    typical = future_events.filter(attendee_count__lte=5).order_by('pk').first()
+    # Every registration needs an event the user is not registered to yet, with unlimited capacity
+    to_register = list(future_events.filter(capacity=0).order_by('pk').values_list('pk', flat=True)[:repeat + 1])
+    if len(to_register) <= repeat:
+        sys.exit(f'Not enough future events to register to at size {size}, lower --repeat.')
+    registered = []
+
+    def register():
+        return client.post('/events/register-attendee/', {'event': to_register.pop()}, format='json')
+
+    def prepare_unregister():
+        registered.extend(EventAttendee.objects.filter(user=user).values_list('pk', flat=True))
+
+    def unregister():
+        return client.delete(f'/events/unregister-attendee/{registered.pop()}/')
+
+    requests = {
+        # name: (request, expected status, preparation)
+        'GET /events/': (lambda: client.get('/events/'), 200, None),
+        'GET /events/?summary': (lambda: client.get('/events/', {'summary': ''}), 200, None),
+        'GET /events/?status=future': (lambda: client.get('/events/', {'status': 'future'}), 200, None),
+        'GET /events/<popular>/': (lambda: client.get(f'/events/{popular.pk}/'), 200, None),
+        'GET /events/<typical>/': (lambda: client.get(f'/events/{typical.pk}/'), 200, None),
+        'POST /events/register-attendee/': (register, 201, None),
+        # Unregisters the attendees registered above
+        'DELETE /events/unregister-attendee/<id>/': (unregister, 204, prepare_unregister),
+    }
+
+    results = {}
+    for name, (function, expected_status, prepare) in requests.items():
+        if prepare is not None:
+            prepare()
+        # The first call warms up and counts the queries
+        with CaptureQueriesContext(connection) as context:
+            response = function()
+        assert response.status_code == expected_status, (name, response.status_code, response.data)
+        # The queries log is reset by the next request
+        queries = len(context.captured_queries)
+        durations = measure(function, repeat=repeat)
+        results[name] = {
+            'median_ms': round(statistics.median(durations), 3),
+            'p95_ms': round(statistics.quantiles(durations, n=20)[18], 3) if len(durations) > 1 else round(durations[0], 3),
+            'queries': queries,
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints the ratio of the medians to the baseline, and returns the list of the regressions.
+    """
+    regressions = []
+    print()
+    print(f'{"Compared to the baseline":<44}{"size":>10}{"median":>10}{"baseline":>10}{"ratio":>8}{"queries":>10}')
+    for size, requests in results.items():
+        for name, result in requests.items():
+            reference = baseline.get(size, {}).get(name)
+            if reference is None:
+                continue
+            ratio = result['median_ms'] / reference['median_ms'] if reference['median_ms'] else float('inf')
+            queries = f'{reference["queries"]}->{result["queries"]}'
+            flags = []
+            if ratio > 1 + threshold:
+                flags.append('SLOWER')
+            if result['queries'] > reference['queries']:
+                flags.append('MORE QUERIES')
+            if flags:
+                regressions.append((size, name, flags))
+            print(
+                f'{name:<44}{size:>10}{result["median_ms"]:>10.2f}{reference["median_ms"]:>10.2f}'
+                f'{ratio:>7.2f}x{queries:>10}  {" ".join(flags)}'
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000, 100000], help='Numbers of events.')
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Writes the results to this JSON file.')
+    parser.add_argument('--baseline', help='Compares the results with this JSON file, written by --output.')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Tolerated slowdown of the medians, 0.25 by default (25%%).')
+    args = parser.parse_args()
+
+    results = {}
+    for size in sorted(args.sizes):
+        results[str(size)] = run(size, args.repeat, args.seed)
+        print(f'Benchmarked {size} events', file=sys.stderr, flush=True)
+
+    print(f'{"Request":<44}{"size":>10}{"median ms":>11}{"p95 ms":>10}{"queries":>9}')
+    for size, requests in results.items():
+        for name, result in requests.items():
+            print(f'{name:<44}{size:>10}{result["median_ms"]:>11.2f}{result["p95_ms"]:>10.2f}{result["queries"]:>9}')
+
+    report = {
+        'environment': get_environment(),
+        'parameters': {'sizes': sorted(args.sizes), 'repeat': args.repeat, 'seed': args.seed},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            baseline = json.load(baseline)
+        if baseline['environment'] != report['environment']:
+            print(f'Warning: the baseline was run in another environment: {baseline["environment"]}', file=sys.stderr)
+        if compare(results, baseline['results'], args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
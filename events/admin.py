@@ -26,6 +26,6 @@ class EventAdmin(admin.ModelAdmin):
         return initial
 
     def show_attendees(self, instance):
-        return instance.attendees.count()
+        return instance.attendee_count
 
     show_attendees.short_description = 'Attendees'
@@ -0,0 +1,178 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.db import (
+    IntegrityError,
+    transaction
+)
+from django.http import (
+    Http404,
+    JsonResponse
+)
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.request import Request
+
+from authentication.backends import (
+    StatelessJWTAuthentication,
+    ensure_user_exists
+)
+from events import pubsub
+from events import tasks
+from events.filters import (
+    EventFilterBackend,
+    EventSearchFilter
+)
+from events.models import (
+    Event,
+    EventAttendee,
+    reserved_seats
+)
+from events.pagination import EventCursorPagination
+from events.queries import QueryPlanMixin
+from events.serializers import (
+    EventAttendeeSerializer,
+    EventSerializer
+)
+from events.views import EventSummaryMixin
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncAPIView(View):
+    """
+    Base of the async views, as DRF views are sync only.
+
+    Requests are authenticated from the token claims, which needs no query (see
+    :mod:`authentication.backends`), and the DRF exceptions are rendered as JSON with
+    the same status codes as the DRF views. The request is wrapped in a DRF `Request`,
+    so that the filter backends, paginators and serializers of the sync views are reused.
+    """
+    authentication_class = StatelessJWTAuthentication
+    queryset = None
+    serializer_class = None
+    filter_backends = ()
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.request = Request(request)
+        authentication = self.authentication_class()
+        try:
+            user_auth = authentication.authenticate(self.request)
+            if user_auth is None:
+                raise exceptions.NotAuthenticated()
+            self.request.user, self.request.auth = user_auth
+            return await super(AsyncAPIView, self).dispatch(request, *args, **kwargs)
+        except Http404:
+            return self.handle_exception(exceptions.NotFound(), authentication)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc, authentication)
+
+    def handle_exception(self, exc, authentication):
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = JsonResponse(data, status=exc.status_code, safe=False)
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            response.status_code = 401
+            response['WWW-Authenticate'] = authentication.authenticate_header(self.request)
+        return response
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+    def get_serializer_class(self):
+        return self.serializer_class
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('context', {'request': self.request, 'view': self})
+        return self.get_serializer_class()(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+
+class AsyncEventListView(EventSummaryMixin, QueryPlanMixin, AsyncAPIView):
+    """
+    Async variant of EventListView, with the same query parameters and pagination.
+    """
+    queryset = Event.objects.all()
+    serializer_class = EventSerializer
+    filter_backends = (EventFilterBackend, EventSearchFilter)
+
+    def get_queryset(self):
+        queryset = super(AsyncEventListView, self).get_queryset()
+        # Handle the mine query parameter in order to filter User's own Events only
+        if self.request.query_params.get('mine') is not None:
+            queryset = queryset.filter(created_by_id=self.request.user.id)
+        return queryset
+
+    async def get(self, request, *args, **kwargs):
+        paginator = EventCursorPagination()
+        page = await paginator.apaginate_queryset(self.filter_queryset(self.get_queryset()), self.request, view=self)
+        return JsonResponse({
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'results': self.get_serializer(page, many=True).data,
+        })
+
+
+class AsyncEventGetView(EventSummaryMixin, QueryPlanMixin, AsyncAPIView):
+    """
+    Async variant of EventGetView.
+    """
+    queryset = Event.objects.all()
+    serializer_class = EventSerializer
+
+    async def get(self, request, pk, *args, **kwargs):
+        try:
+            event = await self.get_queryset().aget(pk=pk)
+        except Event.DoesNotExist:
+            raise Http404
+        return JsonResponse(self.get_serializer(event).data)
+
+
+class AsyncEventAttendeeRegisterView(AsyncAPIView):
+    """
+    Async variant of EventAttendeeRegisterView, with the same rules.
+    """
+
+    async def post(self, request, *args, **kwargs):
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError as exc:
+            raise exceptions.ParseError(f'JSON parse error - {exc}')
+        pk = data.get('event') if isinstance(data, dict) else None
+        if pk is None:
+            raise exceptions.ValidationError({'event': ['This field is required.']})
+        if not isinstance(pk, int) or isinstance(pk, bool):
+            raise exceptions.ValidationError({'event': [f'Incorrect type. Expected pk value, received {type(pk).__name__}.']})
+        event = await Event.objects.filter(pk=pk).only('start_date').afirst()
+        if event is None:
+            raise exceptions.ValidationError({'event': [f'Invalid pk "{pk}" - object does not exist.']})
+
+        if event.start_date < timezone.now().date():
+            raise exceptions.PermissionDenied({'event': 'It is not allowed to register to past events.'})
+        # The User may be loaded into the cache, which is sync only
+        await sync_to_async(ensure_user_exists)(self.request.user)
+        attendee = await self.register(pk, self.request.user.id)
+        return JsonResponse(EventAttendeeSerializer(attendee).data, status=201)
+
+    @staticmethod
+    @sync_to_async
+    def register(pk, user_id):
+        # Transactions are sync only: the seat reservation and the insert run in the same thread
+        try:
+            with transaction.atomic(), reserved_seats():
+                if not Event.objects.reserve_seat(pk):
+                    raise exceptions.PermissionDenied({'event': 'It is not allowed to register to a full event.'})
+                attendee = EventAttendee.objects.create(event_id=pk, user_id=user_id)
+                tasks.enqueue_registered([(pk, user_id)])
+                pubsub.notify([pk])
+                return attendee
+        except IntegrityError:
+            # See EventAttendeeRegisterView.perform_create
+            if not EventAttendee.objects.filter(event_id=pk, user_id=user_id).exists():
+                raise
+            raise exceptions.PermissionDenied({'event': 'It is not allowed to register more than once to an event.'})
@@ -0,0 +1,166 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+class BaseResponseCache:
+    """
+    Cache of the responses of the event list, keyed by the request parameters and a generation.
+
+    The generation is a random value replaced whenever an event or an attendee changes, see
+    `invalidate()`: replacing it orphans every cached response at once, so that a stale list
+    is never served, and the orphans eventually expire or get evicted. Unlike an increment,
+    a replacement needs no atomic operation of the cache, so concurrent ones cannot cancel out.
+    It is stored in the Django cache `generation_cache`, which must be shared by the processes:
+    with a cache local to the process, the other processes would keep serving their stale lists.
+
+    Hits and misses are counted by process, see `stats()`.
+    """
+    generation_key = 'events:list:generation'
+
+    def __init__(self, timeout=60, generation_cache='shared'):
+        self.timeout = timeout
+        self.generation_cache = caches[generation_cache]
+        if isinstance(self.generation_cache, (LocMemCache, DummyCache)):
+            raise ImproperlyConfigured(
+                f'The generation cache "{generation_cache}" of EVENTS_LIST_CACHE must be shared by the processes, '
+                f'not local to the process.'
+            )
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_generation(self):
+        generation = self.generation_cache.get(self.generation_key)
+        if generation is None:
+            self.generation_cache.add(self.generation_key, uuid.uuid4().hex, timeout=None)
+            generation = self.generation_cache.get(self.generation_key)
+        return generation
+
+    def bump_generation(self):
+        self.generation_cache.set(self.generation_key, uuid.uuid4().hex, timeout=None)
+
+    def make_key(self, *parts):
+        return md5(repr((self.get_generation(),) + parts).encode(), usedforsecurity=False).hexdigest()
+
+    def get(self, key):
+        value = self._get(key)
+        with self.lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self._set(key, value)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'backend': f'{type(self).__module__}.{type(self).__name__}',
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else None,
+        }
+
+    def _get(self, key):
+        raise NotImplementedError
+
+    def _set(self, key, value):
+        raise NotImplementedError
+
+
+class LocMemResponseCache(BaseResponseCache):
+    """
+    Least recently used responses, kept in the memory of the process for `timeout` seconds.
+    """
+
+    def __init__(self, max_entries=1024, **kwargs):
+        super(LocMemResponseCache, self).__init__(**kwargs)
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def _get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def _set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.timeout, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+class DjangoResponseCache(BaseResponseCache):
+    """
+    Responses stored in the Django cache `cache`, e.g. shared by the processes with Redis or Memcached.
+    """
+
+    def __init__(self, cache='default', **kwargs):
+        super(DjangoResponseCache, self).__init__(**kwargs)
+        self.cache = caches[cache]
+
+    def _get(self, key):
+        return self.cache.get(f'events:list:{key}')
+
+    def _set(self, key, value):
+        self.cache.set(f'events:list:{key}', value, timeout=self.timeout)
+
+
+_list_cache = None
+
+
+def get_list_cache():
+    """
+    Returns the cache configured by the `EVENTS_LIST_CACHE` setting, or `None` if it is disabled.
+    """
+    global _list_cache
+    config = getattr(settings, 'EVENTS_LIST_CACHE', None)
+    if not config:
+        return None
+    if _list_cache is None:
+        _list_cache = import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+    return _list_cache
+
+
+@receiver(setting_changed)
+def reset_list_cache(setting, **kwargs):
+    global _list_cache
+    if setting in ('EVENTS_LIST_CACHE', 'CACHES'):
+        _list_cache = None
+
+
+def invalidate():
+    """
+    Replaces the generation of the event list cache. Replaced again once the current transaction
+    is committed: a response read concurrently, before the commit, may have been cached with
+    the first one.
+    """
+    cache = get_list_cache()
+    if cache is None:
+        return
+    cache.bump_generation()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(cache.bump_generation)
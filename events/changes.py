@@ -0,0 +1,99 @@
+"""
+Change feed of the events and their attendees, for the clients keeping a local copy in sync.
+
+The feed merges three streams: the events and the attendees created or modified since the
+cursor, by `modified_on`, and the tombstones of the events and attendees deleted since then,
+by `deleted_on`. Every stream is paged on its own ``(timestamp, id)`` keyset, whose positions
+are stored in the opaque cursor, so that a sync costs an index range scan per stream whatever
+the size of the tables.
+
+A change is only listed once it is older than the `DELAY` of the `EVENTS_CHANGES` setting: the
+timestamps are set before the transactions commit, and a transaction which started earlier may
+commit after a later one, which a cursor would have already moved past.
+"""
+import json
+from base64 import (
+    urlsafe_b64decode,
+    urlsafe_b64encode
+)
+from binascii import Error as BinasciiError
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from events.models import (
+    Event,
+    EventAttendee,
+    EventTombstone
+)
+
+STREAMS = {
+    'events': (Event.objects.all(), 'modified_on'),
+    'attendees': (EventAttendee.objects.all(), 'modified_on'),
+    'deleted': (EventTombstone.objects.all(), 'deleted_on'),
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(positions):
+    # DjangoJSONEncoder would truncate the timestamps to milliseconds, and the keyset would repeat rows
+    positions = {name: (timestamp.isoformat(), pk) for name, (timestamp, pk) in positions.items()}
+    return urlsafe_b64encode(json.dumps(positions).encode('ascii')).decode('ascii')
+
+
+def decode_cursor(encoded):
+    """
+    Returns the ``(timestamp, id)`` position of every stream of an encoded cursor.
+    Raises InvalidCursor if it was not produced by `encode_cursor()`.
+    """
+    try:
+        positions = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+        positions = {name: (parse_datetime(positions[name][0]), int(positions[name][1])) for name in STREAMS}
+    except (BinasciiError, UnicodeError, ValueError, TypeError, KeyError, IndexError):
+        raise InvalidCursor(encoded)
+    if any(timestamp is None for timestamp, _ in positions.values()):
+        raise InvalidCursor(encoded)
+    return positions
+
+
+def is_expired(positions):
+    """
+    Whether the tombstones of the cursor may have been purged, see EventTombstoneQuerySet.purge.
+    """
+    return positions['deleted'][0] < timezone.now() - timedelta(days=settings.EVENTS_CHANGES['RETENTION'])
+
+
+def get_changes(positions, limit):
+    """
+    Returns up to `limit` changes of every stream after `positions`, the positions after them,
+    and whether any stream has more changes. Without positions, the events and attendees are
+    listed from the start and the tombstones from now on, as a client starting from scratch
+    has nothing to delete.
+    """
+    until = timezone.now() - timedelta(seconds=settings.EVENTS_CHANGES['DELAY'])
+    if positions is None:
+        positions = {'events': None, 'attendees': None, 'deleted': (until, 0)}
+    changes = {}
+    next_positions = {}
+    has_more = False
+    for name, (queryset, field) in STREAMS.items():
+        queryset = queryset.filter(**{f'{field}__lt': until})
+        if positions[name] is not None:
+            timestamp, pk = positions[name]
+            queryset = queryset.filter(Q(**{f'{field}__gt': timestamp}) | Q(**{field: timestamp, 'id__gt': pk}))
+        rows = list(queryset.order_by(field, 'id')[:limit + 1])
+        if len(rows) > limit:
+            rows = rows[:limit]
+            has_more = True
+            next_positions[name] = (getattr(rows[-1], field), rows[-1].pk)
+        else:
+            # Caught up: every change before `until` has been listed, the next ones are after it
+            next_positions[name] = (until, 0)
+        changes[name] = rows
+    return changes, next_positions, has_more
@@ -0,0 +1,52 @@
+from hashlib import md5
+
+from django.utils.cache import (
+    get_conditional_response,
+    patch_vary_headers
+)
+from django.utils.http import (
+    http_date,
+    quote_etag
+)
+
+
+def get_etag(*key):
+    """
+    Returns a strong ETag for the representation identified by `key`.
+    """
+    return quote_etag(md5(repr(key).encode(), usedforsecurity=False).hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET: when the client already holds the current version of the resource
+    (If-None-Match or If-Modified-Since), responds 304 Not Modified without serializing it.
+
+    Views implement `get_version()`, returning the last modification date of the resource
+    and the ETag of its representation, with a cheap query. The version is `None` if the
+    resource does not exist, in which case the request is processed normally.
+    """
+
+    def get_version(self):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        version = self.get_version()
+        if version is None:
+            return super(ConditionalGetMixin, self).get(request, *args, **kwargs)
+        last_modified, etag = version
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super(ConditionalGetMixin, self).get(request, *args, **kwargs)
+        return set_validators(response, last_modified, etag)
+
+
+def set_validators(response, last_modified, etag):
+    if 200 <= response.status_code < 300 or response.status_code == 304:
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        # The summary representation depends on the request User
+        patch_vary_headers(response, ('Authorization',))
+    return response
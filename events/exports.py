@@ -0,0 +1,68 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+from events.models import EventAttendee
+
+EVENT_FIELDS = ('id', 'name', 'description', 'start_date', 'end_date', 'capacity', 'attendee_count', 'created_by_id', 'created_on', 'modified_on')
+ATTENDEE_FIELDS = ('user_id', 'created_on')
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class Echo:
+    """
+    File-like object returning what is written, so that csv.writer produces strings.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_events(queryset, chunk_size=2000):
+    """
+    Iterates over the events of `queryset` with their attendees, by chunks of `chunk_size`
+    events: every chunk is fetched with one query, and its attendees with another one.
+    """
+    queryset = queryset.order_by('id').prefetch_related(
+        Prefetch('attendees', queryset=EventAttendee.objects.order_by('id'))
+    )
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def export_csv(queryset, chunk_size=2000):
+    """
+    Yields the lines of a CSV export: one row per attendee of every event, the event
+    columns being repeated, and a single row without attendee columns for the events
+    without attendees.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(EVENT_FIELDS + tuple(f'attendee_{field}' for field in ATTENDEE_FIELDS))
+    for event in iter_events(queryset, chunk_size):
+        columns = [getattr(event, field) for field in EVENT_FIELDS]
+        attendees = event.attendees.all()
+        if not attendees:
+            yield writer.writerow(columns + [''] * len(ATTENDEE_FIELDS))
+        for attendee in attendees:
+            yield writer.writerow(columns + [getattr(attendee, field) for field in ATTENDEE_FIELDS])
+
+
+def export_ndjson(queryset, chunk_size=2000):
+    """
+    Yields the lines of a newline delimited JSON export: one event per line, with the list of its attendees.
+    """
+    encoder = DjangoJSONEncoder()
+    for event in iter_events(queryset, chunk_size):
+        data = {field: getattr(event, field) for field in EVENT_FIELDS}
+        data['attendees'] = [{field: getattr(attendee, field) for field in ATTENDEE_FIELDS} for attendee in event.attendees.all()]
+        yield encoder.encode(data) + '\n'
+
+
+EXPORTERS = {
+    'csv': export_csv,
+    'ndjson': export_ndjson,
+}
@@ -0,0 +1,189 @@
+from django.db.models import (
+    F,
+    Q
+)
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import (
+    exceptions,
+    filters
+)
+
+from events.search import get_search_backend
+
+
+class EventFilterBackend(filters.BaseFilterBackend):
+    """
+    Filters the events on their dates, status, remaining capacity and creator.
+
+    Every filter compiles to a range condition on `start_date`/`end_date` (or an
+    equality on `created_by`), so that the database can walk the date indexes
+    instead of scanning the table. Since an event never ends before it starts,
+    conditions on `end_date` are paired with the implied bound on `start_date`,
+    which is the column the list is ordered and paginated by.
+    """
+    date_params = {
+        'start_after': 'Events starting on or after the date (YYYY-MM-DD).',
+        'start_before': 'Events starting on or before the date (YYYY-MM-DD).',
+        'end_after': 'Events ending on or after the date (YYYY-MM-DD).',
+        'end_before': 'Events ending on or before the date (YYYY-MM-DD).',
+        'active_from': 'Events active on or after the date (YYYY-MM-DD), i.e. not ended before it.',
+        'active_to': 'Events active on or before the date (YYYY-MM-DD), i.e. not started after it.',
+    }
+    status_choices = ('past', 'ongoing', 'future')
+    boolean_values = {
+        'true': True, '1': True, 'yes': True,
+        'false': False, '0': False, 'no': False,
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        dates = {name: self._parse_date(params, name) for name in self.date_params}
+
+        if dates['start_after']:
+            queryset = queryset.filter(start_date__gte=dates['start_after'])
+        if dates['start_before']:
+            queryset = queryset.filter(start_date__lte=dates['start_before'])
+        if dates['end_after']:
+            queryset = queryset.filter(end_date__gte=dates['end_after'])
+        if dates['end_before']:
+            queryset = queryset.filter(end_date__lte=dates['end_before'], start_date__lte=dates['end_before'])
+        # Calendar overlap: the event starts before the period ends and ends after the period starts
+        if dates['active_to']:
+            queryset = queryset.filter(start_date__lte=dates['active_to'])
+        if dates['active_from']:
+            queryset = queryset.filter(end_date__gte=dates['active_from'])
+
+        status = params.get('status')
+        if status is not None:
+            today = timezone.now().date()
+            if status == 'past':
+                queryset = queryset.filter(end_date__lt=today, start_date__lt=today)
+            elif status == 'ongoing':
+                queryset = queryset.filter(start_date__lte=today, end_date__gte=today)
+            elif status == 'future':
+                queryset = queryset.filter(start_date__gt=today)
+            else:
+                raise exceptions.ValidationError({'status': f'Select one of {", ".join(self.status_choices)}.'})
+
+        has_capacity = params.get('has_capacity')
+        if has_capacity is not None:
+            has_capacity = self.boolean_values.get(has_capacity.lower())
+            if has_capacity is None:
+                raise exceptions.ValidationError({'has_capacity': 'Must be a valid boolean.'})
+            available = Q(capacity=0) | Q(attendee_count__lt=F('capacity'))
+            queryset = queryset.filter(available if has_capacity else ~available)
+
+        created_by = params.get('created_by')
+        if created_by is not None:
+            if not created_by.isdigit():
+                raise exceptions.ValidationError({'created_by': 'A valid integer is required.'})
+            queryset = queryset.filter(created_by_id=int(created_by))
+
+        return queryset
+
+    @staticmethod
+    def _parse_date(params, name):
+        value = params.get(name)
+        if value is None:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise exceptions.ValidationError({name: 'Enter a valid date (YYYY-MM-DD).'})
+        return parsed
+
+    def get_schema_operation_parameters(self, view):
+        parameters = [
+            {
+                'name': name,
+                'required': False,
+                'in': 'query',
+                'description': description,
+                'schema': {'type': 'string', 'format': 'date'},
+            }
+            for name, description in self.date_params.items()
+        ]
+        parameters += [
+            {
+                'name': 'status',
+                'required': False,
+                'in': 'query',
+                'description': 'Events in the past, ongoing or in the future, relative to today.',
+                'schema': {'type': 'string', 'enum': list(self.status_choices)},
+            },
+            {
+                'name': 'has_capacity',
+                'required': False,
+                'in': 'query',
+                'description': 'Events with (or without) remaining capacity.',
+                'schema': {'type': 'boolean'},
+            },
+            {
+                'name': 'created_by',
+                'required': False,
+                'in': 'query',
+                'description': 'Events created by the given user id.',
+                'schema': {'type': 'integer'},
+            },
+        ]
+        return parameters
+
+
+class EventRegistrationFilterBackend(filters.BaseFilterBackend):
+    """
+    Filters the registrations of the request User on the status of their events, with the `status`
+    query parameter: `upcoming` events (not ended yet) are listed soonest first, `past` events
+    most recent first. The queryset must be annotated with the `start_date` of the events.
+    """
+    status_choices = ('upcoming', 'past')
+
+    def filter_queryset(self, request, queryset, view):
+        status = request.query_params.get('status')
+        if status is None:
+            return queryset
+        today = timezone.now().date()
+        if status == 'upcoming':
+            return queryset.filter(event__end_date__gte=today).order_by('start_date', 'id')
+        if status == 'past':
+            return queryset.filter(event__end_date__lt=today).order_by('-start_date', '-id')
+        raise exceptions.ValidationError({'status': f'Select one of {", ".join(self.status_choices)}.'})
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': 'status',
+                'required': False,
+                'in': 'query',
+                'description': 'Registrations to upcoming (not ended) events, soonest first, or to past events, most recent first.',
+                'schema': {'type': 'string', 'enum': list(self.status_choices)},
+            },
+        ]
+
+
+class EventSearchFilter(filters.BaseFilterBackend):
+    """
+    Full-text search over the name and description of the events, with the `q` query parameter.
+    Results are ordered by relevance, see :mod:`events.search`.
+    """
+    search_param = 'q'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param)
+        if not query:
+            return queryset
+        queryset = get_search_backend().search(queryset, query)
+        return queryset.order_by('search_rank', '-start_date', '-id')
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.search_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Search terms, matched as prefixes of the words of the name and description.',
+                'schema': {'type': 'string'},
+            },
+        ]
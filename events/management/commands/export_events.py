@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from events import exports
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = 'Exports every event with its attendees as CSV or newline delimited JSON, with constant memory.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', choices=tuple(exports.EXPORTERS), default='csv', help='Export format (default: csv).')
+        parser.add_argument('--output', help='Output file, the standard output by default.')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Number of events fetched per query.')
+
+    def handle(self, *args, **options):
+        lines = exports.EXPORTERS[options['type']](Event.objects.all(), chunk_size=options['chunk_size'])
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        count = 0
+        with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+            for line in lines:
+                output.write(line)
+                count += 1
+        self.stderr.write(self.style.SUCCESS(f'Exported {count} line(s) to {options["output"]}.'))
@@ -0,0 +1,98 @@
+import itertools
+import random
+from datetime import (
+    date,
+    timedelta
+)
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from events import cache
+from events.models import (
+    Event,
+    EventAttendee
+)
+from events.search import get_search_backend
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates a synthetic dataset of users, events and attendees with bulk inserts. '
+        'The attendees follow a Zipf distribution: a few popular events gather most of them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Number of users to create.')
+        parser.add_argument('--events', type=int, default=10000, help='Number of events to create.')
+        parser.add_argument('--attendees', type=int, default=100000, help='Number of registrations to create, within the capacity of the events.')
+        parser.add_argument('--skew', type=float, default=1.1, help='Exponent of the Zipf distribution of the attendees over the events (0 for uniform).')
+        parser.add_argument('--password', default='generated', help='Password of the users, in order to obtain tokens.')
+        parser.add_argument('--prefix', default='generated', help='Prefix of the usernames.')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random generator, for reproducible datasets.')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Number of rows per insert.')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+
+        with transaction.atomic():
+            # Hashing is the slow part of creating users: all of them share the same hash
+            password = make_password(options['password'])
+            User.objects.bulk_create(
+                (User(username=f'{options["prefix"]}{i}', password=password) for i in range(options['users'])),
+                batch_size=batch_size
+            )
+            user_ids = list(User.objects.filter(username__startswith=options['prefix']).order_by('pk').values_list('pk', flat=True))
+            if not user_ids:
+                self.stderr.write(self.style.ERROR('No users to create the events with.'))
+                return
+
+            today = date.today()
+            events = []
+            for i in range(options['events']):
+                start_date = today + timedelta(days=rng.randint(-365, 365))
+                events.append(Event(
+                    name=f'Event {i}',
+                    description=f'Synthetic event {rng.choice(("concert", "meetup", "workshop", "conference", "party"))} number {i}',
+                    start_date=start_date,
+                    end_date=start_date + timedelta(days=rng.randint(0, 6)),
+                    capacity=rng.choice((0, 0, 50, 100, 500, 1000)),
+                    created_by_id=rng.choice(user_ids),
+                ))
+            events = Event.objects.bulk_create(events, batch_size=batch_size)
+
+            attendees = self.get_attendees(events, user_ids, options['attendees'], options['skew'], rng)
+            count = 0
+            for batch in iter(lambda: list(itertools.islice(attendees, batch_size)), []):
+                count += len(EventAttendee.objects.bulk_create(batch))
+            Event.objects.all().reconcile_attendee_count()
+
+        # Bulk inserts do not send the signals which maintain the search index and the list cache
+        get_search_backend().rebuild()
+        cache.invalidate()
+        self.stdout.write(self.style.SUCCESS(f'Generated {len(user_ids)} user(s), {len(events)} event(s) and {count} attendee(s).'))
+
+    @staticmethod
+    def get_attendees(events, user_ids, count, skew, rng):
+        """
+        Yields up to `count` attendees, the share of the event of rank r being proportional to 1 / r ** `skew`.
+        Events are filled up to their capacity, the overflow being spread over the less popular events.
+        """
+        # The popular events are spread over the dates, rather than being the first created
+        ranked = rng.sample(events, len(events))
+        weights = [1 / rank ** skew for rank in range(1, len(ranked) + 1)]
+        remaining_weight = sum(weights)
+        for event, weight in zip(ranked, weights):
+            if count <= 0:
+                return
+            limit = min(event.capacity or len(user_ids), len(user_ids))
+            size = min(limit, round(count * weight / remaining_weight))
+            count -= size
+            remaining_weight -= weight
+            for user_id in rng.sample(user_ids, size):
+                yield EventAttendee(event_id=event.pk, user_id=user_id)
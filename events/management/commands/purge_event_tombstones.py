@@ -0,0 +1,18 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from events.models import EventTombstone
+
+
+class Command(BaseCommand):
+    help = 'Deletes the tombstones of the change feed older than the retention of the EVENTS_CHANGES setting.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.EVENTS_CHANGES['RETENTION'], help='Retention of the tombstones, in days.')
+
+    def handle(self, *args, **options):
+        purged = EventTombstone.objects.purge(timezone.now() - timedelta(days=options['days']))
+        self.stdout.write(self.style.SUCCESS(f'Purged {purged} tombstone(s).'))
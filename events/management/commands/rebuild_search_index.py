@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from events.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index of the events from scratch.'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the search index with {backend.__class__.__name__}.'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from events import cache
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = 'Backfills/reconciles the denormalized attendee count of the events with the attendees table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_ids', nargs='*', type=int, help='Restrict to the given event ids.')
+
+    def handle(self, *args, **options):
+        queryset = Event.objects.all()
+        if options['event_ids']:
+            queryset = queryset.filter(pk__in=options['event_ids'])
+        fixed = queryset.reconcile_attendee_count()
+        if fixed:
+            cache.invalidate()
+        self.stdout.write(self.style.SUCCESS(f'Reconciled the attendee count of {fixed} event(s).'))
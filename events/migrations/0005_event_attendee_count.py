@@ -0,0 +1,33 @@
+# Generated by Django 4.1.7 on 2026-10-18 11:35
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_attendee_count(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    EventAttendee = apps.get_model('events', 'EventAttendee')
+    actual = Coalesce(
+        Subquery(
+            EventAttendee.objects.filter(event=OuterRef('pk')).order_by().values('event').annotate(count=Count('pk')).values('count')
+        ),
+        0
+    )
+    Event.objects.update(attendee_count=actual)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_event_capacity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='attendee_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='attendee count'),
+        ),
+        migrations.RunPython(backfill_attendee_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.1.7 on 2026-10-18 11:37
+
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def remove_duplicate_attendees(apps, schema_editor):
+    """
+    Keeps the first registration of each (event, user) pair, so that the unique constraint can be added.
+    """
+    Event = apps.get_model('events', 'Event')
+    EventAttendee = apps.get_model('events', 'EventAttendee')
+    duplicates = EventAttendee.objects.values('event', 'user').annotate(first_id=Min('id'), count=Count('id')).filter(count__gt=1)
+    for duplicate in duplicates:
+        EventAttendee.objects.filter(event=duplicate['event'], user=duplicate['user']).exclude(id=duplicate['first_id']).delete()
+        actual = Coalesce(
+            Subquery(
+                EventAttendee.objects.filter(event=OuterRef('pk')).order_by().values('event').annotate(count=Count('pk')).values('count')
+            ),
+            0
+        )
+        Event.objects.filter(pk=duplicate['event']).update(attendee_count=actual)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_event_attendee_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_attendees, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['start_date'], name='events_event_start_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['created_by', 'start_date'], name='events_event_creator_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventattendee',
+            index=models.Index(fields=['user', 'event'], name='events_attendee_user_event_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='eventattendee',
+            constraint=models.UniqueConstraint(fields=('event', 'user'), name='events_attendee_unique_event_user'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.1.7 on 2026-10-18 11:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_attendee_constraints_and_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['end_date'], name='events_event_end_date_idx'),
+        ),
+    ]
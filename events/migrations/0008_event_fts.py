@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def create_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('CREATE VIRTUAL TABLE IF NOT EXISTS events_event_fts USING fts5(name, description)')
+    schema_editor.execute('INSERT INTO events_event_fts (rowid, name, description) SELECT id, name, description FROM events_event')
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS events_event_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_end_date_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.1.7 on 2026-10-18 12:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('events', '0008_event_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='waitlist_head',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='waitlist head'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='waitlist_tail',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='waitlist tail'),
+        ),
+        migrations.CreateModel(
+            name='EventWaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_on', models.DateTimeField(auto_now_add=True, verbose_name='Created on')),
+                ('ticket', models.PositiveIntegerField(editable=False, verbose_name='ticket')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='events.event', verbose_name='event')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlists', to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'event waitlist entry',
+                'verbose_name_plural': 'event waitlist entries',
+                'ordering': ('event', 'ticket'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='eventwaitlistentry',
+            index=models.Index(fields=['event', 'ticket'], name='events_waitlist_ticket_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='eventwaitlistentry',
+            constraint=models.UniqueConstraint(fields=('event', 'user'), name='events_waitlist_unique_event_user'),
+        ),
+    ]
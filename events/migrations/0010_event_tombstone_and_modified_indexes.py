@@ -0,0 +1,39 @@
+# Generated by Django 4.1.7 on 2026-10-18 12:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_event_waitlist'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('event', 'event'), ('attendee', 'attendee')], max_length=8, verbose_name='kind')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='object id')),
+                ('deleted_on', models.DateTimeField(auto_now_add=True, verbose_name='Deleted on')),
+            ],
+            options={
+                'verbose_name': 'event tombstone',
+                'verbose_name_plural': 'event tombstones',
+                'ordering': ('deleted_on', 'id'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['modified_on', 'id'], name='events_event_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventattendee',
+            index=models.Index(fields=['modified_on', 'id'], name='events_attendee_modified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventtombstone',
+            index=models.Index(fields=['deleted_on', 'id'], name='events_tombstone_deleted_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.1.7 on 2026-10-18 12:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_event_tombstone_and_modified_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventAuditEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_on', models.DateTimeField(auto_now_add=True, verbose_name='Created on')),
+                ('action', models.CharField(choices=[('event_created', 'event created'), ('attendee_registered', 'attendee registered')], max_length=32, verbose_name='action')),
+                ('event_id', models.PositiveBigIntegerField(verbose_name='event id')),
+                ('user_id', models.PositiveBigIntegerField(verbose_name='user id')),
+            ],
+            options={
+                'verbose_name': 'event audit entry',
+                'verbose_name_plural': 'event audit entries',
+                'ordering': ('created_on', 'id'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='eventauditentry',
+            index=models.Index(fields=['event_id', 'created_on'], name='events_audit_event_idx'),
+        ),
+    ]
@@ -1,4 +1,49 @@
-from django.db import models
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import (
+    IntegrityError,
+    connections,
+    models,
+    transaction
+)
+from django.db.models import (
+    Count,
+    F,
+    OuterRef,
+    Q,
+    Subquery
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+# Whether the attendees created or deleted are already counted by the caller, see `reserved_seats()`
+seats_reserved = ContextVar('seats_reserved', default=False)
+
+
+@contextmanager
+def reserved_seats():
+    """
+    Marks the attendees created or deleted in the block as counted by the caller, with the seat
+    reservations of EventQuerySet, so that events.signals does not count them again.
+    """
+    token = seats_reserved.set(True)
+    try:
+        yield
+    finally:
+        seats_reserved.reset(token)
+
+
+def can_update_returning(connection):
+    """
+    Whether the database supports UPDATE ... RETURNING: PostgreSQL and SQLite 3.35+ do,
+    MySQL does not, and MariaDB only supports RETURNING on INSERT and DELETE.
+    """
+    if connection.vendor == 'postgresql':
+        return True
+    if connection.vendor == 'sqlite':
+        return connection.Database.sqlite_version_info >= (3, 35)
+    return False
 
 
 class AbstractDateCreated(models.Model):
@@ -21,6 +66,141 @@ class AbstractDateModified(models.Model):
         abstract = True
 
 
+class EventQuerySet(models.QuerySet):
+    """
+    The seat counters are updated in place, bypassing `Event.save()`, so every update
+    also bumps `modified_on`: it is the version of the event and of its attendees.
+    """
+
+    def reserve_seat(self, pk):
+        """
+        Atomically increments the attendee count of an event, unless it is full.
+        The capacity check and the increment run as a single conditional UPDATE,
+        so concurrent registrations cannot exceed the capacity.
+        Returns whether a seat was reserved.
+        """
+        return bool(
+            self.filter(pk=pk)
+            .filter(Q(capacity=0) | Q(attendee_count__lt=F('capacity')))
+            .update(attendee_count=F('attendee_count') + 1, modified_on=timezone.now())
+        )
+
+    def reserve_seats(self, pk, count):
+        """
+        Atomically reserves up to `count` seats of an event, as many as its capacity allows.
+        The increment is a compare-and-swap on the attendee count, retried on conflicts.
+        Returns the number of seats reserved.
+        """
+        while True:
+            event = self.filter(pk=pk).values('capacity', 'attendee_count').first()
+            if event is None:
+                return 0
+            reserved = count
+            if event['capacity']:
+                reserved = min(count, max(event['capacity'] - event['attendee_count'], 0))
+            if not reserved:
+                return 0
+            if self.filter(pk=pk, attendee_count=event['attendee_count']).update(attendee_count=F('attendee_count') + reserved, modified_on=timezone.now()):
+                return reserved
+
+    def reserve_seat_in(self, pks):
+        """
+        Atomically reserves one seat in each of the given events that is not full.
+        Where the database supports UPDATE ... RETURNING, this is a single conditional UPDATE.
+        Returns the set of the events where a seat was reserved.
+        """
+        pks = list(pks)
+        connection = connections[self.db]
+        if not pks:
+            return set()
+        if not can_update_returning(connection):
+            return {pk for pk in pks if self.reserve_seat(pk)}
+        quote_name = connection.ops.quote_name
+        table, id_column = quote_name(self.model._meta.db_table), quote_name(self.model._meta.pk.column)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {table} SET attendee_count = attendee_count + 1, modified_on = %s '
+                f'WHERE {id_column} IN ({", ".join(["%s"] * len(pks))}) AND (capacity = 0 OR attendee_count < capacity) '
+                f'RETURNING {id_column}',
+                [connection.ops.adapt_datetimefield_value(timezone.now())] + pks
+            )
+            return {row[0] for row in cursor.fetchall()}
+
+    def release_seat(self, pk):
+        """
+        Atomically decrements the attendee count of an event.
+        Returns whether a seat was released.
+        """
+        return bool(self.filter(pk=pk, attendee_count__gt=0).update(attendee_count=F('attendee_count') - 1, modified_on=timezone.now()))
+
+    def release_seats(self, counts):
+        """
+        Atomically releases seats of several events, `counts` mapping event ids to the number of seats.
+        Events releasing a single seat are updated together, with one UPDATE.
+        """
+        single = [pk for pk, count in counts.items() if count == 1]
+        if single:
+            self.filter(pk__in=single, attendee_count__gt=0).update(attendee_count=F('attendee_count') - 1, modified_on=timezone.now())
+        for pk, count in counts.items():
+            if count > 1:
+                self.filter(pk=pk, attendee_count__gte=count).update(attendee_count=F('attendee_count') - count, modified_on=timezone.now())
+
+    def promote_waitlist(self, pk, seats=1):
+        """
+        Registers up to `seats` users of the waitlist of an event, in FIFO order, to seats which are
+        already reserved for them: the attendee count is left unchanged. Must run in a transaction.
+        Their confirmation, invite and audit are queued in the same transaction, as for the other registrations.
+        Returns the number of users registered, the caller releases the seats which were not used.
+        """
+        # events.tasks imports the models
+        from events import tasks
+
+        promoted = []
+        while len(promoted) < seats:
+            entry = EventWaitlistEntry.objects.filter(event_id=pk).order_by('ticket').first()
+            if entry is None:
+                break
+            entry.delete()
+            self.filter(pk=pk).update(waitlist_head=entry.ticket, modified_on=timezone.now())
+            try:
+                with transaction.atomic(), reserved_seats():
+                    EventAttendee.objects.create(event_id=pk, user_id=entry.user_id)
+            except IntegrityError:
+                # Registered in the meantime, e.g. by the organizer: the seat goes to the next user
+                continue
+            promoted.append((pk, entry.user_id))
+        if promoted:
+            tasks.enqueue_registered(promoted)
+        return len(promoted)
+
+    def fill_from_waitlist(self, pk):
+        """
+        Registers as many users of the waitlist of an event as its capacity allows, e.g. after the
+        capacity was raised. Must run in a transaction. Returns the number of users registered.
+        """
+        waiting = self.filter(pk=pk).values_list(F('waitlist_tail') - F('waitlist_head'), flat=True).first()
+        if not waiting:
+            return 0
+        reserved = self.reserve_seats(pk, waiting)
+        promoted = self.promote_waitlist(pk, reserved)
+        if reserved > promoted:
+            self.release_seats({pk: reserved - promoted})
+        return promoted
+
+    def reconcile_attendee_count(self):
+        """
+        Recomputes the attendee count of the events from the attendees table.
+        Returns the number of events whose count was out of sync.
+        """
+        actual = Coalesce(
+            Subquery(
+                EventAttendee.objects.filter(event=OuterRef('pk')).order_by().values('event').annotate(count=Count('pk')).values('count')
+            ),
+            0
+        )
+        return self.exclude(attendee_count=actual).update(attendee_count=actual, modified_on=timezone.now())
+
+
 class Event(AbstractDateModified, AbstractDateCreated, models.Model):
     name = models.CharField(
         max_length=255,
@@ -48,9 +228,34 @@ class Event(AbstractDateModified, AbstractDateCreated, models.Model):
         default=0,  # Means unlimited
         verbose_name='capacity'
     )
+    # Denormalized number of attendees, maintained by EventQuerySet.reserve_seat/release_seat in the views, by events.signals otherwise
+    attendee_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='attendee count'
+    )
+    # Tickets of the waitlist: the last one promoted and the last one handed out, see EventWaitlistEntry
+    waitlist_head = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='waitlist head'
+    )
+    waitlist_tail = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='waitlist tail'
+    )
+
+    objects = EventQuerySet.as_manager()
 
     class Meta:
         ordering = ('-start_date',)
+        indexes = [
+            models.Index(fields=('start_date',), name='events_event_start_date_idx'),
+            models.Index(fields=('end_date',), name='events_event_end_date_idx'),
+            models.Index(fields=('created_by', 'start_date'), name='events_event_creator_start_idx'),
+            models.Index(fields=('modified_on', 'id'), name='events_event_modified_idx'),
+        ]
         verbose_name = 'event'
         verbose_name_plural = 'events'
 
@@ -74,8 +279,168 @@ class EventAttendee(AbstractDateModified, AbstractDateCreated, models.Model):
 
     class Meta:
         ordering = ('event',)
+        constraints = [
+            models.UniqueConstraint(fields=('event', 'user'), name='events_attendee_unique_event_user'),
+        ]
+        indexes = [
+            models.Index(fields=('user', 'event'), name='events_attendee_user_event_idx'),
+            models.Index(fields=('modified_on', 'id'), name='events_attendee_modified_idx'),
+        ]
         verbose_name = 'event attendee'
         verbose_name_plural = 'event attendees'
 
     def __str__(self):
         return f'{self.event}, Attendee {self.user_id}'
+
+
+class EventWaitlistQuerySet(models.QuerySet):
+    """
+    The waitlist entries of an event hold consecutive tickets, from `Event.waitlist_head + 1` for
+    the first user to `Event.waitlist_tail` for the last one, so that the position of a user is
+    `ticket - waitlist_head`: a single lookup, whatever the length of the waitlist.
+    """
+
+    def join(self, event_id, user_id):
+        """
+        Appends a user to the waitlist of an event, with the next ticket. Must run in a transaction:
+        the increment of the tail locks the event until it is committed.
+        Raises IntegrityError if the user is already waiting.
+        """
+        Event.objects.filter(pk=event_id).update(waitlist_tail=F('waitlist_tail') + 1)
+        ticket = Event.objects.filter(pk=event_id).values_list('waitlist_tail', flat=True).get()
+        return self.create(event_id=event_id, user_id=user_id, ticket=ticket)
+
+    def leave(self, entry):
+        """
+        Removes an entry from its waitlist, moving the users behind it one position forward.
+        Must run in a transaction.
+        """
+        Event.objects.filter(pk=entry.event_id).update(waitlist_tail=F('waitlist_tail') - 1)
+        entry.delete()
+        self.filter(event_id=entry.event_id, ticket__gt=entry.ticket).update(ticket=F('ticket') - 1)
+
+
+class EventWaitlistEntry(AbstractDateCreated, models.Model):
+    event = models.ForeignKey(
+        'events.Event',
+        related_name='waitlist',
+        on_delete=models.CASCADE,
+        verbose_name='event'
+    )
+    user = models.ForeignKey(
+        'auth.User',
+        related_name='waitlists',
+        on_delete=models.CASCADE,
+        verbose_name='user'
+    )
+    ticket = models.PositiveIntegerField(
+        editable=False,
+        verbose_name='ticket'
+    )
+
+    objects = EventWaitlistQuerySet.as_manager()
+
+    class Meta:
+        ordering = ('event', 'ticket')
+        constraints = [
+            models.UniqueConstraint(fields=('event', 'user'), name='events_waitlist_unique_event_user'),
+        ]
+        indexes = [
+            models.Index(fields=('event', 'ticket'), name='events_waitlist_ticket_idx'),
+        ]
+        verbose_name = 'event waitlist entry'
+        verbose_name_plural = 'event waitlist entries'
+
+    def __str__(self):
+        return f'{self.event}, Waiting {self.user_id}'
+
+    @property
+    def position(self):
+        """
+        1-based position in the waitlist. Select the related event in order to avoid a query.
+        """
+        return self.ticket - self.event.waitlist_head
+
+
+class EventTombstoneQuerySet(models.QuerySet):
+
+    def purge(self, before):
+        """
+        Deletes the tombstones older than `before`. Returns the number of tombstones deleted.
+        """
+        return self.filter(deleted_on__lt=before).delete()[0]
+
+
+class EventTombstone(models.Model):
+    """
+    Deleted event or attendee, for the change feed of the sync clients, see events/changes.py.
+    Recorded by events.signals, except for the attendees deleted along with their event.
+    """
+    EVENT = 'event'
+    ATTENDEE = 'attendee'
+    KIND_CHOICES = (
+        (EVENT, 'event'),
+        (ATTENDEE, 'attendee'),
+    )
+
+    kind = models.CharField(
+        max_length=8,
+        choices=KIND_CHOICES,
+        verbose_name='kind'
+    )
+    object_id = models.PositiveBigIntegerField(
+        verbose_name='object id'
+    )
+    deleted_on = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Deleted on'
+    )
+
+    objects = EventTombstoneQuerySet.as_manager()
+
+    class Meta:
+        ordering = ('deleted_on', 'id')
+        indexes = [
+            models.Index(fields=('deleted_on', 'id'), name='events_tombstone_deleted_idx'),
+        ]
+        verbose_name = 'event tombstone'
+        verbose_name_plural = 'event tombstones'
+
+    def __str__(self):
+        return f'Deleted {self.kind} {self.object_id}'
+
+
+class EventAuditEntry(AbstractDateCreated, models.Model):
+    """
+    Action on an event, written by the `record_audit` task, see events/tasks.py.
+    The ids are not foreign keys, so that the entries outlive the events and users.
+    """
+    EVENT_CREATED = 'event_created'
+    ATTENDEE_REGISTERED = 'attendee_registered'
+    ACTION_CHOICES = (
+        (EVENT_CREATED, 'event created'),
+        (ATTENDEE_REGISTERED, 'attendee registered'),
+    )
+
+    action = models.CharField(
+        max_length=32,
+        choices=ACTION_CHOICES,
+        verbose_name='action'
+    )
+    event_id = models.PositiveBigIntegerField(
+        verbose_name='event id'
+    )
+    user_id = models.PositiveBigIntegerField(
+        verbose_name='user id'
+    )
+
+    class Meta:
+        ordering = ('created_on', 'id')
+        indexes = [
+            models.Index(fields=('event_id', 'created_on'), name='events_audit_event_idx'),
+        ]
+        verbose_name = 'event audit entry'
+        verbose_name_plural = 'event audit entries'
+
+    def __str__(self):
+        return f'{self.get_action_display()}, Event {self.event_id}, User {self.user_id}'
@@ -0,0 +1,155 @@
+import json
+from base64 import (
+    urlsafe_b64decode,
+    urlsafe_b64encode
+)
+from binascii import Error as BinasciiError
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+
+
+class KeysetPagination(pagination.CursorPagination):
+    """
+    Keyset (seek) pagination over a compound, unique ordering.
+
+    DRF's CursorPagination only seeks on the first ordering field and falls back
+    to an OFFSET for rows sharing the same value. Here the cursor stores the
+    values of every ordering field of the boundary row, and the next page is
+    selected with a lexicographic ``WHERE`` clause on them, so page N costs the
+    same index range scan as page 1.
+
+    The ordering is taken from an explicit ``order_by()`` on the queryset, if
+    any, otherwise from ``ordering``. It must end with ``id`` (or ``-id``) so
+    that the keyset is unique, and every field must be non-nullable.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-id',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, position, reverse = self._get_page_queryset(queryset, request, view)
+        return self._set_page(list(queryset), position, reverse)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Same as `paginate_queryset()`, for async views.
+        """
+        queryset, position, reverse = self._get_page_queryset(queryset, request, view)
+        return self._set_page([instance async for instance in queryset], position, reverse)
+
+    def _get_page_queryset(self, queryset, request, view):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        position, reverse = self.decode_cursor(request) or (None, False)
+
+        ordering = self._invert(self.ordering) if reverse else self.ordering
+        if position is not None:
+            queryset = queryset.filter(self._seek(ordering, position))
+        # Fetch one extra row in order to know whether there is a following page
+        return queryset.order_by(*ordering)[:self.page_size + 1], position, reverse
+
+    def _set_page(self, results, position, reverse):
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(queryset.query.order_by) or tuple(self.ordering)
+        assert all(isinstance(field, str) for field in ordering), (
+            'Keyset pagination only supports ordering by field names.'
+        )
+        assert ordering[-1].lstrip('-') in ('id', 'pk'), (
+            'Keyset pagination requires the ordering to end with the primary key.'
+        )
+        return ordering
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor((self._get_position(self.page[-1]), False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor((self._get_position(self.page[0]), True))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            tokens = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            position, reverse = tokens['p'], bool(tokens.get('r', False))
+        except (BinasciiError, UnicodeError, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, cursor):
+        position, reverse = cursor
+        tokens = {'p': position}
+        if reverse:
+            tokens['r'] = 1
+        encoded = urlsafe_b64encode(json.dumps(tokens, cls=DjangoJSONEncoder).encode('ascii')).decode('ascii')
+        return pagination.replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position(self, instance):
+        position = [getattr(instance, field.lstrip('-')) for field in self.ordering]
+        # Round-trip through the encoder so that dates become ISO strings
+        return json.loads(json.dumps(position, cls=DjangoJSONEncoder))
+
+    @staticmethod
+    def _invert(ordering):
+        return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+    @staticmethod
+    def _seek(ordering, position):
+        """
+        Builds the lexicographic condition selecting the rows after ``position``:
+        (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND c > z) ...
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+
+class EventCursorPagination(KeysetPagination):
+    """
+    Pages events following the model ordering, keyed on ``(start_date, id)``.
+    """
+    ordering = ('-start_date', '-id')
+
+
+class EventAttendeeCursorPagination(KeysetPagination):
+    """
+    Pages the attendees of an event in registration order.
+    """
+    ordering = ('id',)
+
+
+class EventRegistrationCursorPagination(KeysetPagination):
+    """
+    Pages the registrations of a user by the start date of their events, which the queryset
+    must be annotated with, keyed on ``(start_date, id)``.
+    """
+    ordering = ('-start_date', '-id')
@@ -0,0 +1,184 @@
+"""
+Publication of the seat counters of the events, for the live updates of events/streams.py.
+
+The views changing the capacity or the attendee count of events call `notify()` with their
+ids. Once the transaction is committed, the current state of the events that have subscribers
+is read with a single query and published to the backend of the `EVENTS_PUBSUB` setting, which
+delivers it to the subscriptions of these events.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from events.models import Event
+
+
+class Subscription:
+    """
+    Messages published for some events, consumed by a coroutine with `get()`.
+
+    Only the last message of every event is kept until it is consumed: a slow consumer gets
+    the current state of the events, not every intermediate one, and its memory is bounded by
+    the number of events it subscribed to. Messages which are not newer than the last one of
+    their event, by `modified_on`, are dropped: publishers in different threads may deliver
+    out of order, and the same state may be published twice.
+    """
+
+    def __init__(self, event_ids):
+        self.event_ids = frozenset(event_ids)
+        self.loop = asyncio.get_running_loop()
+        self.pending = {}
+        self.versions = {}
+        self.ready = asyncio.Event()
+
+    def put(self, message):
+        """
+        Delivers a message from any thread.
+        """
+        try:
+            self.loop.call_soon_threadsafe(self.deliver, message)
+        except RuntimeError:
+            # The loop of the consumer is closed, it is unsubscribing
+            pass
+
+    def deliver(self, message):
+        """
+        Delivers a message from the thread of the consumer.
+        """
+        version = message.get('modified_on')
+        if version is not None:
+            if version <= self.versions.get(message['id'], ''):
+                return
+            self.versions[message['id']] = version
+        self.pending[message['id']] = message
+        self.ready.set()
+
+    async def get(self):
+        """
+        Waits for messages, and returns the pending ones in publication order.
+        """
+        await self.ready.wait()
+        self.ready.clear()
+        messages = list(self.pending.values())
+        self.pending.clear()
+        return messages
+
+
+class BasePubSub:
+    """
+    Delivers the messages published for an event to the subscriptions of this event.
+    """
+
+    def subscribe(self, event_ids):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+    def publish(self, messages):
+        raise NotImplementedError
+
+    def get_subscribed(self, event_ids):
+        """
+        Returns the events of `event_ids` which may have subscribers, so that the others are not read.
+        """
+        return set(event_ids)
+
+
+class LocalPubSub(BasePubSub):
+    """
+    Subscriptions of the process, hence only notified of the changes made by the same process:
+    serve the API and the streams with a single ASGI process, or use a backend shared by the processes.
+    """
+
+    def __init__(self):
+        self.subscriptions = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def subscribe(self, event_ids):
+        subscription = Subscription(event_ids)
+        with self.lock:
+            for event_id in subscription.event_ids:
+                self.subscriptions[event_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            for event_id in subscription.event_ids:
+                self.subscriptions[event_id].discard(subscription)
+                if not self.subscriptions[event_id]:
+                    del self.subscriptions[event_id]
+
+    def publish(self, messages):
+        for message in messages:
+            with self.lock:
+                subscriptions = list(self.subscriptions.get(message['id'], ()))
+            for subscription in subscriptions:
+                subscription.put(message)
+
+    def get_subscribed(self, event_ids):
+        with self.lock:
+            return {event_id for event_id in event_ids if event_id in self.subscriptions}
+
+
+_pubsub = None
+
+
+def get_pubsub():
+    """
+    Returns the backend configured by the `EVENTS_PUBSUB` setting, or `None` if it is disabled.
+    """
+    global _pubsub
+    config = getattr(settings, 'EVENTS_PUBSUB', None)
+    if not config:
+        return None
+    if _pubsub is None:
+        _pubsub = import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+    return _pubsub
+
+
+@receiver(setting_changed)
+def reset_pubsub(setting, **kwargs):
+    global _pubsub
+    if setting == 'EVENTS_PUBSUB':
+        _pubsub = None
+
+
+def get_messages(event_ids):
+    """
+    Returns the current state of the events `event_ids`, with a single query.
+    The events which do not exist anymore are reported as deleted.
+    """
+    messages = {
+        event['id']: {
+            **event,
+            'remaining_capacity': max(event['capacity'] - event['attendee_count'], 0) if event['capacity'] else None,
+            'modified_on': event['modified_on'].isoformat(),
+        }
+        for event in Event.objects.filter(pk__in=event_ids).values('id', 'capacity', 'attendee_count', 'modified_on')
+    }
+    return [messages.get(event_id, {'id': event_id, 'deleted': True}) for event_id in sorted(event_ids)]
+
+
+def notify(event_ids):
+    """
+    Publishes the state of the events `event_ids` once the current transaction is committed,
+    immediately outside of transactions.
+    """
+    pubsub = get_pubsub()
+    if pubsub is None:
+        return
+    event_ids = set(event_ids)
+
+    def publish():
+        subscribed = pubsub.get_subscribed(event_ids)
+        if subscribed:
+            pubsub.publish(get_messages(subscribed))
+
+    transaction.on_commit(publish)
@@ -0,0 +1,64 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def plan_queryset(queryset, serializer):
+    """
+    Adds the ``select_related`` and ``prefetch_related`` calls needed in order to
+    serialize ``queryset`` with ``serializer`` without running a query per row.
+
+    The serializer fields are walked recursively:
+    - nested serializers over forward relations are joined with ``select_related``;
+    - nested serializers over reverse or many-to-many relations are prefetched,
+      with a queryset planned in turn for the nested serializer;
+    - primary key related fields need nothing, since DRF reads the ``<field>_id``
+      attribute directly.
+    """
+    select, prefetch = _plan(queryset.model, serializer)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+def _plan(model, serializer, prefix=''):
+    select = []
+    prefetch = []
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*' or '.' in field.source:
+            continue
+        many = isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField))
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if not isinstance(nested, serializers.BaseSerializer) and not many:
+            continue
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            # Not a model field (property, annotation...)
+            continue
+        if not model_field.is_relation:
+            continue
+        if model_field.many_to_many or model_field.one_to_many:
+            related_queryset = model_field.related_model._default_manager.all()
+            if isinstance(nested, serializers.ModelSerializer):
+                related_queryset = plan_queryset(related_queryset, nested)
+            prefetch.append(Prefetch(f'{prefix}{field.source}', queryset=related_queryset))
+        elif isinstance(nested, serializers.ModelSerializer):
+            select.append(f'{prefix}{field.source}')
+            nested_select, nested_prefetch = _plan(model_field.related_model, nested, prefix=f'{prefix}{field.source}__')
+            select += nested_select
+            prefetch += nested_prefetch
+    return select, prefetch
+
+
+class QueryPlanMixin:
+    """
+    Plans the queryset of a generic view according to its serializer class,
+    see :func:`plan_queryset`.
+    """
+
+    def get_queryset(self):
+        queryset = super(QueryPlanMixin, self).get_queryset()
+        return plan_queryset(queryset, self.get_serializer_class()())
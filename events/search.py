@@ -0,0 +1,109 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import (
+    FloatField,
+    Q,
+    Value
+)
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+
+class BaseSearchBackend:
+    """
+    Full-text search over the name and description of the events.
+
+    `search()` filters a queryset of events and annotates it with `search_rank`,
+    where lower ranks are better matches. `index()` and `remove()` keep the search
+    index up to date incrementally, they are called when events are saved or deleted.
+    """
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+    def index(self, events):
+        pass
+
+    def remove(self, pks):
+        pass
+
+    def rebuild(self):
+        pass
+
+    @staticmethod
+    def get_terms(query):
+        return re.findall(r'\w+', query)
+
+    @staticmethod
+    def no_results(queryset):
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class BasicSearchBackend(BaseSearchBackend):
+    """
+    Fallback for the databases without a full-text index: every term must be
+    contained in the name or the description, and all the matches rank the same.
+    """
+
+    def search(self, queryset, query):
+        terms = self.get_terms(query)
+        if not terms:
+            return self.no_results(queryset)
+        for term in terms:
+            queryset = queryset.filter(Q(name__icontains=term) | Q(description__icontains=term))
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class SQLiteFTS5SearchBackend(BaseSearchBackend):
+    """
+    SQLite FTS5 index, stored in a virtual table whose rowid is the event id.
+    Every term is matched as a prefix and results are ranked with BM25, matches
+    on the name weighing more than matches on the description.
+    """
+    table = 'events_event_fts'
+    name_weight = 10.0
+    description_weight = 1.0
+
+    def search(self, queryset, query):
+        terms = self.get_terms(query)
+        if not terms:
+            return self.no_results(queryset)
+        match = ' '.join(f'"{term}"*' for term in terms)
+        ids = RawSQL(f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s', (match,))
+        rank = RawSQL(
+            f'SELECT bm25({self.table}, %s, %s) FROM {self.table} '
+            f'WHERE {self.table}.rowid = events_event.id AND {self.table} MATCH %s',
+            (self.name_weight, self.description_weight, match),
+            output_field=FloatField()
+        )
+        return queryset.filter(id__in=ids).annotate(search_rank=rank)
+
+    def index(self, events):
+        rows = [(event.pk, event.name, event.description) for event in events]
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [(row[0],) for row in rows])
+            cursor.executemany(f'INSERT INTO {self.table} (rowid, name, description) VALUES (%s, %s, %s)', rows)
+
+    def remove(self, pks):
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [(pk,) for pk in pks])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(f'INSERT INTO {self.table} (rowid, name, description) SELECT id, name, description FROM events_event')
+
+
+def get_search_backend():
+    """
+    Returns the backend configured by the `EVENTS_SEARCH_BACKEND` setting, by default
+    SQLite FTS5 on SQLite databases and the basic backend on the other databases.
+    """
+    path = getattr(settings, 'EVENTS_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    if connection.vendor == 'sqlite':
+        return SQLiteFTS5SearchBackend()
+    return BasicSearchBackend()
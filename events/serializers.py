@@ -1,12 +1,15 @@
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from events.models import (
     Event,
-    EventAttendee
+    EventAttendee,
+    EventWaitlistEntry
 )
+from tikoExercise.instrumentation import InstrumentedSerializerMixin
 
 
-class EventAttendeeSerializer(serializers.ModelSerializer):
+class EventAttendeeSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = EventAttendee
         fields = ('event', 'user', 'created_on', 'modified_on')
@@ -16,15 +19,105 @@ class EventAttendeeSerializer(serializers.ModelSerializer):
         }
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventWaitlistEntrySerializer(serializers.ModelSerializer):
+    position = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = EventWaitlistEntry
+        fields = ('event', 'user', 'position', 'created_on')
+        read_only_fields = fields
+
+
+class EventAttendeeBulkSerializer(serializers.Serializer):
+    """
+    Either a list of `events` for the request User, or an `event` and the list of its `users`.
+    """
+    events = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False, max_length=1000)
+    event = serializers.IntegerField(required=False)
+    users = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False, max_length=1000)
+
+    def validate(self, attrs):
+        if 'events' in attrs and ('event' in attrs or 'users' in attrs):
+            raise serializers.ValidationError({'events': 'Cannot be combined with event and users.'})
+        if 'events' not in attrs and not ('event' in attrs and 'users' in attrs):
+            raise serializers.ValidationError({'non_field_errors': ['Either events, or event and users are required.']})
+        return attrs
+
+
+class EventSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
     attendees = EventAttendeeSerializer(many=True, read_only=True)
 
     class Meta:
         model = Event
-        fields = ('name', 'description', 'start_date', 'end_date', 'attendees', 'capacity', 'created_by', 'created_on', 'modified_on')
+        fields = ('id', 'name', 'description', 'start_date', 'end_date', 'attendees', 'attendee_count', 'capacity', 'created_by', 'created_on', 'modified_on')
         extra_kwargs = {
             'name': {'required': True},
             'description': {'required': True},
             'start_date': {'required': True},
             'end_date': {'required': True}
         }
+
+
+class EventSummarySerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
+    """
+    Compact representation of an event: attendees are summarized instead of listed.
+    The queryset must be annotated with `is_registered` for the request User.
+    """
+    remaining_capacity = serializers.SerializerMethodField()
+    is_registered = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = Event
+        fields = ('id', 'name', 'description', 'start_date', 'end_date', 'attendee_count', 'remaining_capacity', 'is_registered', 'capacity', 'created_by', 'created_on', 'modified_on')
+        read_only_fields = fields
+
+    @extend_schema_field(serializers.IntegerField(allow_null=True))
+    def get_remaining_capacity(self, obj):
+        if not obj.capacity:
+            return None  # Unlimited
+        return max(obj.capacity - obj.attendee_count, 0)
+
+
+class RegisteredEventSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
+    """
+    Event of a registration, without its attendees.
+    """
+
+    class Meta:
+        model = Event
+        fields = ('id', 'name', 'description', 'start_date', 'end_date', 'attendee_count', 'capacity', 'created_by')
+        read_only_fields = fields
+
+
+class EventRegistrationSerializer(InstrumentedSerializerMixin, serializers.ModelSerializer):
+    """
+    Registration of the request User, with its event. The `id` is the one to unregister with.
+    """
+    event = RegisteredEventSerializer(read_only=True)
+
+    class Meta:
+        model = EventAttendee
+        fields = ('id', 'event', 'created_on')
+        read_only_fields = fields
+
+
+class EventChangeSerializer(serializers.ModelSerializer):
+    """
+    Event of the change feed, without its attendees which have their own stream.
+    """
+
+    class Meta:
+        model = Event
+        fields = ('id', 'name', 'description', 'start_date', 'end_date', 'attendee_count', 'capacity', 'created_by', 'created_on', 'modified_on')
+        read_only_fields = fields
+
+
+class EventAttendeeChangeSerializer(serializers.ModelSerializer):
+    """
+    Attendee of the change feed, with the `id` its tombstone refers to.
+    """
+
+    class Meta:
+        model = EventAttendee
+        fields = ('id', 'event', 'user', 'created_on', 'modified_on')
+        read_only_fields = fields
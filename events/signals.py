@@ -0,0 +1,77 @@
+from django.db.models import (
+    F,
+    QuerySet
+)
+from django.db.models.signals import (
+    post_delete,
+    post_save
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from events import cache
+from events.models import (
+    Event,
+    EventAttendee,
+    EventTombstone,
+    seats_reserved
+)
+from events.search import get_search_backend
+
+
+@receiver(post_save, sender=Event, dispatch_uid='events_index_event')
+def index_event(sender, instance, **kwargs):
+    get_search_backend().index([instance])
+
+
+@receiver(post_delete, sender=Event, dispatch_uid='events_unindex_event')
+def unindex_event(sender, instance, **kwargs):
+    get_search_backend().remove([instance.pk])
+
+
+@receiver(post_save, sender=Event, dispatch_uid='events_invalidate_event_save')
+@receiver(post_delete, sender=Event, dispatch_uid='events_invalidate_event_delete')
+@receiver(post_save, sender=EventAttendee, dispatch_uid='events_invalidate_attendee_save')
+@receiver(post_delete, sender=EventAttendee, dispatch_uid='events_invalidate_attendee_delete')
+def invalidate_list_cache(sender, **kwargs):
+    cache.invalidate()
+
+
+def is_cascade_from_event(origin):
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return origin_model is Event
+
+
+@receiver(post_save, sender=Event, dispatch_uid='events_count_event_load')
+def count_loaded_attendees(sender, instance, raw, **kwargs):
+    # Loaded by loaddata with the count of the fixture, which may be missing or stale
+    if raw:
+        Event.objects.filter(pk=instance.pk).reconcile_attendee_count()
+
+
+@receiver(post_save, sender=EventAttendee, dispatch_uid='events_count_attendee_save')
+def count_attendee(sender, instance, created, raw, **kwargs):
+    """
+    Counts the attendees created outside of the seat reservations of the views, e.g. in the admin,
+    the shell or the fixtures, so that the capacity checks see them. These are not limited by the capacity.
+    """
+    if raw:
+        Event.objects.filter(pk=instance.event_id).reconcile_attendee_count()
+    elif created and not seats_reserved.get():
+        Event.objects.filter(pk=instance.event_id).update(attendee_count=F('attendee_count') + 1, modified_on=timezone.now())
+
+
+@receiver(post_delete, sender=EventAttendee, dispatch_uid='events_count_attendee_delete')
+def uncount_attendee(sender, instance, origin=None, **kwargs):
+    # The attendees deleted along with their event need no count
+    if not seats_reserved.get() and not is_cascade_from_event(origin):
+        Event.objects.release_seat(instance.event_id)
+
+
+@receiver(post_delete, sender=Event, dispatch_uid='events_tombstone_event')
+@receiver(post_delete, sender=EventAttendee, dispatch_uid='events_tombstone_attendee')
+def record_tombstone(sender, instance, origin=None, **kwargs):
+    if sender is EventAttendee and is_cascade_from_event(origin):
+        # Deleted along with their event, whose tombstone covers them
+        return
+    EventTombstone.objects.create(kind=EventTombstone.EVENT if sender is Event else EventTombstone.ATTENDEE, object_id=instance.pk)
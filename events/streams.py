@@ -0,0 +1,118 @@
+"""
+Server-Sent Events stream of the seat counters of events, served by tikoExercise/asgi.py::
+
+    GET /events/stream/?ids=1,2,3
+    Authorization: Bearer <access token>
+
+As EventSource cannot set headers, the access token can also be sent as the `token` query
+parameter. The stream starts with the current state of the events, then sends an `update`
+whenever their capacity or attendee count changes (see events/pubsub.py) and a `delete` when
+they are deleted. A comment is sent every `heartbeat` seconds so that idle connections are
+kept open by the proxies, and closed when the client is gone.
+
+It is a plain ASGI application rather than a Django view, as Django 4.1 cannot stream the
+responses of async views: every connection is a coroutine waiting for its subscription,
+which costs no thread nor database connection between two updates.
+"""
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from rest_framework import exceptions
+
+from authentication.backends import StatelessJWTAuthentication
+from events.pubsub import (
+    get_messages,
+    get_pubsub
+)
+
+
+class EventStreamApplication:
+    path = '/events/stream/'
+    max_events = 1000
+    heartbeat = 15
+    # Milliseconds before EventSource reconnects when the connection is lost
+    retry = 5000
+
+    async def __call__(self, scope, receive, send):
+        params = parse_qs(scope['query_string'].decode('latin-1'))
+        try:
+            self.authenticate(dict(scope['headers']), params)
+            event_ids = self.get_event_ids(params)
+            pubsub = get_pubsub()
+            if pubsub is None:
+                raise exceptions.NotFound('Live updates are disabled.')
+        except exceptions.APIException as exc:
+            await self.send_error(send, exc)
+            return
+
+        # Subscribe before reading the current state, so that no update is missed in between
+        subscription = pubsub.subscribe(event_ids)
+        disconnected = asyncio.ensure_future(self.wait_for_disconnect(receive))
+        try:
+            for message in await sync_to_async(get_messages)(event_ids):
+                subscription.deliver(message)
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream'),
+                    (b'cache-control', b'no-cache'),
+                    # Disables the buffering of nginx
+                    (b'x-accel-buffering', b'no'),
+                ],
+            })
+            await send({'type': 'http.response.body', 'body': f'retry: {self.retry}\n\n'.encode(), 'more_body': True})
+            while not disconnected.done():
+                messages = asyncio.ensure_future(subscription.get())
+                await asyncio.wait((messages, disconnected), timeout=self.heartbeat, return_when=asyncio.FIRST_COMPLETED)
+                if messages.done():
+                    body = ''.join(self.format_message(message) for message in messages.result())
+                else:
+                    messages.cancel()
+                    body = ': heartbeat\n\n'
+                if not disconnected.done():
+                    await send({'type': 'http.response.body', 'body': body.encode(), 'more_body': True})
+        finally:
+            disconnected.cancel()
+            pubsub.unsubscribe(subscription)
+
+    @staticmethod
+    def authenticate(headers, params):
+        authentication = StatelessJWTAuthentication()
+        header = headers.get(b'authorization')
+        raw_token = authentication.get_raw_token(header) if header else params.get('token', [None])[0]
+        if raw_token is None:
+            raise exceptions.NotAuthenticated()
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+
+    def get_event_ids(self, params):
+        try:
+            event_ids = {int(event_id) for value in params.get('ids', ()) for event_id in value.split(',') if event_id}
+        except ValueError:
+            raise exceptions.ValidationError({'ids': ['A comma separated list of integers is required.']})
+        if not event_ids:
+            raise exceptions.ValidationError({'ids': ['This field is required.']})
+        if len(event_ids) > self.max_events:
+            raise exceptions.ValidationError({'ids': [f'Ensure there are at most {self.max_events} events.']})
+        return event_ids
+
+    @staticmethod
+    async def wait_for_disconnect(receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    @staticmethod
+    def format_message(message):
+        kind = 'delete' if message.get('deleted') else 'update'
+        return f'event: {kind}\ndata: {json.dumps(message)}\n\n'
+
+    @staticmethod
+    async def send_error(send, exc):
+        detail = exc.detail if isinstance(exc.detail, (dict, list)) else {'detail': exc.detail}
+        headers = [(b'content-type', b'application/json')]
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            headers.append((b'www-authenticate', StatelessJWTAuthentication().authenticate_header(None).encode()))
+        await send({'type': 'http.response.start', 'status': exc.status_code, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': json.dumps(detail).encode()})
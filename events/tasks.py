@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage
+from django.utils import timezone
+
+from events.models import (
+    Event,
+    EventAttendee,
+    EventAuditEntry
+)
+from tasks.queue import (
+    enqueue_many,
+    task
+)
+
+User = get_user_model()
+
+
+@task
+def send_registration_confirmation(event_id, user_id):
+    """
+    Emails the confirmation of a registration, unless the user has unregistered in the meantime.
+    """
+    attendee = EventAttendee.objects.select_related('event', 'user').filter(event_id=event_id, user_id=user_id).first()
+    if attendee is None or not attendee.user.email:
+        return
+    event = attendee.event
+    EmailMessage(
+        subject=f'Registered to {event.name}',
+        body=f'Hello {attendee.user.get_full_name() or attendee.user.username},\n\n'
+             f'You are registered to {event.name}, from {event.start_date} to {event.end_date}.\n',
+        to=[attendee.user.email]
+    ).send()
+
+
+@task
+def send_calendar_invite(event_id, user_id):
+    """
+    Emails an iCalendar invite to an event, to its attendee or its organizer.
+    """
+    event = Event.objects.filter(pk=event_id).first()
+    user = User.objects.filter(pk=user_id).first()
+    if event is None or user is None or not user.email:
+        return
+    message = EmailMessage(subject=f'Invitation: {event.name}', body=f'{event.description}\n', to=[user.email])
+    message.attach(f'event-{event.pk}.ics', get_icalendar(event, user), 'text/calendar; method=REQUEST')
+    message.send()
+
+
+@task
+def record_audit(action, event_id, user_id):
+    EventAuditEntry.objects.create(action=action, event_id=event_id, user_id=user_id)
+
+
+def get_icalendar(event, user):
+    def escape(value):
+        return value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//tikoExercise//events//EN',
+        'METHOD:REQUEST',
+        'BEGIN:VEVENT',
+        # Stable, so that the invites of the same event update each other
+        f'UID:event-{event.pk}@tikoExercise',
+        f'DTSTAMP:{timezone.now():%Y%m%dT%H%M%SZ}',
+        f'DTSTART;VALUE=DATE:{event.start_date:%Y%m%d}',
+        # The end date of all-day events is exclusive
+        f'DTEND;VALUE=DATE:{event.end_date + timedelta(days=1):%Y%m%d}',
+        f'SUMMARY:{escape(event.name)}',
+        f'DESCRIPTION:{escape(event.description)}',
+        f'ATTENDEE:mailto:{user.email}',
+        'END:VEVENT',
+        'END:VCALENDAR',
+    ]
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def enqueue_registered(pairs):
+    """
+    Queues the confirmation, the invite and the audit of `(event id, user id)` registrations, with a single query.
+    """
+    enqueue_many([
+        call
+        for event_id, user_id in pairs
+        for call in (
+            (send_registration_confirmation, {'event_id': event_id, 'user_id': user_id}),
+            (send_calendar_invite, {'event_id': event_id, 'user_id': user_id}),
+            (record_audit, {'action': EventAuditEntry.ATTENDEE_REGISTERED, 'event_id': event_id, 'user_id': user_id}),
+        )
+    ])
+
+
+def enqueue_created(event_ids, user_id):
+    """
+    Queues the invite of the organizer and the audit of created events, with a single query.
+    """
+    enqueue_many([
+        call
+        for event_id in event_ids
+        for call in (
+            (send_calendar_invite, {'event_id': event_id, 'user_id': user_id}),
+            (record_audit, {'action': EventAuditEntry.EVENT_CREATED, 'event_id': event_id, 'user_id': user_id}),
+        )
+    ])
@@ -1,12 +1,60 @@
+import asyncio
+import csv
+import json
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from datetime import (
+    date,
+    timedelta
+)
+
 from django.contrib.auth import get_user_model
+from asgiref.sync import (
+    iscoroutinefunction,
+    sync_to_async
+)
+from asgiref.testing import ApplicationCommunicator
+from django.core import mail
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import (
+    IntegrityError,
+    connection
+)
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    TransactionTestCase,
+    override_settings
+)
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import (
+    APIClient,
+    APITestCase
+)
+from rest_framework_simplejwt.tokens import AccessToken
 
 from events.models import (
     Event,
-    EventAttendee
+    EventAttendee,
+    EventAuditEntry,
+    EventQuerySet,
+    EventTombstone,
+    EventWaitlistEntry
 )
+from events.pagination import EventCursorPagination
+from events.pubsub import get_pubsub
+from events.streams import EventStreamApplication
+from tasks.models import Task
+from tasks.worker import Worker
+from tikoExercise import settings_production
+from tikoExercise.middleware import PerformanceMiddleware
 
 User = get_user_model()
 
@@ -80,11 +128,11 @@ class EventTests(AuthenticationTestMixin, APITestCase):
         """
         response_johndoe = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
         self.assertEqual(response_johndoe.status_code, status.HTTP_200_OK)
-        self.assertListEqual(response_johndoe.data, [])
+        self.assertListEqual(response_johndoe.data['results'], [])
 
         response_foobar = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_foobar}")
         self.assertEqual(response_foobar.status_code, status.HTTP_200_OK)
-        self.assertListEqual(response_foobar.data, [])
+        self.assertListEqual(response_foobar.data['results'], [])
 
     def test_create_ok(self):
         """
@@ -96,10 +144,10 @@ class EventTests(AuthenticationTestMixin, APITestCase):
         self.assertEqual(response.data['name'], 'Test event')
 
         response_johndoe = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
-        self.assertEqual(len(response_johndoe.data), 1)
+        self.assertEqual(len(response_johndoe.data['results']), 1)
 
         response_foobar = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_foobar}")
-        self.assertEqual(len(response_foobar.data), 1)
+        self.assertEqual(len(response_foobar.data['results']), 1)
 
     def test_fetch_list_mine(self):
         """
@@ -109,11 +157,11 @@ class EventTests(AuthenticationTestMixin, APITestCase):
 
         response_johndoe = self.client.get(self.url_event_list, self.query_mine, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
         self.assertEqual(response_johndoe.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response_johndoe.data), 1)
+        self.assertEqual(len(response_johndoe.data['results']), 1)
 
         response_foobar = self.client.get(self.url_event_list, self.query_mine, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_foobar}")
         self.assertEqual(response_foobar.status_code, status.HTTP_200_OK)
-        self.assertListEqual(response_foobar.data, [])
+        self.assertListEqual(response_foobar.data['results'], [])
 
     def test_get_ok(self):
         """
@@ -170,6 +218,900 @@ class EventTests(AuthenticationTestMixin, APITestCase):
         self.assertEqual(response_foobar.data['created_by'], 'It is not allowed to delete other users\' events.')
 
 
+class EventPaginationTests(AuthenticationTestMixin, APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(EventPaginationTests, cls).setUpTestData()
+        # Several events share the same start date, so the id has to break the ties
+        cls.events = Event.objects.bulk_create([
+            Event(name=f'Event {i}', start_date=date(2023, 3, 1 + i // 3), end_date=date(2023, 3, 28), created_by_id=3)
+            for i in range(10)
+        ])
+        cls.url_event_list = reverse('events:list')
+
+    def _expected_names(self):
+        return list(Event.objects.order_by('-start_date', '-id').values_list('name', flat=True))
+
+    def test_walk_forward_and_backward(self):
+        """
+        Ensure the cursors walk every Event object exactly once, in both directions.
+        """
+        token = self.access_token_johndoe
+        names = []
+        pages = []
+        url = self.url_event_list
+        params = {'page_size': 3}
+        while url:
+            response = self.client.get(url, params, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 3)
+            names += [event['name'] for event in response.data['results']]
+            pages.append(response.data)
+            url, params = response.data['next'], {}
+        self.assertListEqual(names, self._expected_names())
+        self.assertEqual(len(pages), 4)
+        self.assertIsNone(pages[0]['previous'])
+
+        response = self.client.get(pages[-1]['previous'], format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertListEqual(response.data['results'], pages[-2]['results'])
+        self.assertIsNotNone(response.data['next'])
+
+    def test_page_size_bounded(self):
+        """
+        Ensure clients cannot request pages bigger than the maximum page size.
+        """
+        Event.objects.bulk_create([
+            Event(name=f'Extra event {i}', start_date=date(2023, 4, 1), end_date=date(2023, 4, 2))
+            for i in range(EventCursorPagination.max_page_size)
+        ])
+        response = self.client.get(self.url_event_list, {'page_size': 10000}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), EventCursorPagination.max_page_size)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_invalid_cursor(self):
+        """
+        Ensure a tampered cursor is rejected.
+        """
+        response = self.client.get(self.url_event_list, {'cursor': 'not-a-cursor'}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class EventQueryCountTests(AuthenticationTestMixin, APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(EventQueryCountTests, cls).setUpTestData()
+        cls.url_event_list = reverse('events:list')
+
+    def _create_events(self, count):
+        events = Event.objects.bulk_create([
+            Event(name=f'Event {i}', start_date=date(2023, 3, 1), end_date=date(2023, 3, 2), created_by_id=3)
+            for i in range(count)
+        ])
+        EventAttendee.objects.bulk_create([
+            EventAttendee(event=event, user_id=user_id)
+            for event in events
+            for user_id in (2, 3)
+        ])
+        return events
+
+    def _count_queries(self, url, params, token):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context), response
+
+    def test_list_constant_queries(self):
+        """
+        Ensure listing Event objects runs the same number of queries for 10 or 10,000 events.
+        """
+        token = self.access_token_johndoe
+        params = {'page_size': EventCursorPagination.max_page_size}
+
+        self._create_events(10)
+        queries_small, response = self._count_queries(self.url_event_list, params, token)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual(len(response.data['results'][0]['attendees']), 2)
+
+        self._create_events(10000 - 10)
+        queries_large, response = self._count_queries(self.url_event_list, params, token)
+        self.assertEqual(len(response.data['results']), EventCursorPagination.max_page_size)
+        self.assertEqual(len(response.data['results'][-1]['attendees']), 2)
+
+        self.assertEqual(queries_small, queries_large)
+
+    def test_get_constant_queries(self):
+        """
+        Ensure fetching an Event object does not run a query per attendee.
+        """
+        token = self.access_token_johndoe
+        event = self._create_events(1)[0]
+        url = reverse('events:get', args=[event.pk])
+        queries_small, _ = self._count_queries(url, {}, token)
+
+        extra_users = User.objects.bulk_create([User(username=f'user{i}') for i in range(50)])
+        EventAttendee.objects.bulk_create([EventAttendee(event=event, user=user) for user in extra_users])
+        queries_large, response = self._count_queries(url, {}, token)
+        self.assertEqual(len(response.data['attendees']), 52)
+        self.assertEqual(queries_small, queries_large)
+
+
+class EventSummaryTests(AuthenticationTestMixin, APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(EventSummaryTests, cls).setUpTestData()
+        start_date = date.today() + timedelta(days=30)
+        cls.event = Event.objects.create(name='Future event', start_date=start_date, end_date=start_date, capacity=10, created_by_id=1)
+        cls.users = User.objects.bulk_create([User(username=f'attendee{i}') for i in range(5)])
+        EventAttendee.objects.bulk_create([EventAttendee(event=cls.event, user=user) for user in cls.users])
+        EventAttendee.objects.create(event=cls.event, user_id=3)
+        Event.objects.reconcile_attendee_count()
+        cls.query_summary = {'summary': True}
+        cls.url_event_list = reverse('events:list')
+        cls.url_event_get = reverse('events:get', args=[cls.event.pk])
+        cls.url_event_attendees = reverse('events:attendees', args=[cls.event.pk])
+
+    def test_list_summary(self):
+        """
+        Ensure the summary representation replaces the attendees with their count.
+        """
+        response_johndoe = self.client.get(self.url_event_list, self.query_summary, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response_johndoe.status_code, status.HTTP_200_OK)
+        event = response_johndoe.data['results'][0]
+        self.assertNotIn('attendees', event)
+        self.assertEqual(event['attendee_count'], 6)
+        self.assertEqual(event['remaining_capacity'], 4)
+        self.assertTrue(event['is_registered'])
+
+        response_foobar = self.client.get(self.url_event_get, self.query_summary, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_foobar}")
+        self.assertEqual(response_foobar.status_code, status.HTTP_200_OK)
+        self.assertFalse(response_foobar.data['is_registered'])
+
+    def test_attendees(self):
+        """
+        Ensure the attendees of an Event object are paginated in registration order.
+        """
+        token = self.access_token_johndoe
+        response = self.client.get(self.url_event_attendees, {'page_size': 4}, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual([attendee['user'] for attendee in response.data['results']], [user.pk for user in self.users[:4]])
+
+        response = self.client.get(response.data['next'], format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertListEqual([attendee['user'] for attendee in response.data['results']], [self.users[4].pk, 3])
+        self.assertIsNone(response.data['next'])
+
+        response = self.client.get(reverse('events:attendees', args=[self.event.pk + 1]), format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class EventFilterTests(AuthenticationTestMixin, APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(EventFilterTests, cls).setUpTestData()
+        today = date.today()
+        cls.past = Event.objects.create(name='Past', start_date=today - timedelta(days=10), end_date=today - timedelta(days=8), created_by_id=2)
+        cls.ongoing = Event.objects.create(name='Ongoing', start_date=today - timedelta(days=1), end_date=today + timedelta(days=1), created_by_id=3)
+        cls.future = Event.objects.create(name='Future', start_date=today + timedelta(days=5), end_date=today + timedelta(days=9), capacity=1, attendee_count=1, created_by_id=3)
+        cls.url_event_list = reverse('events:list')
+
+    def _names(self, params):
+        response = self.client.get(self.url_event_list, params, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {event['name'] for event in response.data['results']}
+
+    def test_filter_status(self):
+        """
+        Ensure Event objects can be filtered on their status relative to today.
+        """
+        self.assertSetEqual(self._names({'status': 'past'}), {'Past'})
+        self.assertSetEqual(self._names({'status': 'ongoing'}), {'Ongoing'})
+        self.assertSetEqual(self._names({'status': 'future'}), {'Future'})
+
+    def test_filter_dates(self):
+        """
+        Ensure Event objects can be filtered on date ranges and calendar overlap.
+        """
+        today = date.today()
+        self.assertSetEqual(self._names({'start_after': today - timedelta(days=1)}), {'Ongoing', 'Future'})
+        self.assertSetEqual(self._names({'start_before': today - timedelta(days=1)}), {'Past', 'Ongoing'})
+        self.assertSetEqual(self._names({'end_after': today + timedelta(days=2)}), {'Future'})
+        self.assertSetEqual(self._names({'end_before': today + timedelta(days=1)}), {'Past', 'Ongoing'})
+        # Active between A and B: starts before B and ends after A
+        self.assertSetEqual(self._names({'active_from': today - timedelta(days=9), 'active_to': today - timedelta(days=9)}), {'Past'})
+        self.assertSetEqual(self._names({'active_from': today, 'active_to': today + timedelta(days=5)}), {'Ongoing', 'Future'})
+
+    def test_filter_capacity_and_creator(self):
+        """
+        Ensure Event objects can be filtered on their remaining capacity and their creator.
+        """
+        self.assertSetEqual(self._names({'has_capacity': 'true'}), {'Past', 'Ongoing'})
+        self.assertSetEqual(self._names({'has_capacity': 'false'}), {'Future'})
+        self.assertSetEqual(self._names({'created_by': 3}), {'Ongoing', 'Future'})
+        self.assertSetEqual(self._names({'created_by': 3, 'status': 'future'}), {'Future'})
+
+    def test_filter_invalid(self):
+        """
+        Ensure invalid filters are rejected.
+        """
+        token = self.access_token_johndoe
+        for params in ({'start_after': '2023-13-01'}, {'status': 'tomorrow'}, {'has_capacity': 'maybe'}, {'created_by': 'me'}):
+            response = self.client.get(self.url_event_list, params, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(next(iter(params)), response.data)
+
+
+class EventSearchTests(AuthenticationTestMixin, APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(EventSearchTests, cls).setUpTestData()
+        cls.concert = Event.objects.create(name='Jazz concert', description='Live music in the park.', start_date=date(2023, 3, 1), end_date=date(2023, 3, 1))
+        cls.festival = Event.objects.create(name='Summer festival', description='Food, games and a jazz band.', start_date=date(2023, 6, 1), end_date=date(2023, 6, 3))
+        cls.meetup = Event.objects.create(name='Python meetup', description='Talks about Django.', start_date=date(2023, 4, 1), end_date=date(2023, 4, 1))
+        cls.url_event_list = reverse('events:list')
+
+    def _search(self, query, **params):
+        response = self.client.get(self.url_event_list, {'q': query, **params}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_search_ranking(self):
+        """
+        Ensure the search matches word prefixes and ranks matches on the name first.
+        """
+        results = self._search('jaz')['results']
+        self.assertListEqual([event['name'] for event in results], ['Jazz concert', 'Summer festival'])
+        self.assertListEqual([event['name'] for event in self._search('django talk')['results']], ['Python meetup'])
+        self.assertListEqual(self._search('opera')['results'], [])
+        self.assertListEqual(self._search('!!!')['results'], [])
+
+    def test_search_paginated(self):
+        """
+        Ensure the search results are paginated in order of relevance.
+        """
+        data = self._search('jazz', page_size=1)
+        self.assertListEqual([event['name'] for event in data['results']], ['Jazz concert'])
+        response = self.client.get(data['next'], format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertListEqual([event['name'] for event in response.data['results']], ['Summer festival'])
+
+    def test_search_index_updated(self):
+        """
+        Ensure the search index follows the saved and deleted Event objects.
+        """
+        self.meetup.name = 'Jazz meetup'
+        self.meetup.save()
+        self.assertEqual(len(self._search('jazz')['results']), 3)
+        self.assertListEqual(self._search('python')['results'], [])
+
+        self.concert.delete()
+        self.assertEqual(len(self._search('jazz')['results']), 2)
+
+    def test_basic_backend(self):
+        """
+        Ensure the fallback backend for other databases matches every term.
+        """
+        with self.settings(EVENTS_SEARCH_BACKEND='events.search.BasicSearchBackend'):
+            self.assertListEqual([event['name'] for event in self._search('django talks')['results']], ['Python meetup'])
+            self.assertEqual(len(self._search('jazz')['results']), 2)
+
+
+class EventBulkTests(AuthenticationTestMixin, APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(EventBulkTests, cls).setUpTestData()
+        cls.url_bulk = reverse('events:bulk')
+        cls.url_event_list = reverse('events:list')
+        cls.data_valid = {
+            'name': 'Imported event',
+            'description': 'This is an imported event.',
+            'start_date': '2023-03-12',
+            'end_date': '2023-03-17'
+        }
+
+    def test_bulk_create(self):
+        """
+        Ensure we can create a batch of Event objects, with per-item results.
+        """
+        items = [self.data_valid, {'name': 'Missing dates'}, {**self.data_valid, 'name': 'Imported festival', 'created_by': 2}]
+        response = self.client.post(self.url_bulk, items, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertListEqual([result['status'] for result in response.data], ['created', 'rejected', 'created'])
+        self.assertIn('start_date', response.data[1]['errors'])
+        self.assertEqual(Event.objects.count(), 2)
+        # The creator is always the request User
+        self.assertEqual(Event.objects.filter(created_by_id=3).count(), 2)
+
+        # Bulk created events are searchable
+        response = self.client.get(self.url_event_list, {'q': 'festival'}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertListEqual([event['id'] for event in response.data['results']], [Event.objects.get(name='Imported festival').pk])
+
+        response = self.client.post(self.url_bulk, [self.data_valid], format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.post(self.url_bulk, {'name': 'Not a list'}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update(self):
+        """
+        Ensure we can update a batch of User's own Event objects only.
+        """
+        mine = Event.objects.create(created_by_id=3, **self.data_valid)
+        other = Event.objects.create(created_by_id=2, **self.data_valid)
+        modified_on = mine.modified_on
+        items = [
+            {'id': mine.pk, 'name': 'Renamed event'},
+            {'id': other.pk, 'name': 'Hijacked event'},
+            {'id': other.pk + 100, 'name': 'Unknown event'},
+            {'name': 'No id'},
+        ]
+        response = self.client.patch(self.url_bulk, items, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertListEqual([result['status'] for result in response.data], ['updated', 'rejected', 'rejected', 'rejected'])
+        self.assertEqual(response.data[1]['errors']['created_by'], 'It is not allowed to edit other users\' events.')
+        mine.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(mine.name, 'Renamed event')
+        self.assertGreater(mine.modified_on, modified_on)
+        self.assertEqual(other.name, 'Imported event')
+
+        # PUT requires the full representation
+        response = self.client.put(self.url_bulk, [{'id': mine.pk, 'name': 'Renamed again'}], format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('start_date', response.data[0]['errors'])
+
+
+class EventConditionalTests(AuthenticationTestMixin, APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(EventConditionalTests, cls).setUpTestData()
+        start_date = date.today() + timedelta(days=30)
+        cls.event = Event.objects.create(name='Future event', start_date=start_date, end_date=start_date, created_by_id=3)
+        cls.url_event_get = reverse('events:get', args=[cls.event.pk])
+        cls.url_event_list = reverse('events:list')
+        cls.url_event_update = reverse('events:update', args=[cls.event.pk])
+        cls.url_register = reverse('events:register-attendee')
+
+    def test_conditional_get(self):
+        """
+        Ensure we get 304 Not Modified for an unchanged Event, without serializing it.
+        """
+        token = self.access_token_johndoe
+        response = self.client.get(self.url_event_get, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        # Only the modification date of the Event, authentication is stateless
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url_event_get, format='json', HTTP_AUTHORIZATION=f"Bearer {token}", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        # The summary representation has its own ETag
+        response = self.client.get(self.url_event_get, {'summary': ''}, format='json', HTTP_AUTHORIZATION=f"Bearer {token}", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # A registration changes the Event
+        response = self.client.post(self.url_register, {'event': self.event.pk}, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.get(self.url_event_get, format='json', HTTP_AUTHORIZATION=f"Bearer {token}", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.data['attendees']), 1)
+
+    def test_conditional_list(self):
+        """
+        Ensure we get 304 Not Modified for an unchanged list of Event objects.
+        """
+        token = self.access_token_johndoe
+        response = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        etag = response['ETag']
+        # The validator is read from the page itself, no query counts or aggregates the events
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {token}", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Filters change the representation
+        response = self.client.get(self.url_event_list, {'status': 'future'}, format='json', HTTP_AUTHORIZATION=f"Bearer {token}", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Deleting an Event changes the list
+        Event.objects.create(name='Another event', start_date=self.event.start_date, end_date=self.event.end_date)
+        response = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        etag = response['ETag']
+        Event.objects.filter(name='Another event').delete()
+        response = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {token}", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_update_if_match(self):
+        """
+        Ensure we cannot update an Event modified since it was retrieved.
+        """
+        token = self.access_token_johndoe
+        etag = self.client.get(self.url_event_get, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")['ETag']
+
+        response = self.client.patch(self.url_event_update, {'name': 'Renamed event'}, format='json', HTTP_AUTHORIZATION=f"Bearer {token}", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        # The ETag is stale now
+        response = self.client.patch(self.url_event_update, {'name': 'Overwritten event'}, format='json', HTTP_AUTHORIZATION=f"Bearer {token}", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.name, 'Renamed event')
+
+        # Unconditional updates are still allowed
+        response = self.client.patch(self.url_event_update, {'name': 'Overwritten event'}, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class EventListCacheTests(AuthenticationTestMixin, APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(EventListCacheTests, cls).setUpTestData()
+        start_date = date.today() + timedelta(days=30)
+        cls.event = Event.objects.create(name='Future event', start_date=start_date, end_date=start_date, created_by_id=3)
+        cls.url_event_list = reverse('events:list')
+        cls.url_register = reverse('events:register-attendee')
+        cls.url_cache_stats = reverse('events:cache-stats')
+
+    # Enabled by test, so that every test starts with an empty cache
+    @override_settings(EVENTS_LIST_CACHE={'BACKEND': 'events.cache.LocMemResponseCache', 'OPTIONS': {'max_entries': 2}})
+    def test_list_cached(self):
+        """
+        Ensure we get the cached list of Event objects until an Event or an EventAttendee changes.
+        """
+        token = self.access_token_johndoe
+        response = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response['X-Cache'], 'MISS')
+        response = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data['results'][0]['name'], 'Future event')
+
+        # The parameters are part of the key
+        response = self.client.get(self.url_event_list, {'summary': ''}, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+        response = self.client.post(self.url_register, {'event': self.event.pk}, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['attendee_count'], 1)
+
+        Event.objects.filter(pk=self.event.pk).delete()
+        response = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertListEqual(response.data['results'], [])
+
+    @override_settings(EVENTS_LIST_CACHE={'BACKEND': 'events.cache.LocMemResponseCache'})
+    def test_list_cached_not_modified(self):
+        """
+        Ensure a cached list of Event objects is validated without querying the events.
+        """
+        token = self.access_token_johndoe
+        etag = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")['ETag']
+        # The generation, stored in the database cache of the tests
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {token}", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response['ETag'], etag)
+
+    @override_settings(EVENTS_LIST_CACHE={'BACKEND': 'events.cache.LocMemResponseCache', 'OPTIONS': {'generation_cache': 'default'}})
+    def test_list_cache_local_generation(self):
+        """
+        Ensure the cache refuses a generation cache local to the process, which other processes would not see invalidated.
+        """
+        with self.assertRaisesMessage(ImproperlyConfigured, 'must be shared by the processes'):
+            self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+
+    @override_settings(EVENTS_LIST_CACHE={'BACKEND': 'events.cache.LocMemResponseCache'})
+    def test_list_cache_stats(self):
+        """
+        Ensure staff users can retrieve the hit and miss counts of the cache.
+        """
+        token = self.access_token_johndoe
+        for _ in range(3):
+            self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = self.client.get(self.url_cache_stats, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        # The staff status is a claim of the token
+        User.objects.filter(username='johndoe').update(is_staff=True)
+        response = self.client.get(self.url_cache_stats, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['hits'], 2)
+        self.assertEqual(response.data['misses'], 1)
+
+
+class EventAsyncTests(AuthenticationTestMixin, APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(EventAsyncTests, cls).setUpTestData()
+        start_date = date.today() + timedelta(days=30)
+        cls.event = Event.objects.create(name='Future event', description='A future event.', start_date=start_date, end_date=start_date, capacity=2, created_by_id=3)
+        cls.event_past = Event.objects.create(name='Past event', start_date=date.today() - timedelta(days=30), end_date=date.today() - timedelta(days=30))
+        cls.url_event_list = reverse('events:list')
+        cls.url_async_list = reverse('events:async-list')
+        cls.url_async_get = reverse('events:async-get', args=[cls.event.pk])
+        cls.url_async_register = reverse('events:async-register-attendee')
+
+    def test_async_list(self):
+        """
+        Ensure the async list of Event objects matches the sync one.
+        """
+        token = self.access_token_johndoe
+        for params in ({}, {'summary': ''}, {'status': 'future'}, {'q': 'future'}, {'page_size': 1}):
+            response_sync = self.client.get(self.url_event_list, params, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+            response = self.client.get(self.url_async_list, params, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json()['results'], response_sync.json()['results'])
+            self.assertEqual(response.json()['next'] is None, response_sync.json()['next'] is None)
+
+        response = self.client.get(self.url_async_list, {'status': 'unknown'}, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url_async_list, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_async_get(self):
+        """
+        Ensure we can retrieve an Event object through the async client.
+        """
+        token = AccessToken.for_user(await User.objects.aget(username='johndoe'))
+        response = await self.async_client.get(self.url_async_get, AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['name'], 'Future event')
+        self.assertListEqual(response.json()['attendees'], [])
+
+        response = await self.async_client.get(reverse('events:async-get', args=[self.event.pk + 100]), AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_async_register(self):
+        """
+        Ensure we can register an EventAttendee object asynchronously, with the same rules.
+        """
+        response = self.client.post(self.url_async_register, {'event': self.event.pk}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['user'], 3)
+
+        # The seat reserved for the duplicated registration is released
+        response = self.client.post(self.url_async_register, {'event': self.event.pk}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.json()['event'], 'It is not allowed to register more than once to an event.')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 1)
+
+        response = self.client.post(self.url_async_register, {'event': self.event.pk}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_foobar}")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        token_admin = AccessToken.for_user(User.objects.get(username='admin'))
+        response = self.client.post(self.url_async_register, {'event': self.event.pk}, format='json', HTTP_AUTHORIZATION=f"Bearer {token_admin}")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.json()['event'], 'It is not allowed to register to a full event.')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 2)
+
+        response = self.client.post(self.url_async_register, {'event': self.event_past.pk}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_foobar}")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.post(self.url_async_register, {'event': 'x'}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_foobar}")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class EventExportTests(AuthenticationTestMixin, APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(EventExportTests, cls).setUpTestData()
+        start_date = date.today() + timedelta(days=30)
+        cls.event = Event.objects.create(name='Future event', description='With "quotes", and commas', start_date=start_date, end_date=start_date, created_by_id=3)
+        cls.event_empty = Event.objects.create(name='Empty event', start_date=start_date, end_date=start_date, created_by_id=2)
+        EventAttendee.objects.create(event=cls.event, user_id=2)
+        EventAttendee.objects.create(event=cls.event, user_id=3)
+        cls.url_export = reverse('events:export')
+
+    def test_export_csv(self):
+        """
+        Ensure we can stream a CSV export of the Event objects with their EventAttendee rows.
+        """
+        response = self.client.get(self.url_export, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(len(rows), 3)
+        self.assertListEqual([row['attendee_user_id'] for row in rows], ['2', '3', ''])
+        self.assertEqual(rows[0]['description'], 'With "quotes", and commas')
+
+        response = self.client.get(self.url_export, {'type': 'xml'}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_ndjson(self):
+        """
+        Ensure we can stream a filtered NDJSON export of the Event objects.
+        """
+        response = self.client.get(self.url_export, {'type': 'ndjson', 'created_by': 3}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        event = json.loads(lines[0])
+        self.assertEqual(event['id'], self.event.pk)
+        self.assertListEqual([attendee['user_id'] for attendee in event['attendees']], [2, 3])
+
+    def test_export_command(self):
+        """
+        Ensure the export command writes every Event object, fetched by chunks.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / 'events.ndjson'
+            # A single query streams the events, their attendees are fetched with a query per chunk of events
+            with self.assertNumQueries(3):
+                call_command('export_events', type='ndjson', output=str(output), chunk_size=1, stderr=StringIO())
+            self.assertEqual(len(output.read_text().splitlines()), 2)
+
+
+class EventInstrumentationTests(AuthenticationTestMixin, APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(EventInstrumentationTests, cls).setUpTestData()
+        start_date = date.today() + timedelta(days=30)
+        cls.event = Event.objects.create(name='Future event', start_date=start_date, end_date=start_date, created_by_id=3)
+        cls.url_list = reverse('events:list')
+
+    @override_settings(PERFORMANCE_INSTRUMENTATION={'ENABLED': True, 'NAMESPACES': ('events',), 'SLOW_REQUEST_MS': None})
+    def test_server_timing(self):
+        """
+        Ensure we can read the timings of an Event list request in its Server-Timing header and log line.
+        """
+        access_token = self.access_token_johndoe
+        with self.assertLogs('tikoExercise.performance', level='INFO') as logs:
+            response = self.client.get(self.url_list, format='json', HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timings = dict(entry.split(';', 1) for entry in response['Server-Timing'].split(', '))
+        self.assertListEqual(list(timings), ['sql', 'serialize', 'render', 'total'])
+        # The page and its attendees
+        self.assertIn('desc="2 queries"', timings['sql'])
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(logs.records[0].levelname, 'INFO')
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['path'], self.url_list)
+        self.assertEqual(record['status'], status.HTTP_200_OK)
+        self.assertEqual(record['queries'], 2)
+        self.assertNotIn('sql', record)
+
+    @override_settings(PERFORMANCE_INSTRUMENTATION={'ENABLED': True, 'NAMESPACES': ('events',), 'SLOW_REQUEST_MS': None})
+    async def test_server_timing_async(self):
+        """
+        Ensure we can read the timings of an async Event list request, the middleware running in async mode.
+        """
+        async def get_response(request):
+            pass
+
+        # Otherwise Django would run the rest of the chain, the async views included, in a thread
+        self.assertTrue(iscoroutinefunction(PerformanceMiddleware(get_response)))
+        token = AccessToken.for_user(await User.objects.aget(username='johndoe'))
+        with self.assertLogs('tikoExercise.performance', level='INFO') as logs:
+            response = await self.async_client.get(reverse('events:async-list'), AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timings = dict(entry.split(';', 1) for entry in response['Server-Timing'].split(', '))
+        # The page and its attendees, queried in the thread of sync_to_async
+        self.assertIn('desc="2 queries"', timings['sql'])
+        self.assertEqual(json.loads(logs.records[0].getMessage())['queries'], 2)
+
+    @override_settings(PERFORMANCE_INSTRUMENTATION={'ENABLED': True, 'NAMESPACES': ('events',), 'SLOW_REQUEST_MS': None})
+    async def test_server_timing_concurrent(self):
+        """
+        Ensure we can read the timings of overlapping async requests, each one reporting its own queries only.
+        """
+        second_started, first_done = asyncio.Event(), asyncio.Event()
+
+        async def get_response(request):
+            queries = int(request.GET['queries'])
+            # The second request starts before the first one queries, and queries after it is done
+            if queries == 1:
+                await second_started.wait()
+            else:
+                second_started.set()
+                await first_done.wait()
+            for _ in range(queries):
+                # Run by the same thread of sync_to_async for both requests
+                await User.objects.acount()
+            return HttpResponse()
+
+        async def first():
+            response = await middleware(factory.get(self.url_list, {'queries': 1}))
+            first_done.set()
+            return response
+
+        middleware = PerformanceMiddleware(get_response)
+        factory = RequestFactory()
+        with self.assertLogs('tikoExercise.performance', level='INFO') as logs:
+            responses = await asyncio.gather(first(), middleware(factory.get(self.url_list, {'queries': 3})))
+        self.assertListEqual([response['Server-Timing'].split(', ')[0].split(';')[-1] for response in responses], ['desc="1 queries"', 'desc="3 queries"'])
+        self.assertListEqual([json.loads(record.getMessage())['queries'] for record in logs.records], [1, 3])
+
+    @override_settings(PERFORMANCE_INSTRUMENTATION={'ENABLED': True, 'NAMESPACES': ('events',), 'SLOW_REQUEST_MS': 0})
+    def test_slow_request(self):
+        """
+        Ensure we can read the SQL statements of the slow requests in their log line, and only for the instrumented namespaces.
+        """
+        with self.assertLogs('tikoExercise.performance', level='INFO') as logs:
+            # The authentication namespace is not instrumented here
+            access_token = self.access_token_johndoe
+            self.client.get(self.url_list, format='json', HTTP_AUTHORIZATION=f"Bearer {access_token}")
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(logs.records[0].levelname, 'WARNING')
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(len(record['sql']), 2)
+        self.assertIn('FROM "events_event"', record['sql'][0]['sql'])
+
+    def test_disabled(self):
+        """
+        Ensure the requests are not instrumented when the instrumentation is disabled.
+        """
+        response = self.client.get(self.url_list, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Server-Timing', response)
+
+
+class EventGenerateTests(APITestCase):
+
+    def test_generate_command(self):
+        """
+        Ensure the generate command creates a reproducible dataset within the capacity of the Event objects.
+        """
+        call_command('generate_events', users=20, events=50, attendees=300, skew=1.5, seed=1, stdout=StringIO())
+        self.assertEqual(User.objects.filter(username__startswith='generated').count(), 20)
+        self.assertEqual(Event.objects.count(), 50)
+        self.assertEqual(EventAttendee.objects.count(), 300)
+        self.assertTrue(self.client.login(username='generated0', password='generated'))
+        counts = list(Event.objects.order_by('-attendee_count').values_list('attendee_count', flat=True))
+        # The attendee counts are reconciled, and skewed towards a few events
+        self.assertEqual(sum(counts), 300)
+        self.assertEqual(counts[0], 20)
+        self.assertLess(counts[-1], 10)
+        for event in Event.objects.exclude(capacity=0):
+            self.assertLessEqual(event.attendee_count, event.capacity)
+
+        dataset = list(EventAttendee.objects.order_by('event__name', 'user__username').values_list('event__name', 'user__username'))
+        EventAttendee.objects.all().delete()
+        Event.objects.all().delete()
+        User.objects.all().delete()
+        call_command('generate_events', users=20, events=50, attendees=300, skew=1.5, seed=1, stdout=StringIO())
+        self.assertListEqual(list(EventAttendee.objects.order_by('event__name', 'user__username').values_list('event__name', 'user__username')), dataset)
+
+
+class EventWaitlistTests(AuthenticationTestMixin, APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(EventWaitlistTests, cls).setUpTestData()
+        start_date = date.today() + timedelta(days=30)
+        # Full event of John Doe, Foo Bar being its only attendee
+        cls.event = Event.objects.create(name='Full event', start_date=start_date, end_date=start_date, capacity=1, created_by_id=3)
+        cls.attendee = EventAttendee.objects.create(event=cls.event, user_id=2)
+        cls.users = User.objects.bulk_create([User(username=f'waiting{i}') for i in range(3)])
+        cls.url_waitlist = reverse('events:waitlist', kwargs={'pk': cls.event.pk})
+
+    def join(self, user):
+        return self.client.post(self.url_waitlist, format='json', HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+    def get_position(self, user):
+        response = self.client.get(self.url_waitlist, format='json', HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        return response.data['position'] if response.status_code == status.HTTP_200_OK else None
+
+    def test_join(self):
+        """
+        Ensure we can join the waitlist of a full Event object, and read our position with a single query.
+        """
+        for position, user in enumerate(self.users, start=1):
+            response = self.join(user)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(response.data['position'], position)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_position(self.users[2]), 3)
+        self.assertIsNone(self.get_position(User.objects.get(pk=3)))
+
+        response = self.join(self.users[0])
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['event'], 'Already in the waitlist of the event.')
+        response = self.join(User.objects.get(pk=2))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['event'], 'Already registered to the event.')
+
+        Event.objects.filter(pk=self.event.pk).update(capacity=2)
+        response = self.join(User.objects.get(pk=3))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['event'], 'The event is not full, register to it instead.')
+        self.assertEqual(EventWaitlistEntry.objects.count(), 3)
+
+    def test_leave(self):
+        """
+        Ensure we can leave a waitlist, the users behind moving forward.
+        """
+        for user in self.users:
+            self.join(user)
+        response = self.client.delete(self.url_waitlist, format='json', HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.users[1])}")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertListEqual([self.get_position(user) for user in self.users], [1, None, 2])
+        self.join(self.users[1])
+        self.assertListEqual([self.get_position(user) for user in self.users], [1, 3, 2])
+
+    def test_promote(self):
+        """
+        Ensure the first users of the waitlist are registered when seats are freed, in the same transaction.
+        """
+        for user in self.users:
+            self.join(user)
+
+        # A single unregistration registers the first waiting user to the freed seat
+        response = self.client.delete(reverse('events:unregister-attendee', kwargs={'pk': self.attendee.pk}), format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_foobar}")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 1)
+        self.assertListEqual(list(self.event.attendees.values_list('user_id', flat=True)), [self.users[0].pk])
+        self.assertListEqual([self.get_position(user) for user in self.users], [None, 1, 2])
+
+        # So does a batch unregistration
+        response = self.client.post(reverse('events:unregister-attendees'), {'events': [self.event.pk]}, format='json', HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.users[0])}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(list(self.event.attendees.values_list('user_id', flat=True)), [self.users[1].pk])
+
+        # Raising the capacity registers as many waiting users as possible, without exceeding it
+        response = self.client.patch(reverse('events:update', kwargs={'pk': self.event.pk}), {'capacity': 3}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['attendee_count'], 2)
+        self.assertListEqual(list(self.event.attendees.order_by('pk').values_list('user_id', flat=True)), [self.users[1].pk, self.users[2].pk])
+        self.assertFalse(EventWaitlistEntry.objects.exists())
+
+
 class EventAttendeeTests(AuthenticationTestMixin, APITestCase):
     fixtures = [
         'fixtures/events.json'
@@ -178,6 +1120,10 @@ class EventAttendeeTests(AuthenticationTestMixin, APITestCase):
     @classmethod
     def setUpTestData(cls):
         super(EventAttendeeTests, cls).setUpTestData()
+        # The fixture events date from 2023-03-10: move them by as much, so that only the first one is past
+        offset = date.today() - date(2023, 3, 10)
+        for event in Event.objects.all():
+            Event.objects.filter(pk=event.pk).update(start_date=event.start_date + offset, end_date=event.end_date + offset)
         cls.data_1 = {'event': 1}
         cls.data_2 = {'event': 2}
         cls.data_3 = {'event': 3}
@@ -201,9 +1147,9 @@ class EventAttendeeTests(AuthenticationTestMixin, APITestCase):
         self.assertEqual(response_foobar.data['user'], 2)
 
         response_list = self.client.get(self.url_event_list, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
-        self.assertEqual(len(response_list.data[0]['attendees']), 1)
-        self.assertEqual(len(response_list.data[1]['attendees']), 1)
-        self.assertEqual(len(response_list.data[2]['attendees']), 0)
+        self.assertEqual(len(response_list.data['results'][0]['attendees']), 1)
+        self.assertEqual(len(response_list.data['results'][1]['attendees']), 1)
+        self.assertEqual(len(response_list.data['results'][2]['attendees']), 0)
 
     def test_unregister(self):
         """
@@ -277,3 +1223,608 @@ class EventAttendeeTests(AuthenticationTestMixin, APITestCase):
         self.assertEqual(response_johndoe.status_code, status.HTTP_403_FORBIDDEN)
         self.assertEqual(response_johndoe.data['event'], 'It is not allowed to register more than once to an event.')
 
+
+class EventAttendeeCountTests(AuthenticationTestMixin, APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(EventAttendeeCountTests, cls).setUpTestData()
+        start_date = date.today() + timedelta(days=30)
+        cls.event = Event.objects.create(name='Future event', start_date=start_date, end_date=start_date, capacity=1, created_by_id=1)
+        cls.url_register = reverse('events:register-attendee')
+
+    def test_count_follows_registrations(self):
+        """
+        Ensure the attendee count is maintained by registrations and unregistrations.
+        """
+        response = self.client.post(self.url_register, {'event': self.event.pk}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 1)
+
+        # The event is full now
+        response = self.client.post(self.url_register, {'event': self.event.pk}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_foobar}")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['event'], 'It is not allowed to register to a full event.')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 1)
+
+        attendee = EventAttendee.objects.get(event=self.event)
+        url_unregister = reverse('events:unregister-attendee', args=[attendee.pk])
+        response = self.client.delete(url_unregister, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 0)
+
+    def test_register_duplicated_keeps_count(self):
+        """
+        Ensure a duplicated registration is rejected by the unique constraint without consuming a seat.
+        """
+        self.event.capacity = 0
+        self.event.save()
+        response = self.client.post(self.url_register, {'event': self.event.pk}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.post(self.url_register, {'event': self.event.pk}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['event'], 'It is not allowed to register more than once to an event.')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 1)
+        self.assertEqual(EventAttendee.objects.filter(event=self.event).count(), 1)
+
+    def test_register_integrity_error(self):
+        """
+        Ensure only the duplicated registrations are reported as such, the other integrity errors are not.
+        """
+        # E.g. the foreign key of a user deleted since the token was obtained, SQLite only checks it on commit
+        error = IntegrityError('FOREIGN KEY constraint failed')
+        with mock.patch('events.views.tasks.enqueue_registered', side_effect=error), self.assertRaises(IntegrityError):
+            self.client.post(self.url_register, {'event': self.event.pk}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 0)
+
+    def test_count_loaded_attendees(self):
+        """
+        Ensure the attendees loaded from fixtures are counted, so that the capacity is enforced.
+        """
+        attendee = {'created_on': '2023-03-10T13:58:24.330Z', 'modified_on': '2023-03-10T13:58:24.330Z', 'event': self.event.pk, 'user': 2}
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as fixture:
+            json.dump([{'model': 'events.eventattendee', 'pk': 100, 'fields': attendee}], fixture)
+            fixture.flush()
+            call_command('loaddata', fixture.name, verbosity=0)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 1)
+
+        response = self.client.post(self.url_register, {'event': self.event.pk}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['event'], 'It is not allowed to register to a full event.')
+
+    def test_reconcile_command(self):
+        """
+        Ensure the reconcile command fixes attendee counts out of sync.
+        """
+        # bulk_create sends no signal, hence does not count the attendees
+        EventAttendee.objects.bulk_create([EventAttendee(event=self.event, user_id=2), EventAttendee(event=self.event, user_id=3)])
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 0)
+
+        call_command('reconcile_attendee_counts', stdout=StringIO())
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendee_count, 2)
+
+
+class EventAttendeeBulkTests(AuthenticationTestMixin, APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(EventAttendeeBulkTests, cls).setUpTestData()
+        start_date = date.today() + timedelta(days=30)
+        cls.event_open = Event.objects.create(name='Open event', start_date=start_date, end_date=start_date, created_by_id=3)
+        cls.event_small = Event.objects.create(name='Small event', start_date=start_date, end_date=start_date, capacity=1, created_by_id=3)
+        cls.event_past = Event.objects.create(name='Past event', start_date=date.today() - timedelta(days=30), end_date=date.today() - timedelta(days=30))
+        cls.url_register = reverse('events:register-attendees')
+        cls.url_unregister = reverse('events:unregister-attendees')
+
+    def test_bulk_register_events(self):
+        """
+        Ensure we can register the User to a batch of Event objects, with per-item results.
+        """
+        events = [self.event_open.pk, self.event_small.pk, self.event_past.pk, self.event_open.pk, self.event_past.pk + 100]
+        response = self.client.post(self.url_register, {'events': events}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertListEqual([result['status'] for result in response.data], ['registered', 'registered', 'rejected', 'rejected', 'rejected'])
+        self.assertEqual(response.data[2]['errors']['event'], 'It is not allowed to register to past events.')
+        self.assertEqual(response.data[3]['errors']['event'], 'It is not allowed to register more than once to an event.')
+        self.assertListEqual(sorted(EventAttendee.objects.filter(user_id=3).values_list('event_id', flat=True)), [self.event_open.pk, self.event_small.pk])
+
+        # The small event is full now
+        response = self.client.post(self.url_register, {'events': [self.event_small.pk]}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_foobar}")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0]['errors']['event'], 'It is not allowed to register to a full event.')
+        self.event_small.refresh_from_db()
+        self.assertEqual(self.event_small.attendee_count, 1)
+
+        response = self.client.post(self.url_register, {'events': [self.event_open.pk]}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_foobar}")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.event_open.refresh_from_db()
+        self.assertEqual(self.event_open.attendee_count, 2)
+
+    def test_bulk_register_users(self):
+        """
+        Ensure we can register a batch of User objects to an owned Event, up to its capacity.
+        """
+        self.event_small.capacity = 2
+        self.event_small.save()
+        response = self.client.post(self.url_register, {'event': self.event_small.pk, 'users': [1, 2, 3, 100]}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertListEqual([result['status'] for result in response.data], ['registered', 'registered', 'rejected', 'rejected'])
+        self.assertEqual(response.data[2]['errors']['event'], 'It is not allowed to register to a full event.')
+        self.assertEqual(response.data[3]['errors']['user'], ['Not found.'])
+        self.event_small.refresh_from_db()
+        self.assertEqual(self.event_small.attendee_count, 2)
+
+        # Only the creator of the event can register other users
+        response = self.client.post(self.url_register, {'event': self.event_open.pk, 'users': [1]}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_foobar}")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.post(self.url_register, {'events': [self.event_open.pk], 'users': [1]}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_register_conflict(self):
+        """
+        Ensure the registrations conflicting with concurrent ones are rejected, even on the retry.
+        """
+        reserve_seat_in = EventQuerySet.reserve_seat_in
+
+        def register_concurrently(queryset, pks):
+            # Registered by another request between the checks and the insert, on both attempts
+            EventAttendee.objects.create(event=self.event_open, user_id=3)
+            return reserve_seat_in(queryset, pks)
+
+        events = [self.event_open.pk, self.event_small.pk]
+        with mock.patch.object(EventQuerySet, 'reserve_seat_in', autospec=True, side_effect=register_concurrently) as patched:
+            response = self.client.post(self.url_register, {'events': events}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(patched.call_count, 2)
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertListEqual([result['status'] for result in response.data], ['rejected', 'registered'])
+        self.assertEqual(response.data[0]['errors']['event'], 'It is not allowed to register more than once to an event.')
+        self.event_open.refresh_from_db()
+        self.event_small.refresh_from_db()
+        self.assertEqual((self.event_open.attendee_count, self.event_small.attendee_count), (1, 1))
+
+    def test_bulk_unregister(self):
+        """
+        Ensure we can unregister a batch of attendees, releasing their seats.
+        """
+        for event in (self.event_open, self.event_small):
+            EventAttendee.objects.create(event=event, user_id=3)
+        EventAttendee.objects.create(event=self.event_open, user_id=2)
+        EventAttendee.objects.create(event=self.event_past, user_id=3)
+        Event.objects.reconcile_attendee_count()
+
+        events = [self.event_open.pk, self.event_small.pk, self.event_past.pk, self.event_open.pk]
+        response = self.client.post(self.url_unregister, {'events': events}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertListEqual([result['status'] for result in response.data], ['unregistered', 'unregistered', 'rejected', 'rejected'])
+        self.assertEqual(response.data[2]['errors']['event'], 'It is not allowed to unregister from past events.')
+        self.assertListEqual(list(EventAttendee.objects.filter(user_id=3).values_list('event_id', flat=True)), [self.event_past.pk])
+        self.event_open.refresh_from_db()
+        self.event_small.refresh_from_db()
+        self.assertEqual(self.event_open.attendee_count, 1)
+        self.assertEqual(self.event_small.attendee_count, 0)
+
+        response = self.client.post(self.url_unregister, {'event': self.event_open.pk, 'users': [2]}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.event_open.refresh_from_db()
+        self.assertEqual(self.event_open.attendee_count, 0)
+
+
+class EventAttendeeConcurrencyTests(TransactionTestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    def test_capacity_never_exceeded(self):
+        """
+        Ensure concurrent registrations never exceed the Event capacity.
+        """
+        start_date = date.today() + timedelta(days=30)
+        event = Event.objects.create(name='Popular event', start_date=start_date, end_date=start_date, capacity=5)
+        users = User.objects.bulk_create([User(username=f'attendee{i}') for i in range(20)])
+        url_register = reverse('events:register-attendee')
+        barrier = threading.Barrier(len(users))
+        results = []
+
+        def register(user):
+            client = APIClient()
+            token = AccessToken.for_user(user)
+            barrier.wait()
+            response = client.post(url_register, {'event': event.pk}, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+            connection.close()
+            results.append(response.status_code)
+
+        threads = [threading.Thread(target=register, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        event.refresh_from_db()
+        self.assertEqual(results.count(status.HTTP_201_CREATED), 5)
+        self.assertEqual(results.count(status.HTTP_403_FORBIDDEN), 15)
+        self.assertEqual(event.attendee_count, 5)
+        self.assertEqual(event.attendees.count(), 5)
+
+
+class EventAttendeeSQLiteTests(TransactionTestCase):
+    # Without fixtures: the content types created again after the flush of the previous tests conflict with them
+
+    def test_concurrent_writes(self):
+        """
+        Ensure concurrent unregistrations, which read before writing, do not fail with the production SQLite settings.
+        """
+        start_date = date.today() + timedelta(days=30)
+        event = Event.objects.create(name='Popular event', start_date=start_date, end_date=start_date)
+        users = User.objects.bulk_create([User(username=f'attendee{i}') for i in range(20)])
+        EventAttendee.objects.bulk_create([EventAttendee(event=event, user=user) for user in users])
+        Event.objects.reconcile_attendee_count()
+        url_unregister = reverse('events:unregister-attendees')
+        barrier = threading.Barrier(len(users))
+        results = []
+
+        def unregister(user):
+            client = APIClient()
+            token = AccessToken.for_user(user)
+            barrier.wait()
+            response = client.post(url_unregister, {'events': [event.pk]}, format='json', HTTP_AUTHORIZATION=f"Bearer {token}")
+            connection.close()
+            results.append(response.status_code)
+
+        production = settings_production.DATABASES['default']
+        # The connections of the threads share the settings of the main thread connection
+        with mock.patch.dict(connection.settings_dict, PRAGMAS=production['PRAGMAS'], TRANSACTION_MODE=production['TRANSACTION_MODE']):
+            threads = [threading.Thread(target=unregister, args=(user,)) for user in users]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            connection.close()
+
+        event.refresh_from_db()
+        self.assertListEqual(results, [status.HTTP_200_OK] * len(users))
+        self.assertEqual(event.attendee_count, 0)
+        self.assertEqual(event.attendees.count(), 0)
+
+
+class EventRegistrationTests(APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(EventRegistrationTests, cls).setUpTestData()
+        today = date.today()
+        # Foo Bar is registered to 2 past and 3 upcoming events, one of them ongoing, John Doe to one of them
+        cls.events = Event.objects.bulk_create([
+            Event(name=f'Event {days}', start_date=today + timedelta(days=days), end_date=today + timedelta(days=days + 2), created_by_id=3)
+            for days in (-10, -5, -1, 5, 10)
+        ])
+        EventAttendee.objects.bulk_create([EventAttendee(event=event, user_id=2) for event in cls.events])
+        EventAttendee.objects.create(event=cls.events[3], user_id=3)
+        cls.user = User.objects.get(pk=2)
+        cls.url_registrations = reverse('events:registrations')
+
+    def get_registrations(self, params, url=None):
+        return self.client.get(url or self.url_registrations, params, format='json', HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def test_list(self):
+        """
+        Ensure we can list our registrations with their events, by status.
+        """
+        response = self.get_registrations({})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual([result['event']['name'] for result in response.data['results']], ['Event 10', 'Event 5', 'Event -1', 'Event -5', 'Event -10'])
+        attendee = EventAttendee.objects.get(event=self.events[4], user=self.user)
+        self.assertEqual(response.data['results'][0]['id'], attendee.id)
+        self.assertNotIn('attendees', response.data['results'][0]['event'])
+
+        response = self.get_registrations({'status': 'upcoming'})
+        self.assertListEqual([result['event']['name'] for result in response.data['results']], ['Event -1', 'Event 5', 'Event 10'])
+
+        response = self.get_registrations({'status': 'past'})
+        self.assertListEqual([result['event']['name'] for result in response.data['results']], ['Event -5', 'Event -10'])
+
+        response = self.get_registrations({'status': 'ongoing'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(self.url_registrations, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_list_pagination(self):
+        """
+        Ensure we can page through our registrations with a constant number of queries.
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.get_registrations({'status': 'upcoming', 'page_size': 2})
+        queries = len(context)
+        self.assertListEqual([result['event']['name'] for result in response.data['results']], ['Event -1', 'Event 5'])
+
+        extra_events = Event.objects.bulk_create([
+            Event(name=f'Extra {i}', start_date=date.today() + timedelta(days=100), end_date=date.today() + timedelta(days=100), created_by_id=3)
+            for i in range(50)
+        ])
+        EventAttendee.objects.bulk_create([EventAttendee(event=event, user=self.user) for event in extra_events])
+        names = []
+        url, params = None, {'status': 'upcoming', 'page_size': 2}
+        while True:
+            with self.assertNumQueries(queries):
+                response = self.get_registrations(params, url)
+            names.extend(result['event']['name'] for result in response.data['results'])
+            if not response.data['next']:
+                break
+            url, params = response.data['next'], {}
+        self.assertListEqual(names, ['Event -1', 'Event 5', 'Event 10'] + [f'Extra {i}' for i in range(50)])
+
+
+class EventChangesTests(APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(EventChangesTests, cls).setUpTestData()
+        start_date = date.today() + timedelta(days=30)
+        # Events of John Doe, Foo Bar being registered to all of them
+        cls.events = Event.objects.bulk_create([
+            Event(name=f'Event {i}', start_date=start_date, end_date=start_date, created_by_id=3, attendee_count=1)
+            for i in range(5)
+        ])
+        cls.attendees = EventAttendee.objects.bulk_create([EventAttendee(event=event, user_id=2) for event in cls.events])
+        cls.user = User.objects.get(pk=2)
+        cls.url_changes = reverse('events:changes')
+
+    def get_changes(self, params):
+        return self.client.get(self.url_changes, params, format='json', HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def sync(self, cursor=None, page_size=200):
+        """
+        Follows the feed until it has no more changes, returns the changes and the last cursor.
+        """
+        events, attendees, deleted_events, deleted_attendees = [], [], [], []
+        while True:
+            params = {'page_size': page_size}
+            if cursor is not None:
+                params['cursor'] = cursor
+            response = self.get_changes(params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            events += [event['id'] for event in response.data['events']]
+            attendees += [attendee['id'] for attendee in response.data['attendees']]
+            deleted_events += response.data['deleted']['events']
+            deleted_attendees += response.data['deleted']['attendees']
+            cursor = response.data['cursor']
+            if not response.data['more']:
+                return (events, attendees, deleted_events, deleted_attendees), cursor
+
+    def test_changes(self):
+        """
+        Ensure we can fetch the Event and EventAttendee objects created, modified or deleted since a cursor.
+        """
+        changes, cursor = self.sync()
+        self.assertListEqual(changes[0], [event.pk for event in self.events])
+        self.assertListEqual(changes[1], [attendee.pk for attendee in self.attendees])
+        self.assertListEqual(changes[2] + changes[3], [])
+
+        johndoe = f"Bearer {AccessToken.for_user(User.objects.get(pk=3))}"
+        foobar = f"Bearer {AccessToken.for_user(self.user)}"
+        response = self.client.patch(reverse('events:update', args=[self.events[0].pk]), {'name': 'Renamed'}, format='json', HTTP_AUTHORIZATION=johndoe)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.delete(reverse('events:unregister-attendee', args=[self.attendees[1].pk]), HTTP_AUTHORIZATION=foobar)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        response = self.client.delete(reverse('events:delete', args=[self.events[2].pk]), HTTP_AUTHORIZATION=johndoe)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        # The unregistration modified its event, the attendee of the deleted event has no tombstone
+        changes, cursor = self.sync(cursor)
+        self.assertListEqual(changes[0], [self.events[0].pk, self.events[1].pk])
+        self.assertListEqual(changes[1], [])
+        self.assertListEqual(changes[2], [self.events[2].pk])
+        self.assertListEqual(changes[3], [self.attendees[1].pk])
+        self.assertEqual(EventTombstone.objects.count(), 2)
+
+        changes, _ = self.sync(cursor)
+        self.assertListEqual(changes[0] + changes[1] + changes[2] + changes[3], [])
+
+    def test_changes_pagination(self):
+        """
+        Ensure we can page through the changes with a constant number of queries.
+        """
+        changes, cursor = self.sync(page_size=2)
+        self.assertListEqual(changes[0], [event.pk for event in self.events])
+        self.assertListEqual(changes[1], [attendee.pk for attendee in self.attendees])
+
+        EventAttendee.objects.filter(pk__in=[attendee.pk for attendee in self.attendees]).delete()
+        with self.assertNumQueries(3):
+            response = self.get_changes({'cursor': cursor, 'page_size': 2})
+        self.assertEqual(len(response.data['deleted']['attendees']), 2)
+        self.assertTrue(response.data['more'])
+        changes, _ = self.sync(cursor, page_size=2)
+        self.assertListEqual(sorted(changes[3]), [attendee.pk for attendee in self.attendees])
+
+    def test_changes_cursor(self):
+        """
+        Ensure we cannot fetch the changes with an invalid or expired cursor, nor see the changes within the delay.
+        """
+        response = self.get_changes({'cursor': 'invalid'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.get_changes({'page_size': 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with override_settings(EVENTS_CHANGES={'DELAY': 60, 'RETENTION': 30}):
+            response = self.get_changes({})
+        self.assertListEqual(response.data['events'], [])
+        self.assertFalse(response.data['more'])
+
+        with mock.patch('events.changes.timezone.now', return_value=timezone.now() - timedelta(days=31)):
+            _, cursor = self.sync()
+        response = self.get_changes({'cursor': cursor})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+
+class EventStreamTests(TransactionTestCase):
+    # Without fixtures, see EventAttendeeSQLiteTests. The updates are published once committed
+
+    def setUp(self):
+        start_date = date.today() + timedelta(days=30)
+        self.organizer, self.attendee = User.objects.bulk_create([User(username='organizer'), User(username='attendee')])
+        self.event = Event.objects.create(name='Live event', start_date=start_date, end_date=start_date, capacity=2, created_by=self.organizer)
+        self.application = EventStreamApplication()
+
+    def open_stream(self, query_string, token=None):
+        headers = [(b'authorization', f'Bearer {token}'.encode())] if token else []
+        scope = {'type': 'http', 'method': 'GET', 'path': EventStreamApplication.path, 'query_string': query_string.encode(), 'headers': headers}
+        return ApplicationCommunicator(self.application, scope)
+
+    @staticmethod
+    async def receive_events(communicator):
+        body = (await communicator.receive_output(timeout=5))['body'].decode()
+        return [
+            (lines[0].removeprefix('event: '), json.loads(lines[1].removeprefix('data: ')))
+            for lines in (message.split('\n') for message in body.strip().split('\n\n'))
+        ]
+
+    async def test_stream(self):
+        """
+        Ensure we can follow the attendee count and capacity of an Event object as it changes.
+        """
+        communicator = self.open_stream(f'ids={self.event.pk}', AccessToken.for_user(self.attendee))
+        await communicator.send_input({'type': 'http.request'})
+        response = await communicator.receive_output(timeout=5)
+        self.assertEqual(response['status'], status.HTTP_200_OK)
+        self.assertIn((b'content-type', b'text/event-stream'), response['headers'])
+        self.assertEqual((await communicator.receive_output(timeout=5))['body'], b'retry: 5000\n\n')
+        [(kind, data)] = await self.receive_events(communicator)
+        self.assertEqual(kind, 'update')
+        self.assertEqual((data['attendee_count'], data['remaining_capacity']), (0, 2))
+
+        client = APIClient()
+        response = await sync_to_async(client.post)(reverse('events:register-attendee'), {'event': self.event.pk}, format='json', HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.attendee)}")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        [(kind, data)] = await self.receive_events(communicator)
+        self.assertEqual((kind, data['attendee_count'], data['remaining_capacity']), ('update', 1, 1))
+
+        organizer = f"Bearer {AccessToken.for_user(self.organizer)}"
+        await sync_to_async(client.patch)(reverse('events:update', args=[self.event.pk]), {'capacity': 10}, format='json', HTTP_AUTHORIZATION=organizer)
+        [(kind, data)] = await self.receive_events(communicator)
+        self.assertEqual((kind, data['capacity'], data['remaining_capacity']), ('update', 10, 9))
+
+        await sync_to_async(client.delete)(reverse('events:delete', args=[self.event.pk]), HTTP_AUTHORIZATION=organizer)
+        self.assertListEqual(await self.receive_events(communicator), [('delete', {'id': self.event.pk, 'deleted': True})])
+
+        await communicator.send_input({'type': 'http.disconnect'})
+        await communicator.wait(timeout=5)
+        self.assertSetEqual(get_pubsub().get_subscribed({self.event.pk}), set())
+
+    async def test_stream_heartbeat(self):
+        """
+        Ensure an idle stream sends heartbeats.
+        """
+        self.application.heartbeat = 0.01
+        communicator = self.open_stream(f'ids={self.event.pk}', AccessToken.for_user(self.attendee))
+        await communicator.send_input({'type': 'http.request'})
+        for _ in range(3):
+            await communicator.receive_output(timeout=5)
+        self.assertEqual((await communicator.receive_output(timeout=5))['body'], b': heartbeat\n\n')
+        await communicator.send_input({'type': 'http.disconnect'})
+        await communicator.wait(timeout=5)
+
+    async def test_stream_errors(self):
+        """
+        Ensure we cannot open a stream without token, nor without valid events.
+        """
+        token = AccessToken.for_user(self.attendee)
+        for query_string, raw_token, expected in (
+            (f'ids={self.event.pk}', None, status.HTTP_401_UNAUTHORIZED),
+            (f'ids={self.event.pk}&token=invalid', None, status.HTTP_401_UNAUTHORIZED),
+            ('ids=1,foo', token, status.HTTP_400_BAD_REQUEST),
+            ('', token, status.HTTP_400_BAD_REQUEST),
+            ('ids=' + ','.join(map(str, range(1, EventStreamApplication.max_events + 2))), token, status.HTTP_400_BAD_REQUEST),
+        ):
+            communicator = self.open_stream(query_string, raw_token)
+            await communicator.send_input({'type': 'http.request'})
+            response = await communicator.receive_output(timeout=5)
+            self.assertEqual(response['status'], expected, query_string)
+            await communicator.receive_output(timeout=5)
+
+
+class EventTaskTests(AuthenticationTestMixin, APITestCase):
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    def test_side_effects(self):
+        """
+        Ensure creating an Event object and registering to it only enqueue their emails and audit entries.
+        """
+        start_date = date.today() + timedelta(days=30)
+        data = {'name': 'Queued event', 'description': 'With side effects', 'start_date': start_date, 'end_date': start_date}
+        response = self.client.post(reverse('events:create'), data, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        event_id = response.data['id']
+        response = self.client.post(reverse('events:register-attendee'), {'event': event_id}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_foobar}")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Task.objects.filter(status=Task.QUEUED).count(), 5)
+
+        worker = Worker(threads=1)
+        self.assertEqual(worker.run_batch(), 5)
+        self.assertFalse(Task.objects.exists())
+        self.assertListEqual(
+            sorted((message.subject, message.to[0]) for message in mail.outbox),
+            [
+                ('Invitation: Queued event', 'foo.bar@tiko.energy'),
+                ('Invitation: Queued event', 'john.doe@tiko.energy'),
+                ('Registered to Queued event', 'foo.bar@tiko.energy'),
+            ]
+        )
+        invite = next(message for message in mail.outbox if message.to == ['foo.bar@tiko.energy'] and message.attachments)
+        self.assertIn(f'DTSTART;VALUE=DATE:{start_date:%Y%m%d}', invite.attachments[0][1])
+        self.assertListEqual(
+            list(EventAuditEntry.objects.values_list('action', 'event_id', 'user_id')),
+            [(EventAuditEntry.EVENT_CREATED, event_id, 3), (EventAuditEntry.ATTENDEE_REGISTERED, event_id, 2)]
+        )
+
+    def test_side_effects_promoted(self):
+        """
+        Ensure registering a User of the waitlist to a freed seat enqueues the same emails and audit entry as registering.
+        """
+        start_date = date.today() + timedelta(days=30)
+        event = Event.objects.create(name='Full event', start_date=start_date, end_date=start_date, capacity=1, created_by_id=1)
+        response = self.client.post(reverse('events:register-attendee'), {'event': event.pk}, format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_foobar}")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        attendee_id = EventAttendee.objects.get(event=event, user_id=2).pk
+        response = self.client.post(reverse('events:waitlist', args=[event.pk]), format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_johndoe}")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        Task.objects.all().delete()
+
+        response = self.client.delete(reverse('events:unregister-attendee', args=[attendee_id]), format='json', HTTP_AUTHORIZATION=f"Bearer {self.access_token_foobar}")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertTrue(EventAttendee.objects.filter(event=event, user_id=3).exists())
+        self.assertEqual(Task.objects.filter(status=Task.QUEUED).count(), 3)
+
+        self.assertEqual(Worker(threads=1).run_batch(), 3)
+        self.assertListEqual(
+            sorted((message.subject, message.to[0]) for message in mail.outbox),
+            [('Invitation: Full event', 'john.doe@tiko.energy'), ('Registered to Full event', 'john.doe@tiko.energy')]
+        )
+        self.assertListEqual(
+            list(EventAuditEntry.objects.values_list('action', 'event_id', 'user_id')),
+            [(EventAuditEntry.ATTENDEE_REGISTERED, event.pk, 3)]
+        )
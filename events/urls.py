@@ -1,16 +1,31 @@
 from django.urls import path
 
 from events.apps import EventsConfig
-from events import views
+from events import (
+    async_views,
+    views
+)
 
 app_name = EventsConfig.name
 
 urlpatterns = [
     path('', views.EventListView.as_view(), name='list'),
     path('create/', views.EventCreateView.as_view(), name='create'),
+    path('bulk/', views.EventBulkView.as_view(), name='bulk'),
+    path('export/', views.EventExportView.as_view(), name='export'),
+    path('changes/', views.EventChangesView.as_view(), name='changes'),
+    path('registrations/', views.EventRegistrationListView.as_view(), name='registrations'),
+    path('cache-stats/', views.EventListCacheStatsView.as_view(), name='cache-stats'),
     path('<int:pk>/', views.EventGetView.as_view(), name='get'),
+    path('<int:pk>/attendees/', views.EventAttendeeListView.as_view(), name='attendees'),
+    path('<int:pk>/waitlist/', views.EventWaitlistView.as_view(), name='waitlist'),
     path('update/<int:pk>/', views.EventUpdateView.as_view(), name='update'),
     path('delete/<int:pk>/', views.EventDeleteView.as_view(), name='delete'),
     path('register-attendee/', views.EventAttendeeRegisterView.as_view(), name='register-attendee'),
     path('unregister-attendee/<int:pk>/', views.EventAttendeeUnregisterView.as_view(), name='unregister-attendee'),
+    path('register-attendees/', views.EventAttendeeBulkRegisterView.as_view(), name='register-attendees'),
+    path('unregister-attendees/', views.EventAttendeeBulkUnregisterView.as_view(), name='unregister-attendees'),
+    path('async/', async_views.AsyncEventListView.as_view(), name='async-list'),
+    path('async/<int:pk>/', async_views.AsyncEventGetView.as_view(), name='async-get'),
+    path('async/register-attendee/', async_views.AsyncEventAttendeeRegisterView.as_view(), name='async-register-attendee'),
 ]
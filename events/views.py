@@ -1,34 +1,265 @@
+from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
+from django.db import (
+    IntegrityError,
+    transaction
+)
+from django.db.models import (
+    Exists,
+    F,
+    OuterRef
+)
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from rest_framework import generics
 from rest_framework import exceptions
-from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from rest_framework.permissions import (
+    IsAdminUser,
+    IsAuthenticated
+)
+from rest_framework.response import Response
 
+from authentication.backends import ensure_user_exists
+from events import cache
+from events import changes
+from events import exports
+from events import pubsub
+from events import tasks
+from events.conditional import (
+    ConditionalGetMixin,
+    get_etag,
+    set_validators
+)
+from events.filters import (
+    EventFilterBackend,
+    EventRegistrationFilterBackend,
+    EventSearchFilter
+)
 from events.models import (
     Event,
-    EventAttendee
+    EventAttendee,
+    EventTombstone,
+    EventWaitlistEntry,
+    reserved_seats
 )
+from events.pagination import (
+    EventAttendeeCursorPagination,
+    EventCursorPagination,
+    EventRegistrationCursorPagination
+)
+from events.queries import QueryPlanMixin
+from events.search import get_search_backend
 from events.serializers import (
     EventSerializer,
+    EventAttendeeBulkSerializer,
+    EventAttendeeChangeSerializer,
     EventAttendeeSerializer,
+    EventChangeSerializer,
+    EventRegistrationSerializer,
+    EventSummarySerializer,
+    EventWaitlistEntrySerializer,
 )
 
+User = get_user_model()
+
 
-class EventListView(generics.ListAPIView):
+def get_event_etag(pk, modified_on, user_id=None):
+    """
+    ETag of the representation of an event: its `modified_on` is bumped whenever the event
+    or its attendees change. The summary representation also depends on the request User.
+    """
+    return get_etag('event', pk, modified_on, user_id)
+
+
+class PreconditionFailed(exceptions.APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'The resource has been modified since it was retrieved.'
+    default_code = 'precondition_failed'
+
+
+class CursorExpired(exceptions.APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'The cursor has expired, synchronize again without cursor.'
+    default_code = 'cursor_expired'
+
+
+class EventSummaryMixin:
+    """
+    Switches to the compact representation of the events when the `summary` query parameter is set:
+    attendees are summarized by their count, the remaining capacity and whether the request User is registered.
+    """
+
+    @property
+    def summary(self):
+        return self.request.query_params.get('summary') is not None
+
+    def get_serializer_class(self):
+        if self.summary:
+            return EventSummarySerializer
+        return super(EventSummaryMixin, self).get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super(EventSummaryMixin, self).get_queryset()
+        if self.summary:
+            queryset = queryset.annotate(
+                is_registered=Exists(EventAttendee.objects.filter(event=OuterRef('pk'), user_id=self.request.user.id))
+            )
+        return queryset
+
+
+class EventListView(EventSummaryMixin, QueryPlanMixin, generics.ListAPIView):
     """
     Retrieves a list of event entries, related to :model:`events.Event`.
+    Results are paginated with opaque cursors, following the `-start_date` ordering.
+    Set the `summary` query parameter for the compact representation of the events.
+    Events can be filtered on their dates, status, remaining capacity and creator,
+    and searched by relevance with the `q` query parameter.
+    Supports conditional requests: responds 304 Not Modified if the page has not changed.
+    Pages are cached until an event or an attendee changes, see :mod:`events.cache`.
     """
     queryset = Event.objects.all()
     permission_classes = (IsAuthenticated,)
     serializer_class = EventSerializer
+    pagination_class = EventCursorPagination
+    filter_backends = (EventFilterBackend, EventSearchFilter)
+
+    @property
+    def mine(self):
+        return self.request.query_params.get('mine') is not None
 
     def get_queryset(self):
         queryset = super(EventListView, self).get_queryset()
         # Handle the mine query parameter in order to filter User's own Events only
-        mine = self.request.query_params.get('mine')
-        if mine is not None:
-            queryset = queryset.filter(created_by=self.request.user)
+        if self.mine:
+            queryset = queryset.filter(created_by_id=self.request.user.id)
         return queryset
 
+    def get_page_etag(self, page):
+        """
+        ETag of a page: the events it holds with their `modified_on`, which is bumped whenever an event
+        or its attendees change, and whether it has neighbours. It is read from the page itself, so that
+        its cost does not depend on the number of events.
+        """
+        user_id = self.request.user.id if self.summary or self.mine else None
+        versions = [(event.pk, event.modified_on) for event in page]
+        return get_etag('events', versions, self.paginator.has_next, self.paginator.has_previous, self.request.META.get('QUERY_STRING', ''), user_id)
+
+    def get_page_response(self, request):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        etag = self.get_page_etag(page)
+        # Not modified: skip the serialization
+        response = get_conditional_response(request._request, etag=etag)
+        if response is None:
+            response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return set_validators(response, None, etag)
+
+    def list(self, request, *args, **kwargs):
+        list_cache = cache.get_list_cache()
+        if list_cache is None:
+            return self.get_page_response(request)
+        # The status filter is relative to today, the summary and mine parameters to the request User
+        user_id = request.user.id if self.summary or self.mine else None
+        key = list_cache.make_key(request.build_absolute_uri(), timezone.now().date(), user_id)
+        cached = list_cache.get(key)
+        if cached is not None:
+            data, etag = cached
+            response = get_conditional_response(request._request, etag=etag) or Response(data)
+            response['X-Cache'] = 'HIT'
+            return set_validators(response, None, etag)
+        response = self.get_page_response(request)
+        if response.status_code == status.HTTP_200_OK:
+            data = response.data
+            list_cache.set(key, ({**data, 'results': list(data['results'])}, response['ETag']))
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class EventListCacheStatsView(generics.GenericAPIView):
+    """
+    Retrieves the hit and miss counts of the event list cache of the serving process.
+    Only available to staff users.
+    """
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, *args, **kwargs):
+        list_cache = cache.get_list_cache()
+        if list_cache is None:
+            return Response({'backend': None, 'hits': 0, 'misses': 0, 'hit_ratio': None})
+        return Response(list_cache.stats())
+
+
+class EventExportView(generics.GenericAPIView):
+    """
+    Exports every event entry with its attendees, related to :model:`events.Event` and :model:`events.EventAttendee`.
+    Set the `type` query parameter to `csv` (the default) or `ndjson`.
+    The export is streamed with constant memory, and can be filtered like the list of events.
+    """
+    queryset = Event.objects.all()
+    permission_classes = (IsAuthenticated,)
+    filter_backends = (EventFilterBackend,)
+    chunk_size = 2000
+
+    def get(self, request, *args, **kwargs):
+        export_type = request.query_params.get('type', 'csv')
+        if export_type not in exports.EXPORTERS:
+            raise exceptions.ValidationError({'type': f'Select one of {", ".join(exports.EXPORTERS)}.'})
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            exports.EXPORTERS[export_type](queryset, chunk_size=self.chunk_size),
+            content_type=exports.CONTENT_TYPES[export_type]
+        )
+        response['Content-Disposition'] = f'attachment; filename="events.{export_type}"'
+        return response
+
+
+class EventChangesView(generics.GenericAPIView):
+    """
+    Retrieves the events and attendees created, modified or deleted since the `cursor` query parameter,
+    related to :model:`events.Event`, :model:`events.EventAttendee` and :model:`events.EventTombstone`.
+    Without cursor, every event and attendee is listed. The response holds up to `page_size` changes
+    of every kind, the `cursor` to send next time, and whether there are `more` changes to fetch now.
+    An event or attendee modified again is listed again, with its new state: clients upsert them by id.
+    Responds 410 Gone when the cursor is older than the tombstones, the client must then start over.
+    """
+    permission_classes = (IsAuthenticated,)
+    page_size = 200
+    max_page_size = 1000
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get('page_size', self.page_size))
+        except ValueError:
+            page_size = 0
+        if not 0 < page_size <= self.max_page_size:
+            raise exceptions.ValidationError({'page_size': f'Ensure this value is between 1 and {self.max_page_size}.'})
+        return page_size
+
+    def get(self, request, *args, **kwargs):
+        cursor = request.query_params.get('cursor')
+        positions = None
+        if cursor is not None:
+            try:
+                positions = changes.decode_cursor(cursor)
+            except changes.InvalidCursor:
+                raise exceptions.ValidationError({'cursor': 'Invalid cursor.'})
+            if changes.is_expired(positions):
+                raise CursorExpired()
+        rows, positions, has_more = changes.get_changes(positions, self.get_page_size(request))
+        deleted = {EventTombstone.EVENT: [], EventTombstone.ATTENDEE: []}
+        for tombstone in rows['deleted']:
+            deleted[tombstone.kind].append(tombstone.object_id)
+        return Response({
+            'events': EventChangeSerializer(rows['events'], many=True).data,
+            'attendees': EventAttendeeChangeSerializer(rows['attendees'], many=True).data,
+            'deleted': {
+                'events': deleted[EventTombstone.EVENT],
+                'attendees': deleted[EventTombstone.ATTENDEE],
+            },
+            'cursor': changes.encode_cursor(positions),
+            'more': has_more,
+        })
+
 
 class EventCreateView(generics.CreateAPIView):
     """
@@ -38,34 +269,69 @@ class EventCreateView(generics.CreateAPIView):
     serializer_class = EventSerializer
 
     def perform_create(self, serializer):
-        # Set the created by to the request User
-        serializer.validated_data['created_by'] = self.request.user
-        serializer.save()
+        # Set the created by to the request User, by id as the request User is built from the token claims
+        ensure_user_exists(self.request.user)
+        serializer.validated_data.pop('created_by', None)
+        serializer.validated_data['created_by_id'] = self.request.user.id
+        with transaction.atomic():
+            event = serializer.save()
+            # The side effects run in the background, the tasks are committed along with the event
+            tasks.enqueue_created([event.pk], self.request.user.id)
 
 
-class EventGetView(generics.RetrieveAPIView):
+class EventGetView(EventSummaryMixin, ConditionalGetMixin, QueryPlanMixin, generics.RetrieveAPIView):
     """
     Retrieves an event entry, related to :model:`events.Event`.
+    Set the `summary` query parameter for the compact representation of the event.
+    Supports conditional requests: responds 304 Not Modified if the event has not changed.
     """
     queryset = Event.objects.all()
     permission_classes = (IsAuthenticated,)
     serializer_class = EventSerializer
 
+    def get_version(self):
+        modified_on = Event.objects.filter(pk=self.kwargs['pk']).values_list('modified_on', flat=True).first()
+        if modified_on is None:
+            return None
+        user_id = self.request.user.id if self.summary else None
+        return modified_on, get_event_etag(self.kwargs['pk'], modified_on, user_id)
 
-class EventUpdateView(generics.UpdateAPIView):
+
+class EventUpdateView(QueryPlanMixin, generics.UpdateAPIView):
     """
     Updates an event entry, related to :model:`events.Event`.
+    Set the `If-Match` header to the ETag of the event in order to reject the update
+    with 412 Precondition Failed if the event has been modified in the meantime.
     """
     queryset = Event.objects.all()
     permission_classes = (IsAuthenticated,)
     serializer_class = EventSerializer
 
+    def get_queryset(self):
+        # Lock the event until the update is committed, so that the precondition holds
+        return super(EventUpdateView, self).get_queryset().select_for_update()
+
     def get_object(self):
         obj = super(EventUpdateView, self).get_object()
-        if obj.created_by != self.request.user:
+        if obj.created_by_id != self.request.user.id:
             raise exceptions.PermissionDenied({'created_by': 'It is not allowed to edit other users\' events.'})
+        etag = get_event_etag(obj.pk, obj.modified_on)
+        if get_conditional_response(self.request._request, etag=etag, last_modified=int(obj.modified_on.timestamp())) is not None:
+            raise PreconditionFailed()
         return obj
 
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        response = super(EventUpdateView, self).update(request, *args, **kwargs)
+        return set_validators(response, self.object.modified_on, get_event_etag(self.object.pk, self.object.modified_on))
+
+    def perform_update(self, serializer):
+        self.object = serializer.save()
+        if 'capacity' in serializer.validated_data:
+            if Event.objects.fill_from_waitlist(self.object.pk):
+                self.object.refresh_from_db()
+            pubsub.notify([self.object.pk])
+
 
 class EventDeleteView(generics.DestroyAPIView):
     """
@@ -77,10 +343,187 @@ class EventDeleteView(generics.DestroyAPIView):
 
     def get_object(self):
         obj = super(EventDeleteView, self).get_object()
-        if obj.created_by != self.request.user:
+        if obj.created_by_id != self.request.user.id:
             raise exceptions.PermissionDenied({'created_by': 'It is not allowed to delete other users\' events.'})
         return obj
 
+    def perform_destroy(self, instance):
+        pk = instance.pk
+        super(EventDeleteView, self).perform_destroy(instance)
+        pubsub.notify([pk])
+
+
+class BulkResultsMixin:
+    """
+    Helpers for the batch endpoints: the request body is a list of items, and the response
+    reports the result of every item, in the order of the request.
+    """
+    max_batch_size = 1000
+
+    def get_items(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise exceptions.ValidationError({'non_field_errors': ['Expected a non-empty list of items.']})
+        if len(items) > self.max_batch_size:
+            raise exceptions.ValidationError({'non_field_errors': [f'Ensure there are at most {self.max_batch_size} items.']})
+        return items
+
+    @staticmethod
+    def rejected(errors, **result):
+        return {**result, 'status': 'rejected', 'errors': errors}
+
+    @staticmethod
+    def get_bulk_response(results, success_status):
+        """
+        Responds with `success_status` if every item was accepted, 400 if none was, 207 otherwise.
+        """
+        rejected = sum(result['status'] == 'rejected' for result in results)
+        if not rejected:
+            return Response(results, status=success_status)
+        if rejected == len(results):
+            return Response(results, status=status.HTTP_400_BAD_REQUEST)
+        return Response(results, status=status.HTTP_207_MULTI_STATUS)
+
+
+class EventBulkView(BulkResultsMixin, generics.GenericAPIView):
+    """
+    Creates (POST) or updates (PUT/PATCH) a batch of event entries, related to :model:`events.Event`.
+    The request body is a list of events, the events to update must include their `id`.
+    Valid items are written in a single transaction and invalid items are rejected.
+    Users can only update the events they have created.
+    """
+    queryset = Event.objects.all()
+    permission_classes = (IsAuthenticated,)
+    serializer_class = EventSerializer
+
+    def post(self, request, *args, **kwargs):
+        items = self.get_items(request)
+        results = [None] * len(items)
+        valid = self._validate(items, range(len(items)), results)
+
+        ensure_user_exists(request.user)
+        events = [Event(**data, created_by_id=request.user.id) for _, data in valid]
+        with transaction.atomic():
+            Event.objects.bulk_create(events)
+            # bulk_create does not send post_save, index the events explicitly
+            get_search_backend().index(events)
+            cache.invalidate()
+            tasks.enqueue_created([event.pk for event in events], request.user.id)
+        for (index, _), event in zip(valid, events):
+            results[index] = {'id': event.pk, 'status': 'created'}
+        return self.get_bulk_response(results, status.HTTP_201_CREATED)
+
+    def put(self, request, *args, **kwargs):
+        return self._update(request, partial=False)
+
+    def patch(self, request, *args, **kwargs):
+        return self._update(request, partial=True)
+
+    def _update(self, request, partial):
+        items = self.get_items(request)
+        results = [None] * len(items)
+        pks = [item.get('id') if isinstance(item, dict) else None for item in items]
+        instances = Event.objects.in_bulk([pk for pk in pks if isinstance(pk, int)])
+
+        # Same ownership rules as EventUpdateView.get_object
+        candidates = []
+        seen = set()
+        for index, pk in enumerate(pks):
+            if not isinstance(pk, int):
+                results[index] = self.rejected({'id': ['A valid integer is required.']}, id=pk)
+            elif pk in seen:
+                results[index] = self.rejected({'id': ['Duplicated in the batch.']}, id=pk)
+            elif pk not in instances:
+                results[index] = self.rejected({'id': ['Not found.']}, id=pk)
+            elif instances[pk].created_by_id != request.user.id:
+                results[index] = self.rejected({'created_by': 'It is not allowed to edit other users\' events.'}, id=pk)
+            else:
+                candidates.append(index)
+            seen.add(pk)
+
+        valid = self._validate(items, candidates, results, partial=partial)
+        events = []
+        fields = {'modified_on'}
+        now = timezone.now()
+        for index, data in valid:
+            event = instances[pks[index]]
+            for attr, value in data.items():
+                setattr(event, attr, value)
+            # bulk_update bypasses auto_now
+            event.modified_on = now
+            fields.update(data)
+            events.append(event)
+            results[index] = {'id': event.pk, 'status': 'updated'}
+        if events:
+            with transaction.atomic():
+                Event.objects.bulk_update(events, fields=sorted(fields))
+                if 'capacity' in fields:
+                    for event in events:
+                        Event.objects.fill_from_waitlist(event.pk)
+                    pubsub.notify([event.pk for event in events])
+                get_search_backend().index(events)
+                cache.invalidate()
+        return self.get_bulk_response(results, status.HTTP_200_OK)
+
+    def _validate(self, items, indexes, results, partial=False):
+        """
+        Validates the items at `indexes` with a single list serializer, records the rejected
+        ones in `results` and returns the (index, validated data) pairs of the valid ones.
+        """
+        indexes = list(indexes)
+        if not indexes:
+            return []
+        serializer = self.get_serializer(data=[items[index] for index in indexes], many=True, partial=partial)
+        if not serializer.is_valid():
+            for index, errors in zip(indexes, serializer.errors):
+                if errors:
+                    results[index] = self.rejected(errors, id=items[index].get('id') if isinstance(items[index], dict) else None)
+            indexes = [index for index, errors in zip(indexes, serializer.errors) if not errors]
+            if not indexes:
+                return []
+            serializer = self.get_serializer(data=[items[index] for index in indexes], many=True, partial=partial)
+            serializer.is_valid(raise_exception=True)
+        valid = []
+        for index, data in zip(indexes, serializer.validated_data):
+            # The ownership of the events cannot be set nor transferred
+            data.pop('created_by', None)
+            valid.append((index, data))
+        return valid
+
+
+class EventAttendeeListView(generics.ListAPIView):
+    """
+    Retrieves the attendees of an event entry, related to :model:`events.EventAttendee`.
+    Results are paginated with opaque cursors, in registration order.
+    """
+    queryset = EventAttendee.objects.all()
+    permission_classes = (IsAuthenticated,)
+    serializer_class = EventAttendeeSerializer
+    pagination_class = EventAttendeeCursorPagination
+
+    def get_queryset(self):
+        if not Event.objects.filter(pk=self.kwargs['pk']).exists():
+            raise exceptions.NotFound()
+        return super(EventAttendeeListView, self).get_queryset().filter(event_id=self.kwargs['pk'])
+
+
+class EventRegistrationListView(QueryPlanMixin, generics.ListAPIView):
+    """
+    Retrieves the registrations of the request User with their events, related to :model:`events.EventAttendee`.
+    Set the `status` query parameter to `upcoming` or `past` in order to filter them on their events.
+    The query walks the (user, event) index and joins the events, so its cost depends on the number
+    of registrations of the User, not on the number of events.
+    """
+    queryset = EventAttendee.objects.all()
+    permission_classes = (IsAuthenticated,)
+    serializer_class = EventRegistrationSerializer
+    filter_backends = (EventRegistrationFilterBackend,)
+    pagination_class = EventRegistrationCursorPagination
+
+    def get_queryset(self):
+        # The start date of the events is annotated for the keyset pagination
+        return super(EventRegistrationListView, self).get_queryset().filter(user_id=self.request.user.id).annotate(start_date=F('event__start_date'))
+
 
 class EventAttendeeRegisterView(generics.CreateAPIView):
     """
@@ -97,14 +540,186 @@ class EventAttendeeRegisterView(generics.CreateAPIView):
         event = serializer.validated_data['event']
         if event.start_date < timezone.now().date():
             raise exceptions.PermissionDenied({'event': 'It is not allowed to register to past events.'})
-        if event.capacity and event.attendees.count() >= event.capacity:
-            raise exceptions.PermissionDenied({'event': 'It is not allowed to register to a full event.'})
-        # Check for unique attendees
-        if self.request.user.id in event.attendees.select_related('event', 'user').values_list('user_id', flat=True):
+        ensure_user_exists(self.request.user)
+        try:
+            with transaction.atomic(), reserved_seats():
+                # The capacity check and the counter increment are a single conditional UPDATE
+                if not Event.objects.reserve_seat(event.pk):
+                    raise exceptions.PermissionDenied({'event': 'It is not allowed to register to a full event.'})
+                # Set the user to request User
+                serializer.validated_data.pop('user', None)
+                serializer.validated_data['user_id'] = self.request.user.id
+                super(EventAttendeeRegisterView, self).perform_create(serializer)
+                tasks.enqueue_registered([(event.pk, self.request.user.id)])
+            pubsub.notify([event.pk])
+        except IntegrityError:
+            # Unique attendees are enforced by the (event, user) constraint, the seat reservation is rolled back.
+            # Other violations are errors
+            if not EventAttendee.objects.filter(event_id=event.pk, user_id=self.request.user.id).exists():
+                raise
             raise exceptions.PermissionDenied({'event': 'It is not allowed to register more than once to an event.'})
-        # Set the user to request User
-        serializer.validated_data['user'] = self.request.user
-        super(EventAttendeeRegisterView, self).perform_create(serializer)
+
+
+class EventAttendeeBulkMixin(BulkResultsMixin):
+    """
+    Resolves the (event, user) pairs of a batch of registrations: either the request User
+    and a list of events, or an event created by the request User and a list of users.
+    """
+    permission_classes = (IsAuthenticated,)
+    serializer_class = EventAttendeeBulkSerializer
+    organizer_error = None
+
+    def get_pairs(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        if 'events' in data:
+            return [(event_id, request.user.id) for event_id in data['events']]
+        if not Event.objects.filter(pk=data['event'], created_by_id=request.user.id).exists():
+            raise exceptions.PermissionDenied({'event': self.organizer_error})
+        return [(data['event'], user_id) for user_id in data['users']]
+
+    @staticmethod
+    def get_result(pair, result_status):
+        return {'event': pair[0], 'user': pair[1], 'status': result_status}
+
+
+class EventAttendeeBulkRegisterView(EventAttendeeBulkMixin, generics.GenericAPIView):
+    """
+    Registers attendees to event entries in a single transaction, related to :model:`events.EventAttendee`.
+    Either registers the request User to a list of `events`, or registers a list of `users`
+    to an `event` created by the request User.
+    The past events, capacity and uniqueness rules are checked with set-based queries,
+    and the response reports the result of every registration.
+    """
+    organizer_error = 'It is not allowed to register attendees to other users\' events.'
+
+    def post(self, request, *args, **kwargs):
+        pairs = self.get_pairs(request)
+        try:
+            results = self._register(pairs)
+        except IntegrityError:
+            # A concurrent registration slipped in between the checks and the insert: check again,
+            # inserting the registrations one by one so that those conflicting again are rejected
+            results = self._register(pairs, isolated=True)
+        return self.get_bulk_response(results, status.HTTP_201_CREATED)
+
+    @transaction.atomic
+    def _register(self, pairs, isolated=False):
+        event_ids = {event_id for event_id, _ in pairs}
+        user_ids = {user_id for _, user_id in pairs}
+        events = Event.objects.in_bulk(event_ids)
+        users = set(User.objects.filter(pk__in=user_ids).values_list('pk', flat=True))
+        registered = set(EventAttendee.objects.filter(event_id__in=event_ids, user_id__in=user_ids).values_list('event_id', 'user_id'))
+        today = timezone.now().date()
+
+        results = [None] * len(pairs)
+        candidates = {}
+        for index, pair in enumerate(pairs):
+            event_id, user_id = pair
+            if pair in registered:
+                results[index] = self.rejected({'event': 'It is not allowed to register more than once to an event.'}, event=pair[0], user=pair[1])
+            elif event_id not in events:
+                results[index] = self.rejected({'event': ['Not found.']}, event=pair[0], user=pair[1])
+            elif user_id not in users:
+                results[index] = self.rejected({'user': ['Not found.']}, event=pair[0], user=pair[1])
+            elif events[event_id].start_date < today:
+                results[index] = self.rejected({'event': 'It is not allowed to register to past events.'}, event=pair[0], user=pair[1])
+            else:
+                candidates.setdefault(event_id, []).append(index)
+            registered.add(pair)
+
+        # Reserve the seats: one UPDATE for the events with a single candidate, one per event otherwise
+        accepted = []
+        reserved = Event.objects.reserve_seat_in([event_id for event_id, indexes in candidates.items() if len(indexes) == 1])
+        for event_id, indexes in candidates.items():
+            seats = int(event_id in reserved) if len(indexes) == 1 else Event.objects.reserve_seats(event_id, len(indexes))
+            accepted += indexes[:seats]
+            for index in indexes[seats:]:
+                results[index] = self.rejected({'event': 'It is not allowed to register to a full event.'}, event=pairs[index][0], user=pairs[index][1])
+
+        if isolated:
+            accepted = self._insert_isolated(pairs, accepted, results)
+        else:
+            EventAttendee.objects.bulk_create([EventAttendee(event_id=pairs[index][0], user_id=pairs[index][1]) for index in accepted])
+        tasks.enqueue_registered([pairs[index] for index in accepted])
+        # bulk_create does not send post_save
+        cache.invalidate()
+        pubsub.notify({pairs[index][0] for index in accepted})
+        for index in accepted:
+            results[index] = self.get_result(pairs[index], 'registered')
+        return results
+
+    def _insert_isolated(self, pairs, accepted, results):
+        """
+        Inserts the registrations at `accepted` in a savepoint each, rejects in `results` those
+        which are already registered and releases their seats. Returns the indexes inserted.
+        """
+        inserted = []
+        conflicts = {}
+        for index in accepted:
+            event_id, user_id = pairs[index]
+            try:
+                with transaction.atomic():
+                    EventAttendee.objects.bulk_create([EventAttendee(event_id=event_id, user_id=user_id)])
+            except IntegrityError:
+                if not EventAttendee.objects.filter(event_id=event_id, user_id=user_id).exists():
+                    raise
+                conflicts[event_id] = conflicts.get(event_id, 0) + 1
+                results[index] = self.rejected({'event': 'It is not allowed to register more than once to an event.'}, event=event_id, user=user_id)
+            else:
+                inserted.append(index)
+        Event.objects.release_seats(conflicts)
+        return inserted
+
+
+class EventAttendeeBulkUnregisterView(EventAttendeeBulkMixin, generics.GenericAPIView):
+    """
+    Unregisters attendees from event entries in a single transaction, related to :model:`events.EventAttendee`.
+    Either unregisters the request User from a list of `events`, or unregisters a list of `users`
+    from an `event` created by the request User.
+    Attendees cannot unregister from past events.
+    The response reports the result of every unregistration.
+    """
+    organizer_error = 'It is not allowed to unregister attendees from other users\' events.'
+
+    @transaction.atomic
+    def post(self, request, *args, **kwargs):
+        pairs = self.get_pairs(request)
+        registrations = {
+            (event_id, user_id): (pk, start_date)
+            for pk, event_id, user_id, start_date in EventAttendee.objects.filter(
+                event_id__in={event_id for event_id, _ in pairs},
+                user_id__in={user_id for _, user_id in pairs}
+            ).values_list('pk', 'event_id', 'user_id', 'event__start_date')
+        }
+        today = timezone.now().date()
+
+        results = []
+        accepted = []
+        for pair in pairs:
+            if pair not in registrations:
+                results.append(self.rejected({'event': 'Not registered to the event.'}, event=pair[0], user=pair[1]))
+            elif registrations[pair][1] < today:
+                results.append(self.rejected({'event': 'It is not allowed to unregister from past events.'}, event=pair[0], user=pair[1]))
+            else:
+                accepted.append(registrations.pop(pair)[0])
+                results.append(self.get_result(pair, 'unregistered'))
+
+        if accepted:
+            with reserved_seats():
+                EventAttendee.objects.filter(pk__in=accepted).delete()
+            counts = {}
+            for result in results:
+                if result['status'] == 'unregistered':
+                    counts[result['event']] = counts.get(result['event'], 0) + 1
+            # The freed seats go to the waitlists first
+            waitlisted = Event.objects.filter(pk__in=counts, waitlist_tail__gt=F('waitlist_head')).values_list('pk', flat=True)
+            for event_id in waitlisted:
+                counts[event_id] -= Event.objects.promote_waitlist(event_id, counts[event_id])
+            Event.objects.release_seats({event_id: count for event_id, count in counts.items() if count})
+            pubsub.notify(counts)
+        return self.get_bulk_response(results, status.HTTP_200_OK)
 
 
 class EventAttendeeUnregisterView(generics.DestroyAPIView):
@@ -121,6 +736,64 @@ class EventAttendeeUnregisterView(generics.DestroyAPIView):
         obj = super(EventAttendeeUnregisterView, self).get_object()
         if obj.event.start_date < timezone.now().date():
             raise exceptions.PermissionDenied({'event': 'It is not allowed to unregister from past events.'})
-        if obj.user != self.request.user:
+        if obj.user_id != self.request.user.id:
             raise exceptions.PermissionDenied({'user': 'It is not allowed to unregister other attendees.'})
         return obj
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        with reserved_seats():
+            super(EventAttendeeUnregisterView, self).perform_destroy(instance)
+        # The seat goes to the first user of the waitlist if any, otherwise it is released
+        if not Event.objects.promote_waitlist(instance.event_id):
+            Event.objects.release_seat(instance.event_id)
+        pubsub.notify([instance.event_id])
+
+
+class EventWaitlistView(generics.GenericAPIView):
+    """
+    Waitlist of a full event entry, related to :model:`events.EventWaitlistEntry`.
+    `POST` appends the request User to the waitlist, `GET` returns its position, `DELETE` removes it.
+    When a seat is freed, it goes to the first user of the waitlist, who is registered to the event.
+    Users can only join the waitlists of full future events they are not registered to.
+    """
+    queryset = EventWaitlistEntry.objects.select_related('event')
+    permission_classes = (IsAuthenticated,)
+    serializer_class = EventWaitlistEntrySerializer
+
+    def get_object(self):
+        try:
+            return self.get_queryset().get(event_id=self.kwargs['pk'], user_id=self.request.user.id)
+        except EventWaitlistEntry.DoesNotExist:
+            raise exceptions.NotFound({'event': 'Not in the waitlist of the event.'})
+
+    def get(self, request, *args, **kwargs):
+        return Response(self.get_serializer(self.get_object()).data)
+
+    def post(self, request, pk, *args, **kwargs):
+        event = Event.objects.filter(pk=pk).only('start_date').first()
+        if event is None:
+            raise exceptions.NotFound()
+        if event.start_date < timezone.now().date():
+            raise exceptions.PermissionDenied({'event': 'It is not allowed to join the waitlist of past events.'})
+        ensure_user_exists(request.user)
+        try:
+            with transaction.atomic():
+                entry = EventWaitlistEntry.objects.join(pk, request.user.id)
+                # The event is locked by the join: seats cannot be freed until it is committed
+                event = Event.objects.get(pk=pk)
+                if not event.capacity or event.attendee_count < event.capacity:
+                    raise exceptions.PermissionDenied({'event': 'The event is not full, register to it instead.'})
+                if EventAttendee.objects.filter(event_id=pk, user_id=request.user.id).exists():
+                    raise exceptions.PermissionDenied({'event': 'Already registered to the event.'})
+        except IntegrityError:
+            if not EventWaitlistEntry.objects.filter(event_id=pk, user_id=request.user.id).exists():
+                raise
+            raise exceptions.PermissionDenied({'event': 'Already in the waitlist of the event.'})
+        entry.event = event
+        return Response(self.get_serializer(entry).data, status=status.HTTP_201_CREATED)
+
+    @transaction.atomic
+    def delete(self, request, *args, **kwargs):
+        EventWaitlistEntry.objects.leave(self.get_object())
+        return Response(status=status.HTTP_204_NO_CONTENT)
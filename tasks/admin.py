@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from tasks.models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'attempts', 'max_attempts', 'run_after', 'locked_by', 'created_on']
+    list_filter = ['status', 'name']
+    readonly_fields = ['created_on', 'modified_on']
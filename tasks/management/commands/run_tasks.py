@@ -0,0 +1,28 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Runs the queued tasks by batches, with a pool of worker threads, until interrupted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=settings.TASKS['THREADS'], help='Number of worker threads.')
+        parser.add_argument('--batch-size', type=int, default=settings.TASKS['BATCH_SIZE'], help='Number of tasks claimed at once.')
+        parser.add_argument('--poll-interval', type=float, default=settings.TASKS['POLL_INTERVAL'], help='Seconds between two polls of an empty queue.')
+        parser.add_argument('--lease', type=int, default=settings.TASKS['LEASE'], help='Seconds after which the tasks of a batch are run again if not finished.')
+        parser.add_argument('--burst', action='store_true', help='Exit once the queue is drained.')
+
+    def handle(self, *args, **options):
+        worker = Worker(threads=options['threads'], batch_size=options['batch_size'], poll_interval=options['poll_interval'], lease=options['lease'])
+        # Finish the current batch on interruption, instead of waiting for the leases to expire
+        handlers = {signum: signal.signal(signum, lambda *args: worker.stop()) for signum in (signal.SIGINT, signal.SIGTERM)}
+        try:
+            processed = worker.run(burst=options['burst'])
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+        self.stdout.write(self.style.SUCCESS(f'Ran {processed} task(s).'))
@@ -0,0 +1,40 @@
+# Generated by Django 4.1.7 on 2026-10-18 12:37
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, verbose_name='name')),
+                ('kwargs', models.JSONField(default=dict, verbose_name='keyword arguments')),
+                ('status', models.CharField(choices=[('queued', 'queued'), ('running', 'running'), ('failed', 'failed')], default='queued', max_length=7, verbose_name='status')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='attempts')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=5, verbose_name='max attempts')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='run after')),
+                ('locked_by', models.CharField(blank=True, default='', max_length=255, verbose_name='locked by')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='last error')),
+                ('created_on', models.DateTimeField(auto_now_add=True, verbose_name='Created on')),
+                ('modified_on', models.DateTimeField(auto_now=True, verbose_name='Modified on')),
+            ],
+            options={
+                'verbose_name': 'task',
+                'verbose_name_plural': 'tasks',
+                'ordering': ('run_after', 'id'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'run_after'], name='tasks_task_ready_idx'),
+        ),
+    ]
@@ -0,0 +1,148 @@
+from datetime import timedelta
+
+from django.db import (
+    connections,
+    models,
+    transaction
+)
+from django.db.models import F
+from django.utils import timezone
+
+
+class TaskQuerySet(models.QuerySet):
+
+    def ready(self, now):
+        """
+        Tasks due by `now`: the queued ones, and the running ones whose lease has expired, their worker being gone.
+        """
+        return self.filter(status__in=(Task.QUEUED, Task.RUNNING), run_after__lte=now)
+
+    def claim(self, worker, batch_size, lease):
+        """
+        Leases up to `batch_size` due tasks to `worker` for `lease` seconds, oldest first, and returns them.
+        The claim is a conditional UPDATE: a task claimed by another worker in the meantime is
+        not due anymore, and is left out. Where the database supports it, the selected rows are
+        locked with SKIP LOCKED, so that concurrent workers claim different tasks.
+        """
+        now = timezone.now()
+        locked_until = now + timedelta(seconds=lease)
+        with transaction.atomic(using=self.db):
+            queryset = self.ready(now).order_by('run_after', 'id')
+            if connections[self.db].features.has_select_for_update_skip_locked:
+                queryset = queryset.select_for_update(skip_locked=True)
+            pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                return []
+            self.ready(now).filter(pk__in=pks).update(
+                status=Task.RUNNING,
+                locked_by=worker,
+                run_after=locked_until,
+                attempts=F('attempts') + 1,
+                modified_on=now
+            )
+            return list(self.filter(pk__in=pks, status=Task.RUNNING, locked_by=worker, run_after=locked_until).order_by('run_after', 'id'))
+
+    def finish(self, results):
+        """
+        Records the results of claimed tasks, `results` mapping the tasks to None when they
+        succeeded, or to the (error, retry delay in seconds) of their failure. The succeeded tasks
+        are deleted with a single query. The failed ones are queued again after the delay, or
+        marked as failed if the delay is None.
+        """
+        now = timezone.now()
+        with transaction.atomic(using=self.db):
+            succeeded = [task.pk for task, failure in results.items() if failure is None]
+            if succeeded:
+                self.filter(pk__in=succeeded).delete()
+            for task, failure in results.items():
+                if failure is None:
+                    continue
+                error, delay = failure
+                self.filter(pk=task.pk, locked_by=task.locked_by).update(
+                    status=Task.QUEUED if delay is not None else Task.FAILED,
+                    locked_by='',
+                    run_after=now + timedelta(seconds=delay) if delay is not None else now,
+                    last_error=error,
+                    modified_on=now
+                )
+
+    def retry_failed(self):
+        """
+        Queues the failed tasks again, with new attempts. Returns the number of tasks queued.
+        """
+        now = timezone.now()
+        return self.filter(status=Task.FAILED).update(status=Task.QUEUED, attempts=0, run_after=now, modified_on=now)
+
+
+class Task(models.Model):
+    """
+    Call of a task function, see tasks/queue.py, run by the workers of the `run_tasks` command.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'queued'),
+        (RUNNING, 'running'),
+        (FAILED, 'failed'),
+    )
+
+    name = models.CharField(
+        max_length=255,
+        verbose_name='name'
+    )
+    kwargs = models.JSONField(
+        default=dict,
+        verbose_name='keyword arguments'
+    )
+    status = models.CharField(
+        max_length=7,
+        choices=STATUS_CHOICES,
+        default=QUEUED,
+        verbose_name='status'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='attempts'
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=5,
+        verbose_name='max attempts'
+    )
+    # Due date of a queued task, end of the lease of a running one
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='run after'
+    )
+    locked_by = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        verbose_name='locked by'
+    )
+    last_error = models.TextField(
+        blank=True,
+        default='',
+        verbose_name='last error'
+    )
+    created_on = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Created on'
+    )
+    modified_on = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Modified on'
+    )
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        ordering = ('run_after', 'id')
+        indexes = [
+            models.Index(fields=('status', 'run_after'), name='tasks_task_ready_idx'),
+        ]
+        verbose_name = 'task'
+        verbose_name_plural = 'tasks'
+
+    def __str__(self):
+        return f'{self.name}, {self.status}'
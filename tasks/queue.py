@@ -0,0 +1,86 @@
+"""
+Background tasks, stored in the database and run by the workers of the `run_tasks` command.
+
+Task functions are registered with the `task` decorator, in the `tasks` module of an app::
+
+    @task(max_attempts=3)
+    def send_confirmation(event_id, user_id):
+        ...
+
+The request handlers only enqueue them, with JSON serializable keyword arguments::
+
+    enqueue(send_confirmation, event_id=1, user_id=2)
+    enqueue_many([(send_confirmation, {'event_id': 1, 'user_id': 2}), ...])
+
+Tasks enqueued in a transaction are inserted in that transaction: they are only run if it
+commits, and cannot be lost if it does. A failed task is retried with an exponential backoff,
+up to its maximum number of attempts, so task functions must be idempotent.
+"""
+import random
+import traceback
+
+from django.conf import settings
+
+from tasks.models import Task
+
+registry = {}
+
+
+def task(function=None, *, max_attempts=None):
+    """
+    Registers a task function, by its module and name.
+    """
+    def register(function):
+        function.task_name = f'{function.__module__}.{function.__name__}'
+        function.max_attempts = max_attempts or settings.TASKS['MAX_ATTEMPTS']
+        registry[function.task_name] = function
+        return function
+
+    if function is not None:
+        return register(function)
+    return register
+
+
+def enqueue(function, **kwargs):
+    """
+    Queues a call of a task function. Returns the Task.
+    """
+    return enqueue_many([(function, kwargs)])[0]
+
+
+def enqueue_many(calls):
+    """
+    Queues `(task function, keyword arguments)` calls, with a single query. Returns the Tasks.
+    """
+    return Task.objects.bulk_create([
+        Task(name=function.task_name, kwargs=kwargs, max_attempts=function.max_attempts)
+        for function, kwargs in calls
+    ])
+
+
+def get_backoff(attempts):
+    """
+    Seconds before the next attempt of a task which failed `attempts` times: doubled after
+    every attempt, up to a maximum, and shortened by a random jitter of up to a half so that
+    the tasks which failed together are not retried together.
+    """
+    backoff = min(settings.TASKS['BACKOFF'] * 2 ** (attempts - 1), settings.TASKS['MAX_BACKOFF'])
+    return backoff * random.uniform(0.5, 1)
+
+
+def execute(task):
+    """
+    Runs a claimed Task. Returns None if it succeeded, otherwise the error and the delay before
+    the next attempt, None if it must not be retried, see TaskQuerySet.finish.
+    """
+    function = registry.get(task.name)
+    if function is None:
+        return f'Unknown task {task.name}.', None
+    if task.attempts > task.max_attempts:
+        # The lease expired after every attempt, e.g. as the task kills its workers
+        return 'Lease expired after the last attempt.', None
+    try:
+        function(**task.kwargs)
+    except Exception:
+        return traceback.format_exc(), get_backoff(task.attempts) if task.attempts < task.max_attempts else None
+    return None
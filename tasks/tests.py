@@ -0,0 +1,119 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import (
+    TestCase,
+    TransactionTestCase
+)
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.queue import (
+    enqueue,
+    enqueue_many,
+    task
+)
+from tasks.worker import Worker
+
+calls = []
+calls_lock = threading.Lock()
+
+
+@task
+def record_call(value):
+    with calls_lock:
+        calls.append((value, threading.current_thread().name))
+
+
+@task(max_attempts=2)
+def fail(value):
+    raise ValueError(f'Failed {value}')
+
+
+class TaskQueueTests(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_run(self):
+        """
+        Ensure we can run the queued tasks by batches, oldest first.
+        """
+        enqueue_many([(record_call, {'value': value}) for value in range(5)])
+        worker = Worker(threads=1, batch_size=2)
+        with self.assertNumQueries(8):
+            # Two transactions: the claim (select, update and fetch), and the deletion of the succeeded tasks
+            self.assertEqual(worker.run_batch(), 2)
+        # Worker.run would close the connection of the test transaction between the batches
+        self.assertEqual(worker.run_batch() + worker.run_batch() + worker.run_batch(), 3)
+        self.assertListEqual([value for value, _ in calls], [0, 1, 2, 3, 4])
+        self.assertFalse(Task.objects.exists())
+
+    def test_retry(self):
+        """
+        Ensure failed tasks are retried with a backoff, until their last attempt.
+        """
+        failed = enqueue(fail, value=1)
+        worker = Worker(threads=1)
+        start = timezone.now()
+        with self.assertLogs('tasks', 'WARNING'):
+            self.assertEqual(worker.run_batch(), 1)
+        failed.refresh_from_db()
+        self.assertEqual((failed.status, failed.attempts, failed.locked_by), (Task.QUEUED, 1, ''))
+        self.assertIn('ValueError: Failed 1', failed.last_error)
+        self.assertGreaterEqual(failed.run_after, start + timedelta(seconds=settings.TASKS['BACKOFF'] / 2))
+        self.assertLessEqual(failed.run_after, timezone.now() + timedelta(seconds=settings.TASKS['BACKOFF']))
+        # Not due yet
+        self.assertEqual(worker.run_batch(), 0)
+
+        Task.objects.update(run_after=timezone.now())
+        with self.assertLogs('tasks', 'ERROR'):
+            self.assertEqual(worker.run_batch(), 1)
+        failed.refresh_from_db()
+        self.assertEqual((failed.status, failed.attempts), (Task.FAILED, 2))
+        self.assertEqual(worker.run_batch(), 0)
+
+        self.assertEqual(Task.objects.retry_failed(), 1)
+        with self.assertLogs('tasks', 'WARNING'):
+            self.assertEqual(worker.run_batch(), 1)
+
+    def test_lease(self):
+        """
+        Ensure claimed tasks are not claimed again until their lease expires.
+        """
+        enqueue(record_call, value=1)
+        [claimed] = Task.objects.claim('first', 10, lease=60)
+        self.assertEqual((claimed.status, claimed.attempts, claimed.locked_by), (Task.RUNNING, 1, 'first'))
+        self.assertListEqual(Task.objects.claim('second', 10, lease=60), [])
+
+        # The first worker is gone
+        Task.objects.update(run_after=timezone.now())
+        [claimed] = Task.objects.claim('second', 10, lease=60)
+        self.assertEqual((claimed.attempts, claimed.locked_by), (2, 'second'))
+        # The first worker cannot record the result of the task anymore
+        Task.objects.finish({Task(pk=claimed.pk, locked_by='first'): ('Too late', 10)})
+        claimed.refresh_from_db()
+        self.assertEqual((claimed.status, claimed.locked_by), (Task.RUNNING, 'second'))
+
+
+class TaskWorkerTests(TransactionTestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_run_tasks(self):
+        """
+        Ensure the run_tasks command drains the queue with a pool of threads.
+        """
+        enqueue_many([(record_call, {'value': value}) for value in range(100)])
+        enqueue(fail, value=1)
+        output = StringIO()
+        with self.assertLogs('tasks', 'WARNING'):
+            call_command('run_tasks', '--burst', '--threads', '4', '--batch-size', '10', stdout=output)
+        self.assertIn('Ran 101 task(s).', output.getvalue())
+        self.assertListEqual(sorted(value for value, _ in calls), list(range(100)))
+        self.assertTrue(all(name.startswith('tasks') for _, name in calls))
+        self.assertListEqual(list(Task.objects.values_list('name', 'status')), [(fail.task_name, Task.QUEUED)])
@@ -0,0 +1,86 @@
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections
+
+from tasks.models import Task
+from tasks.queue import execute
+from tikoExercise.routers import use_primary
+
+logger = logging.getLogger('tasks')
+
+
+class Worker:
+    """
+    Drains the task queue by batches: a batch of due tasks is claimed with one query, run by
+    a pool of `threads`, and its results recorded with one query for the succeeded tasks and
+    one per failed task. With a single thread, the tasks run in the thread of the worker.
+    The tasks read from the primary database, as they usually follow the writes of a request.
+    """
+
+    def __init__(self, threads=4, batch_size=50, poll_interval=1, lease=300, name=None):
+        self.threads = threads
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = threading.Event()
+
+    def stop(self):
+        """
+        Stops the worker once its current batch is finished.
+        """
+        self.stopping.set()
+
+    def run(self, burst=False):
+        """
+        Runs batches until stopped, or until the queue is drained if `burst`. Returns the number of tasks run.
+        """
+        executor = ThreadPoolExecutor(self.threads, thread_name_prefix='tasks') if self.threads > 1 else None
+        processed = 0
+        try:
+            while not self.stopping.is_set():
+                count = self.run_batch(executor)
+                processed += count
+                close_old_connections()
+                if not count:
+                    if burst:
+                        break
+                    self.stopping.wait(self.poll_interval)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return processed
+
+    def run_batch(self, executor=None):
+        """
+        Claims and runs a batch of due tasks. Returns the number of tasks run.
+        """
+        with use_primary():
+            tasks = Task.objects.claim(self.name, self.batch_size, self.lease)
+            if not tasks:
+                return 0
+            if executor is None:
+                results = map(execute, tasks)
+            else:
+                results = executor.map(self._execute_in_thread, tasks)
+            results = dict(zip(tasks, results))
+            for task, failure in results.items():
+                if failure is not None:
+                    level = logging.WARNING if failure[1] is not None else logging.ERROR
+                    logger.log(level, 'Task %s %s failed (attempt %s/%s): %s', task.pk, task.name, task.attempts, task.max_attempts, failure[0])
+            Task.objects.finish(results)
+            return len(tasks)
+
+    @staticmethod
+    def _execute_in_thread(task):
+        try:
+            # The routing state of the worker thread is not propagated to the pool threads
+            with use_primary():
+                return execute(task)
+        finally:
+            # The connections of the pool threads are not closed by Django, which only does it for requests
+            close_old_connections()
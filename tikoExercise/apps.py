@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class TikoExerciseConfig(AppConfig):
+    name = 'tikoExercise'
+
+    def ready(self):
+        from tikoExercise import (  # noqa: F401
+            instrumentation,
+            sqlite
+        )
@@ -13,4 +13,16 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tikoExercise.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once the apps are loaded by get_asgi_application()
+from events.streams import EventStreamApplication  # noqa: E402
+
+event_stream_application = EventStreamApplication()
+
+
+async def application(scope, receive, send):
+    # The live updates of the events are streamed outside of Django, see events/streams.py
+    if scope['type'] == 'http' and scope['path'] == EventStreamApplication.path:
+        return await event_stream_application(scope, receive, send)
+    return await django_application(scope, receive, send)
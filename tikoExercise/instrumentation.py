@@ -0,0 +1,91 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Metrics of the request being processed, set by tikoExercise.middleware.PerformanceMiddleware
+current_metrics = ContextVar('current_metrics', default=None)
+
+
+class RequestMetrics:
+    """
+    Timings of a request, in milliseconds: SQL queries, and named sections such as the
+    serialization and the rendering, see `timing()`.
+    """
+    max_queries = 200
+
+    def __init__(self):
+        self.query_count = 0
+        self.query_time = 0.0
+        self.queries = []
+        self.timings = {}
+        self.depth = {}
+
+    def record_query(self, execute, sql, params, many, context):
+        """
+        Database execute wrapper, see `connection.execute_wrapper()`.
+        """
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (perf_counter() - start) * 1000
+            self.query_count += 1
+            self.query_time += duration
+            # The statements are kept for the slow requests log, up to a limit
+            if len(self.queries) < self.max_queries:
+                self.queries.append((duration, sql, params))
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper recording the queries into the metrics of the current request, if it is instrumented.
+    """
+    metrics = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics.record_query(execute, sql, params, many, context)
+
+
+@receiver(connection_created, dispatch_uid='tikoExercise_record_queries')
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    Installs `record_query` once per connection, for good: the concurrent requests of an ASGI server run
+    their queries on the same thread, hence the same connections, and `connection.execute_wrapper()`
+    removes the last wrapper installed on exit, not necessarily its own. The metrics follow each request
+    in its context instead, through `sync_to_async`.
+    """
+    # Sent again when a closed connection reconnects
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def timing(name):
+    """
+    Adds the duration of the block to the `name` timing of the current request, if it is instrumented.
+    Nested blocks of the same name, e.g. nested serializers, are only counted once.
+    """
+    metrics = current_metrics.get()
+    if metrics is None or metrics.depth.get(name):
+        yield
+        return
+    metrics.depth[name] = 1
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        metrics.depth[name] = 0
+        metrics.timings[name] = metrics.timings.get(name, 0.0) + (perf_counter() - start) * 1000
+
+
+class InstrumentedSerializerMixin:
+    """
+    Records the time spent serializing instances in the `serialize` timing of the current request.
+    """
+
+    def to_representation(self, instance):
+        with timing('serialize'):
+            return super(InstrumentedSerializerMixin, self).to_representation(instance)
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    connections
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Copies the primary SQLite database into the replicas of the DATABASE_REPLICAS setting, '
+        'in order to simulate the replication locally (see tikoExercise/settings_replica.py).'
+    )
+
+    def handle(self, *args, **options):
+        primary = connections[DEFAULT_DB_ALIAS]
+        for alias in settings.DATABASE_REPLICAS:
+            replica = connections[alias]
+            if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+                raise CommandError('Only SQLite databases can be copied, other databases have their own replication.')
+            primary.ensure_connection()
+            replica.ensure_connection()
+            primary.connection.backup(replica.connection)
+            self.stdout.write(self.style.SUCCESS(f'Copied {primary.settings_dict["NAME"]} into {replica.settings_dict["NAME"]}.'))
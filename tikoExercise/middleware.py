@@ -0,0 +1,145 @@
+import json
+import logging
+from time import perf_counter
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction
+)
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import (
+    Resolver404,
+    resolve
+)
+from rest_framework.permissions import SAFE_METHODS
+
+from tikoExercise.instrumentation import (
+    RequestMetrics,
+    current_metrics
+)
+from tikoExercise.routers import routing
+
+logger = logging.getLogger('tikoExercise.performance')
+
+
+class PerformanceMiddleware:
+    """
+    Instruments the requests to the URL namespaces of the `PERFORMANCE_INSTRUMENTATION` setting:
+    SQL query count and time, serialization and rendering time, and total time.
+
+    The timings are returned in the `Server-Timing` header and logged as a JSON line on the
+    `tikoExercise.performance` logger. Requests slower than `SLOW_REQUEST_MS` are logged as
+    warnings with their SQL statements. When `ENABLED` is false, the middleware removes
+    itself from the chain at startup: the queries only cost the lookup of `current_metrics`,
+    see `tikoExercise.instrumentation.record_query`.
+    """
+
+    def __init__(self, get_response):
+        config = getattr(settings, 'PERFORMANCE_INSTRUMENTATION', {})
+        if not config.get('ENABLED'):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.namespaces = set(config.get('NAMESPACES', ()))
+        self.slow_request_ms = config.get('SLOW_REQUEST_MS')
+        # Async under ASGI, so that the async views are not run in a thread
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.is_instrumented(request):
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        start = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.record(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        if not self.is_instrumented(request):
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        start = perf_counter()
+        try:
+            # The queries run in threads of sync_to_async, with a copy of the context
+            response = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.record(request, response, metrics, start)
+
+    def is_instrumented(self, request):
+        try:
+            namespace = resolve(request.path_info).namespace
+        except Resolver404:
+            namespace = None
+        return namespace in self.namespaces
+
+    def record(self, request, response, metrics, start):
+        total = (perf_counter() - start) * 1000
+        timings = {'sql': metrics.query_time, **metrics.timings, 'total': total}
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={duration:.2f}' + (f';desc="{metrics.query_count} queries"' if name == 'sql' else '')
+            for name, duration in timings.items()
+        )
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': metrics.query_count,
+            **{f'{name}_ms': round(duration, 2) for name, duration in timings.items()},
+        }
+        if self.slow_request_ms is not None and total >= self.slow_request_ms:
+            record['sql'] = [{'ms': round(duration, 2), 'sql': sql, 'params': repr(params)} for duration, sql, params in metrics.queries]
+            logger.warning(json.dumps(record))
+        else:
+            logger.info(json.dumps(record))
+        return response
+
+
+class PrimaryStickinessMiddleware:
+    """
+    Keeps the reads of a client on the primary database for `DATABASE_PRIMARY_STICKINESS` seconds
+    after it wrote, so that it reads its own writes despite the replication lag of the replicas.
+
+    The requests with unsafe methods read from the primary, as they may write; those which
+    wrote set a cookie which sends the reads of the next requests of the client to the primary,
+    until it expires. Without `DATABASE_REPLICAS`, the middleware removes itself from the chain.
+    """
+    cookie_name = 'use_primary'
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        # Async under ASGI, so that the routing state is set in the context of the async views
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with routing(self.is_pinned(request)) as state:
+            response = self.get_response(request)
+        return self.stick(response, state)
+
+    async def __acall__(self, request):
+        # sync_to_async copies the context into its thread: the views share the same mutable state
+        with routing(self.is_pinned(request)) as state:
+            response = await self.get_response(request)
+        return self.stick(response, state)
+
+    def is_pinned(self, request):
+        return request.method not in SAFE_METHODS or self.cookie_name in request.COOKIES
+
+    def stick(self, response, state):
+        if state.wrote:
+            response.set_cookie(self.cookie_name, '1', max_age=settings.DATABASE_PRIMARY_STICKINESS, httponly=True, samesite='Lax')
+        return response
@@ -0,0 +1,27 @@
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from tikoExercise.renderers import FastJSONRenderer
+
+
+class FastJSONParser(parsers.JSONParser):
+    """
+    Parses JSON with orjson, see :class:`tikoExercise.renderers.FastJSONRenderer`.
+
+    Falls back to the stdlib parser when orjson is not installed, for request bodies
+    that are not UTF-8, and when NaN and infinities are allowed (`STRICT_JSON`).
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', 'utf-8')
+        if orjson is None or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8') or not self.strict:
+            return super(FastJSONParser, self).parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -0,0 +1,77 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Routing state of the request being processed, set by tikoExercise.middleware.PrimaryStickinessMiddleware
+current_routing = ContextVar('current_routing', default=None)
+
+
+class RoutingState:
+    """
+    Whether the reads of a request go to the primary database: either from the start
+    (`pinned`), or once it has written (`wrote`), in order to read its own writes.
+    Otherwise they go to the same replica for the whole request.
+    """
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+        self.replica = None
+
+
+@contextmanager
+def routing(pinned=False):
+    """
+    Routes the reads of the block with a new RoutingState, which is returned.
+    """
+    state = RoutingState(pinned)
+    token = current_routing.set(state)
+    try:
+        yield state
+    finally:
+        current_routing.reset(token)
+
+
+def use_primary():
+    """
+    Routes the reads of the block to the primary database.
+    """
+    return routing(pinned=True)
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends the writes to the primary (`default`) database and the reads to the replicas of the
+    `DATABASE_REPLICAS` setting, except for the requests which stick to the primary, see `RoutingState`.
+    Without replicas, everything goes to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas:
+            return None
+        state = current_routing.get()
+        if state is not None and (state.pinned or state.wrote):
+            return DEFAULT_DB_ALIAS
+        # The related objects of an instance are read from the same database
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        if state is None:
+            return random.choice(replicas)
+        if state.replica is None:
+            state.replica = random.choice(replicas)
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = current_routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same data as the primary
+        return True
@@ -38,11 +38,15 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'drf_spectacular',
+    'tikoExercise.apps.TikoExerciseConfig',
     'authentication.apps.AuthenticationConfig',
     'events.apps.EventsConfig',
+    'tasks.apps.TasksConfig',
 ]
 
 MIDDLEWARE = [
+    'tikoExercise.middleware.PerformanceMiddleware',
+    'tikoExercise.middleware.PrimaryStickinessMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -82,6 +86,12 @@ DATABASES = {
     }
 }
 
+# Reads go to the replica aliases of DATABASES listed here, writes to default, see tikoExercise/routers.py
+DATABASE_ROUTERS = ['tikoExercise.routers.PrimaryReplicaRouter']
+DATABASE_REPLICAS = []
+# Seconds during which the reads of a client which wrote go to default, in order to read its own writes
+DATABASE_PRIMARY_STICKINESS = 10
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -124,7 +134,17 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Django Rest Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.backends.StatelessJWTAuthentication',
+    ],
+    # orjson based, with a fallback to the stdlib json when it is not installed
+    'DEFAULT_RENDERER_CLASSES': [
+        'tikoExercise.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'tikoExercise.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
@@ -133,7 +153,100 @@ REST_FRAMEWORK = {
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
-    'ROTATE_REFRESH_TOKENS': True
+    'ROTATE_REFRESH_TOKENS': True,
+    'TOKEN_OBTAIN_SERIALIZER': 'authentication.serializers.ClaimsTokenObtainPairSerializer',
+    'TOKEN_USER_CLASS': 'authentication.backends.ClaimsUser',
+}
+
+# Lifetime of the Users loaded by authentication.backends.ClaimsUser.instance, in seconds
+AUTHENTICATION_USER_CACHE_TIMEOUT = 60
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Shared by the processes of the host, e.g. for the generation of the events list cache.
+    # Use Redis or Memcached when the processes run on several hosts
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+    },
+}
+
+# Events list cache, see events/cache.py. Set to None in order to disable it.
+# The generation cache must be shared by the processes, so that they all see the invalidations
+EVENTS_LIST_CACHE = {
+    'BACKEND': 'events.cache.LocMemResponseCache',
+    'OPTIONS': {
+        'max_entries': 1024,
+        'timeout': 60,
+        'generation_cache': 'shared',
+    },
+}
+
+# Live updates of the seat counters of the events, see events/pubsub.py and events/streams.py.
+# Set to None in order to disable them
+EVENTS_PUBSUB = {
+    'BACKEND': 'events.pubsub.LocalPubSub',
+}
+
+# Change feed of the sync clients, see events/changes.py
+EVENTS_CHANGES = {
+    # Seconds a change waits before it is listed, so that the slower transactions which started
+    # earlier have committed: it must exceed the longest write transaction, lock waits included
+    'DELAY': 10,
+    # Days the tombstones of deleted events and attendees are kept, older cursors must resync
+    'RETENTION': 30,
+}
+
+# Background tasks, see tasks/queue.py. The defaults of the run_tasks command
+TASKS = {
+    'THREADS': 4,
+    'BATCH_SIZE': 50,
+    # Seconds between two polls of an empty queue
+    'POLL_INTERVAL': 1,
+    # Seconds after which the tasks of a worker which did not finish them are run again
+    'LEASE': 300,
+    'MAX_ATTEMPTS': 5,
+    # Seconds before the first retry of a failed task, doubled after every attempt up to MAX_BACKOFF
+    'BACKOFF': 10,
+    'MAX_BACKOFF': 3600,
+}
+
+# The confirmation emails and calendar invites are printed, see events/tasks.py
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+DEFAULT_FROM_EMAIL = 'events@localhost'
+
+# Per-request timings (SQL, serialization, rendering) in the Server-Timing header and the
+# tikoExercise.performance log, see tikoExercise/middleware.py
+PERFORMANCE_INSTRUMENTATION = {
+    'ENABLED': DEBUG,
+    # URL namespaces of the instrumented requests
+    'NAMESPACES': ('events', 'authentication'),
+    # Requests slower than this are logged as warnings, with their SQL statements
+    'SLOW_REQUEST_MS': 500,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'tikoExercise.performance': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'tasks': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
 }
 
 # API Docs
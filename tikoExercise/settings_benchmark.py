@@ -0,0 +1,23 @@
+import os
+import tempfile
+from pathlib import Path
+
+from .settings import *
+
+DEBUG = False
+
+# Benchmarks run against a throw-away database, never against db.sqlite3
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('BENCHMARK_DATABASE', Path(tempfile.gettempdir()) / 'tikoExercise_benchmark.sqlite3'),
+    }
+}
+
+ALLOWED_HOSTS = ['testserver', 'localhost', '127.0.0.1']
+
+# Benchmarks measure the database paths, the event list cache would hide them
+EVENTS_LIST_CACHE = None
+
+# The instrumentation adds its own overhead to the measures
+PERFORMANCE_INSTRUMENTATION = {**PERFORMANCE_INSTRUMENTATION, 'ENABLED': False}
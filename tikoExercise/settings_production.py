@@ -0,0 +1,44 @@
+import os
+
+from .settings import *
+
+DEBUG = False
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', SECRET_KEY)
+
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
+
+# SQLite tuned for concurrent requests, see tikoExercise/sqlite.py
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('DJANGO_DATABASE', BASE_DIR / 'db.sqlite3'),
+        # Persistent connections: the pragmas are applied once per connection instead of once per request
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'PRAGMAS': {
+            # Readers do not block the writer, nor the writer the readers
+            'journal_mode': 'wal',
+            # Durable on application crashes, only the last transactions may be lost on power loss
+            'synchronous': 'normal',
+            # Milliseconds to wait for the write lock before failing with "database is locked"
+            'busy_timeout': 5000,
+            'mmap_size': 256 * 1024 * 1024,
+            # Negative sizes are in KiB: 64 MiB of page cache per connection
+            'cache_size': -64 * 1024,
+            'temp_store': 'memory',
+        },
+        'TRANSACTION_MODE': 'IMMEDIATE',
+    }
+}
+
+CACHES = {
+    **CACHES,
+    'shared': {**CACHES['shared'], 'LOCATION': os.environ.get('DJANGO_SHARED_CACHE_DIR', BASE_DIR / 'cache')},
+}
+
+PERFORMANCE_INSTRUMENTATION = {**PERFORMANCE_INSTRUMENTATION, 'ENABLED': False}
+
+EMAIL_BACKEND = os.environ.get('DJANGO_EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+
+DEFAULT_FROM_EMAIL = os.environ.get('DJANGO_DEFAULT_FROM_EMAIL', DEFAULT_FROM_EMAIL)
@@ -0,0 +1,17 @@
+from .settings import *
+
+# Local primary/replica setup with two SQLite files. There is no replication between them:
+# `python manage.py sync_replicas --settings=tikoExercise.settings_replica` copies the primary
+# into the replica, which otherwise lags behind it like a real replica would.
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+    },
+}
+
+DATABASE_REPLICAS = ['replica']
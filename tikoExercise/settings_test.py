@@ -1,8 +1,42 @@
+import tempfile
+import uuid
+from pathlib import Path
+
 from .settings import *
 
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': ':memory:'
+        'NAME': ':memory:',
+        # The test database is file backed: the threaded tests need real SQLite locking,
+        # shared-cache in-memory databases fail at once with "database table is locked".
+        # Named by run, so that concurrent runs sharing the temporary directory do not collide.
+        'TEST': {
+            'NAME': Path(tempfile.gettempdir()) / f'tikoExercise_test_{uuid.uuid4().hex}.sqlite3'
+        }
     }
 }
+
+# Cached lists would leak between tests, as the rollbacks do not invalidate them
+EVENTS_LIST_CACHE = None
+
+# Created in the test database, hence rolled back along with it
+CACHES = {
+    **CACHES,
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'tikoExercise_shared_cache',
+    },
+}
+
+# The changes are listed as soon as they are committed
+EVENTS_CHANGES = {**EVENTS_CHANGES, 'DELAY': 0}
+
+# The tests enable the instrumentation where they need it
+PERFORMANCE_INSTRUMENTATION = {**PERFORMANCE_INSTRUMENTATION, 'ENABLED': False}
+
+# Replica of the routing tests, see tikoExercise/tests.py. It is only created for the tests using it
+DATABASES['replica'] = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': ':memory:',
+}
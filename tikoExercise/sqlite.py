@@ -0,0 +1,28 @@
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created, dispatch_uid='tikoExercise_configure_sqlite')
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Applies the `PRAGMAS` of the SQLite databases settings to every new connection, e.g.::
+
+        'PRAGMAS': {'journal_mode': 'wal', 'synchronous': 'normal', 'busy_timeout': 5000}
+
+    With `'TRANSACTION_MODE': 'IMMEDIATE'`, atomic blocks take the write lock when they start
+    (BEGIN IMMEDIATE). Otherwise, a transaction which reads then writes fails at once with
+    "database is locked" when another connection writes in between: SQLite cannot upgrade its
+    read lock, and does not wait for the busy timeout in that case.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in connection.settings_dict.get('PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+    transaction_mode = connection.settings_dict.get('TRANSACTION_MODE')
+    if transaction_mode:
+        # Django 4.1 always starts the transactions of atomic blocks with a plain BEGIN
+        def start_transaction():
+            connection.cursor().execute(f'BEGIN {transaction_mode}')
+        connection._start_transaction_under_autocommit = start_transaction
@@ -0,0 +1,168 @@
+from datetime import (
+    date,
+    datetime,
+    timedelta,
+    timezone
+)
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.db import connections
+from django.test import (
+    SimpleTestCase,
+    override_settings
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from events.models import Event
+from tikoExercise import (
+    parsers,
+    renderers
+)
+from tikoExercise.middleware import PrimaryStickinessMiddleware
+from tikoExercise.routers import use_primary
+
+
+class FastJSONTests(SimpleTestCase):
+    data = {
+        'name': 'Event\u2028',
+        'start_date': date(2023, 3, 12),
+        'created_on': datetime(2023, 3, 10, 8, 14, 25, 680000, tzinfo=timezone.utc),
+        'price': Decimal('9.90'),
+        'label': gettext_lazy('Event'),
+        'attendees': [1, 2],
+    }
+
+    def test_render(self):
+        """
+        Ensure we render the same JSON as the DRF renderer.
+        """
+        rendered = renderers.FastJSONRenderer().render(self.data)
+        self.assertEqual(rendered, JSONRenderer().render(self.data))
+        self.assertIn(b'\\u2028', rendered)
+        self.assertEqual(renderers.FastJSONRenderer().render(None), b'')
+
+        # Indented output is left to the stdlib
+        rendered = renderers.FastJSONRenderer().render(self.data, 'application/json; indent=4')
+        self.assertIn(b'\n    "name"', rendered)
+
+    def test_parse(self):
+        """
+        Ensure we parse JSON and reject invalid JSON.
+        """
+        parsed = parsers.FastJSONParser().parse(BytesIO(b'{"event": 1, "name": "\xc3\xa9"}'))
+        self.assertEqual(parsed, {'event': 1, 'name': 'é'})
+        with self.assertRaises(ParseError):
+            parsers.FastJSONParser().parse(BytesIO(b'{"event": NaN}'))
+
+    def test_fallback(self):
+        """
+        Ensure we fall back to the stdlib when orjson is not installed.
+        """
+        with mock.patch.object(renderers, 'orjson', None), mock.patch.object(parsers, 'orjson', None):
+            rendered = renderers.FastJSONRenderer().render(self.data)
+            self.assertEqual(rendered, JSONRenderer().render(self.data))
+            self.assertEqual(parsers.FastJSONParser().parse(BytesIO(rendered))['name'], 'Event\u2028')
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], DATABASE_PRIMARY_STICKINESS=30)
+class ReplicaRoutingTests(APITestCase):
+    databases = {'default', 'replica'}
+    fixtures = [
+        'fixtures/users.json'
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        super(ReplicaRoutingTests, cls).setUpTestData()
+        cls.url_token_obtain = reverse('authentication:token_obtain_pair')
+        cls.url_list = reverse('events:list')
+        cls.url_create = reverse('events:create')
+
+    def setUp(self):
+        response = self.client.post(self.url_token_obtain, {'username': 'johndoe', 'password': '12345678!'}, format='json')
+        self.authorization = f"Bearer {response.data['access']}"
+        self.client.credentials(HTTP_AUTHORIZATION=self.authorization)
+        # Logging in does not write, hence does not stick to the primary
+        self.assertNotIn('use_primary', response.cookies)
+
+    def test_read_your_writes(self):
+        """
+        Ensure we can read an Event we just created, while other clients read from the replica which has not received it yet.
+        """
+        start_date = date.today() + timedelta(days=30)
+        event = {'name': 'Replicated event', 'description': 'Not yet', 'start_date': start_date, 'end_date': start_date}
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            response = self.client.post(self.url_create, event, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(replica_queries), 0)
+        self.assertEqual(response.cookies['use_primary']['max-age'], 30)
+        self.assertFalse(Event.objects.using('replica').exists())
+
+        # The cookie sends the reads of the client to the primary
+        url_get = reverse('events:get', kwargs={'pk': response.data['id']})
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            response = self.client.get(url_get, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(replica_queries), 0)
+
+        self.client.cookies.clear()
+        response = self.client.get(url_get, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(self.url_list, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(response.data['results'], [])
+
+    async def test_read_your_writes_async(self):
+        """
+        Ensure we can read an Event we just registered to with the async views, the routing state reaching them.
+        """
+        async def get_response(request):
+            pass
+
+        # Otherwise Django would run the rest of the chain, the async views included, in a thread
+        self.assertTrue(iscoroutinefunction(PrimaryStickinessMiddleware(get_response)))
+        start_date = date.today() + timedelta(days=30)
+        # Only on the primary: the replica has not received it yet
+        event = await Event.objects.acreate(name='Replicated event', start_date=start_date, end_date=start_date, created_by_id=2)
+        response = await self.async_client.post(
+            reverse('events:async-register-attendee'), {'event': event.pk},
+            content_type='application/json', AUTHORIZATION=self.authorization
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.cookies['use_primary']['max-age'], 30)
+
+        # The cookie sends the reads of the client to the primary
+        url_get = reverse('events:async-get', kwargs={'pk': event.pk})
+        self.async_client.cookies = response.cookies
+        response = await self.async_client.get(url_get, AUTHORIZATION=self.authorization)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('use_primary', response.cookies)
+
+        self.async_client.cookies.clear()
+        response = await self.async_client.get(url_get, AUTHORIZATION=self.authorization)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_reads_from_replica(self):
+        """
+        Ensure the Event list is read from the replica, unless the reads are pinned to the primary.
+        """
+        start_date = date.today() + timedelta(days=30)
+        Event.objects.using('replica').create(name='Replica event', start_date=start_date, end_date=start_date, created_by_id=3)
+        with CaptureQueriesContext(connections['default']) as primary_queries:
+            response = self.client.get(self.url_list, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(primary_queries), 0)
+        self.assertListEqual([event['name'] for event in response.data['results']], ['Replica event'])
+
+        with use_primary():
+            self.assertFalse(Event.objects.exists())
+        self.assertTrue(Event.objects.exists())